@@ -0,0 +1,151 @@
+"""Benchmark the "By Tile (Using Dask)" writer on a synthetic plate well.
+
+Builds a single image made of a ``--grid`` x ``--grid`` mosaic of FOVs and
+writes it with ``dask_parallel_tile_writing``:
+
+- ``single-chunk``: dask chunks left to the loader default (one chunk
+  covering the whole image, the previous behaviour),
+- ``zarr-chunks``: dask chunks derived from the output zarr chunking
+  (``_compute_chunk_size``), so every task writes exactly one zarr chunk.
+
+Each configuration runs in a fresh subprocess, reporting wall time and peak
+RSS of that process.
+
+Usage:
+    python benchmarks/bench_dask_tile_writing.py --grid 20 --fov 512
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any
+
+import numpy as np
+from ngio import create_empty_ome_zarr
+
+from ome_zarr_converters_tools.core._tile import Tile
+from ome_zarr_converters_tools.core._tile_to_tiled_images import tiled_image_from_tiles
+from ome_zarr_converters_tools.models import (
+    AcquisitionDetails,
+    ChannelInfo,
+    ConverterOptions,
+    SingleImage,
+)
+from ome_zarr_converters_tools.models._loader import ImageLoaderInterface
+from ome_zarr_converters_tools.pipelines._to_zarr import dask_parallel_tile_writing
+from ome_zarr_converters_tools.pipelines._write_ome_zarr import (
+    _compute_chunk_size,
+    _region_to_pixel_coordinates,
+)
+
+MODES = ("single-chunk", "zarr-chunks")
+
+
+class SyntheticLoader(ImageLoaderInterface):
+    """Constant-valued FOV, cheap to generate."""
+
+    fov: int
+    value: int
+
+    def load_data(self, resource: Any = None) -> np.ndarray:
+        """Return the synthetic FOV."""
+        return np.full((self.fov, self.fov), self.value, dtype="uint16")
+
+    def find_data_type(self, resource: Any = None) -> str:
+        """Return the data type without loading the data."""
+        return "uint16"
+
+
+def _build_tiled_image(grid: int, fov: int):
+    acquisition = AcquisitionDetails(
+        channels=[ChannelInfo(channel_label="DAPI")], pixelsize=1.0
+    )
+    tiles = [
+        Tile(
+            fov_name=f"FOV_{y}_{x}",
+            start_x=x * fov,
+            start_y=y * fov,
+            length_x=fov,
+            length_y=fov,
+            collection=SingleImage(image_path="plate_well"),
+            image_loader=SyntheticLoader(fov=fov, value=y * grid + x),
+            acquisition_details=acquisition,
+        )
+        for y in range(grid)
+        for x in range(grid)
+    ]
+    options = ConverterOptions()
+    (tiled_image,) = tiled_image_from_tiles(tiles=tiles, converter_options=options)
+    tiled_image.regions = _region_to_pixel_coordinates(
+        tiled_image.regions, tiled_image.pixel_size
+    )
+    return tiled_image, options
+
+
+def _run(mode: str, grid: int, fov: int) -> dict[str, float]:
+    tiled_image, options = _build_tiled_image(grid, fov)
+    chunks = _compute_chunk_size(tiled_image, options.omezarr_options)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        ome_zarr = create_empty_ome_zarr(
+            store=f"{tmp_dir}/image.zarr",
+            axes_names=tiled_image.axes,
+            shape=tiled_image.shape(),
+            chunks=chunks,
+            pixelsize=tiled_image.pixelsize,
+            levels=1,
+            overwrite=True,
+        )
+        image = ome_zarr.get_image()
+        timer = time.perf_counter()
+        dask_parallel_tile_writing(
+            tiled_image,
+            image,
+            resource=None,
+            chunks=chunks if mode == "zarr-chunks" else None,
+        )
+        wall = time.perf_counter() - timer
+    peak_rss_mib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return {"wall": wall, "peak_rss_mib": peak_rss_mib}
+
+
+def main() -> None:
+    """Run every writer configuration in its own subprocess."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--grid", type=int, default=20)
+    parser.add_argument("--fov", type=int, default=512)
+    parser.add_argument("--run", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run is not None:
+        print(json.dumps(_run(args.run, args.grid, args.fov)))
+        return
+
+    image_mib = (args.grid * args.fov) ** 2 * 2 / 2**20
+    print(f"{args.grid}x{args.grid} FOVs of {args.fov}px ({image_mib:.0f} MiB)")
+    print(f"{'mode':>14} {'wall [s]':>10} {'peak RSS [MiB]':>15}")
+    for mode in MODES:
+        output = subprocess.run(
+            [
+                sys.executable,
+                __file__,
+                "--run",
+                mode,
+                "--grid",
+                str(args.grid),
+                "--fov",
+                str(args.fov),
+            ],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        print(f"{mode:>14} {result['wall']:>10.2f} {result['peak_rss_mib']:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
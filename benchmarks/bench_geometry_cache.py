@@ -0,0 +1,139 @@
+"""Benchmark the memoized FOV grouping and geometry of ``TiledImage``.
+
+Builds a single image made of ``--fovs`` FOVs (one TileSlice each) and times,
+for the calls a conversion makes repeatedly (``group_by_fov``, ``shape``,
+``roi`` and ``ref_slice`` of every FOV group):
+
+- ``uncached``: the value recomputed on every call (previous behaviour),
+- ``cold``: the first call, filling the cache,
+- ``warm``: a later call, served from the cache (the FOV groups are new on
+  every call, but share the cached geometry of their FOV).
+
+Usage:
+    python benchmarks/bench_geometry_cache.py --fovs 10000 --repeats 5
+"""
+
+import argparse
+import math
+import time
+from collections.abc import Callable
+from typing import Any
+
+import numpy as np
+
+from ome_zarr_converters_tools.core._roi_utils import bulk_roi_union, shape_from_rois
+from ome_zarr_converters_tools.core._tile import Tile
+from ome_zarr_converters_tools.core._tile_region import (
+    TiledImage,
+    TileFOVGroup,
+    TileSlice,
+)
+from ome_zarr_converters_tools.core._tile_to_tiled_images import tiled_image_from_tiles
+from ome_zarr_converters_tools.models import (
+    AcquisitionDetails,
+    ChannelInfo,
+    ConverterOptions,
+    SingleImage,
+)
+from ome_zarr_converters_tools.models._loader import ImageLoaderInterface
+
+FOV = 256
+
+
+class SyntheticLoader(ImageLoaderInterface):
+    """Empty FOV, never loaded by this benchmark."""
+
+    def load_data(self, resource: Any = None) -> np.ndarray:
+        """Return the synthetic FOV."""
+        return np.zeros((FOV, FOV), dtype="uint16")
+
+    def find_data_type(self, resource: Any = None) -> str:
+        """Return the data type without loading the data."""
+        return "uint16"
+
+
+def _build_tiled_image(num_fovs: int) -> TiledImage:
+    grid = math.ceil(math.sqrt(num_fovs))
+    acquisition = AcquisitionDetails(
+        channels=[ChannelInfo(channel_label="DAPI")], pixelsize=1.0
+    )
+    loader = SyntheticLoader()
+    tiles = [
+        Tile(
+            fov_name=f"FOV_{fov}",
+            start_x=(fov % grid) * FOV,
+            start_y=(fov // grid) * FOV,
+            length_x=FOV,
+            length_y=FOV,
+            collection=SingleImage(image_path="plate_well"),
+            image_loader=loader,
+            acquisition_details=acquisition,
+        )
+        for fov in range(num_fovs)
+    ]
+    (tiled_image,) = tiled_image_from_tiles(
+        tiles=tiles, converter_options=ConverterOptions()
+    )
+    return tiled_image
+
+
+def _geometry_calls(tiled_image: TiledImage) -> None:
+    """The geometry queries of one conversion step."""
+    groups = tiled_image.group_by_fov()
+    tiled_image.shape()
+    tiled_image.roi()
+    for group in groups:
+        group.shape()
+        group.roi()
+        group.ref_slice()
+
+
+def _uncached_calls(tiled_image: TiledImage) -> None:
+    """The same queries, computed from scratch as before the caches."""
+    regions = list(tiled_image.regions)
+    fov_regions: dict[str, list[TileSlice]] = {}
+    for region in regions:
+        assert region.roi.name is not None
+        fov_regions.setdefault(region.roi.name, []).append(region)
+    rois = [region.roi for region in regions]
+    shape_from_rois(rois, tiled_image.axes, tiled_image.pixel_size)
+    bulk_roi_union(rois)
+    for fov_name, group_regions in fov_regions.items():
+        group = TileFOVGroup(
+            fov_name=fov_name,
+            regions=group_regions,
+            axes=tiled_image.axes,
+            pixel_size=tiled_image.pixel_size,
+        )
+        group_rois = [region.roi for region in group.regions]
+        shape_from_rois(group_rois, group.axes, group.pixel_size)
+        bulk_roi_union(group_rois)
+        group._find_ref_index()
+
+
+def _timeit(func: Callable[[], None], repeats: int) -> float:
+    best = math.inf
+    for _ in range(repeats):
+        timer = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - timer)
+    return best
+
+
+def main() -> None:
+    """Run the benchmark for the requested number of FOVs."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--fovs", type=int, default=10_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    tiled_image = _build_tiled_image(args.fovs)
+    uncached = _timeit(lambda: _uncached_calls(tiled_image), args.repeats)
+    cold = _timeit(lambda: _geometry_calls(tiled_image), 1)
+    warm = _timeit(lambda: _geometry_calls(tiled_image), args.repeats)
+    print(f"{'fovs':>8} {'uncached [s]':>13} {'cold [s]':>10} {'warm [s]':>10}")
+    print(f"{args.fovs:>8} {uncached:>13.3f} {cold:>10.3f} {warm:>10.5f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Benchmark dask graph construction in ``lazy_array_from_regions``.
+
+Builds a synthetic whole-plate mosaic where every loader is a single z-plane
+of a 256x256 FOV (the typical "one TIFF per z-plane" layout) and times:
+
+- the previous per-loader ``bisect`` overlap index (reference),
+- the vectorized ``np.searchsorted`` overlap index,
+- the full ``lazy_array_from_regions`` graph build.
+
+Usage:
+    python benchmarks/bench_lazy_graph_build.py --sizes 10000 100000 1000000
+"""
+
+import argparse
+import itertools
+import math
+import time
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from functools import partial
+
+import numpy as np
+
+from ome_zarr_converters_tools.core._dask_lazy_loader import (
+    _build_chunk_ranges,
+    _build_chunk_to_loaders,
+    lazy_array_from_regions,
+)
+
+FOV = 256
+Z_PLANES = 100
+Z_CHUNK = 10
+
+
+def _reference_bisect_index(chunk_ranges, bounds):
+    """Per-loader bisect + itertools.product, as before vectorization."""
+    chunk_starts = [[start for start, _ in axis_ranges] for axis_ranges in chunk_ranges]
+    n_chunks = [len(axis_ranges) for axis_ranges in chunk_ranges]
+    chunk_to_loaders = defaultdict(list)
+    for li, lb in enumerate(bounds):
+        chunk_idx_ranges = []
+        for ax, (lo, hi) in enumerate(lb):
+            first = bisect_right(chunk_starts[ax], lo) - 1
+            last = bisect_left(chunk_starts[ax], hi)
+            chunk_idx_ranges.append(range(max(0, first), min(last, n_chunks[ax])))
+        for chunk_idx in itertools.product(*chunk_idx_ranges):
+            chunk_to_loaders[chunk_idx].append(li)
+    return chunk_to_loaders
+
+
+def _build_regions(num_loaders: int):
+    num_fovs = max(1, num_loaders // Z_PLANES)
+    grid = math.ceil(math.sqrt(num_fovs))
+    regions = []
+    for fov in range(num_fovs):
+        y, x = divmod(fov, grid)
+        for z in range(Z_PLANES):
+            slices = (
+                slice(z, z + 1),
+                slice(y * FOV, (y + 1) * FOV),
+                slice(x * FOV, (x + 1) * FOV),
+            )
+            regions.append((slices, _load_plane))
+    shape = (Z_PLANES, grid * FOV, grid * FOV)
+    return regions, shape
+
+
+def _load_plane() -> np.ndarray:
+    return np.zeros((1, FOV, FOV), dtype="uint16")
+
+
+def _timeit(func, *args, **kwargs) -> float:
+    timer = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - timer
+
+
+def main() -> None:
+    """Run the benchmark for the requested number of loaders."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument(
+        "--skip-reference",
+        action="store_true",
+        help="Do not time the reference bisect index.",
+    )
+    args = parser.parse_args()
+
+    chunks = (Z_CHUNK, FOV, FOV)
+    print(f"{'loaders':>10} {'bisect [s]':>12} {'numpy [s]':>10} {'graph [s]':>10}")
+    for size in args.sizes:
+        regions, shape = _build_regions(size)
+        chunk_ranges = _build_chunk_ranges(shape, chunks)
+        bounds = np.array(
+            [[(s.start, s.stop) for s in slices] for slices, _ in regions],
+            dtype=np.int64,
+        )
+        bounds_tuples = [tuple(map(tuple, lb)) for lb in bounds.tolist()]
+        reference = (
+            float("nan")
+            if args.skip_reference
+            else _timeit(_reference_bisect_index, chunk_ranges, bounds_tuples)
+        )
+        vectorized = _timeit(_build_chunk_to_loaders, chunk_ranges, bounds)
+        graph = _timeit(
+            partial(lazy_array_from_regions, regions, shape=shape, chunks=chunks),
+            dtype="uint16",
+        )
+        print(
+            f"{len(regions):>10} {reference:>12.3f} {vectorized:>10.3f} {graph:>10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Benchmark compositing tiles into an output buffer with ``load_into``.
+
+Writes synthetic tiles to a temporary directory and composites them into a
+preallocated image, tile by tile:
+
+- ``copy``: ``out[slicing] = loader.load_data()`` (previous behaviour), one
+  temporary array per tile,
+- ``load_into``: ``loader.load_into(out[slicing])``, decoding TIFF planes in
+  place and copying memory-mapped NPY tiles without a temporary array.
+
+Two layouts are measured: a z-stack of TIFF planes (contiguous destination
+views) and a 2D mosaic of NPY tiles (strided destination views). For each,
+the transient bytes allocated per tile (``tracemalloc`` peak above the
+output buffer) and the wall time are reported.
+
+Usage:
+    python benchmarks/bench_load_into.py --tiles 64 --size 1024
+"""
+
+import argparse
+import math
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import tifffile
+
+from ome_zarr_converters_tools.models import DefaultImageLoader
+
+
+def _zstack(tmp_dir: Path, tiles: int, size: int):
+    regions = []
+    for z in range(tiles):
+        tifffile.imwrite(tmp_dir / f"z{z}.tif", np.full((size, size), z, "uint16"))
+        slicing = (slice(z, z + 1), slice(0, size), slice(0, size))
+        regions.append((slicing, DefaultImageLoader(file_path=f"z{z}.tif")))
+    return regions, (tiles, size, size)
+
+
+def _mosaic(tmp_dir: Path, tiles: int, size: int):
+    grid = math.ceil(math.sqrt(tiles))
+    regions = []
+    for tile in range(tiles):
+        y, x = divmod(tile, grid)
+        np.save(tmp_dir / f"t{tile}.npy", np.full((size, size), tile, "uint16"))
+        slicing = (
+            slice(0, 1),
+            slice(y * size, (y + 1) * size),
+            slice(x * size, (x + 1) * size),
+        )
+        regions.append((slicing, DefaultImageLoader(file_path=f"t{tile}.npy")))
+    return regions, (1, grid * size, grid * size)
+
+
+def _composite(regions, shape, resource: str, mode: str) -> tuple[float, float]:
+    """Return the mean transient bytes per tile and the wall time."""
+    out = np.zeros(shape, dtype="uint16")
+    transient = []
+    timer = time.perf_counter()
+    for slicing, loader in regions:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        if mode == "copy":
+            out[slicing] = loader.load_data(resource)
+        else:
+            loader.load_into(out[slicing], resource)
+        transient.append(tracemalloc.get_traced_memory()[1] - baseline)
+    return float(np.mean(transient)), time.perf_counter() - timer
+
+
+def main() -> None:
+    """Run the benchmark for both layouts and both modes."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tiles", type=int, default=64)
+    parser.add_argument("--size", type=int, default=1024)
+    args = parser.parse_args()
+
+    tile_mb = args.size * args.size * 2 / 2**20
+    print(f"tile size: {tile_mb:.1f} MB")
+    print(f"{'layout':>8} {'mode':>10} {'MB/tile':>9} {'time [s]':>9}")
+    tracemalloc.start()
+    for layout in (_zstack, _mosaic):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            regions, shape = layout(Path(tmp_dir), args.tiles, args.size)
+            for mode in ("copy", "load_into"):
+                transient, elapsed = _composite(regions, shape, tmp_dir, mode)
+                name = layout.__name__.strip("_")
+                print(f"{name:>8} {mode:>10} {transient / 2**20:>9.2f} {elapsed:>9.3f}")
+    tracemalloc.stop()
+
+
+if __name__ == "__main__":
+    main()
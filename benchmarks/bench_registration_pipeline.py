@@ -0,0 +1,124 @@
+"""Benchmark the default registration pipeline of ``apply_registration_pipeline``.
+
+Builds a single image made of ``--fovs`` jittered FOVs with ``--z-planes``
+z-planes each (one TileSlice per plane, with some stage drift between the
+planes), and times the default pipeline with XY alignment corrections:
+
+- ``step by step``: every registered step applied in turn, each one writing
+  the region starts (previous behaviour),
+- ``fused``: ``apply_registration_pipeline``, composing the moves of the
+  steps and writing the region starts once.
+
+Usage:
+    python benchmarks/bench_registration_pipeline.py --fovs 1000 10000
+"""
+
+import argparse
+import copy
+import math
+import time
+from typing import Any
+
+import numpy as np
+
+from ome_zarr_converters_tools.core._tile import Tile
+from ome_zarr_converters_tools.core._tile_region import TiledImage
+from ome_zarr_converters_tools.core._tile_to_tiled_images import tiled_image_from_tiles
+from ome_zarr_converters_tools.models import (
+    AcquisitionDetails,
+    AlignmentCorrections,
+    ChannelInfo,
+    ConverterOptions,
+    SingleImage,
+    TilingMode,
+)
+from ome_zarr_converters_tools.models._loader import ImageLoaderInterface
+from ome_zarr_converters_tools.pipelines._registration_pipeline import (
+    _registration_registry,
+    apply_registration_pipeline,
+    build_default_registration_pipeline,
+)
+
+FOV = 256
+
+
+class SyntheticLoader(ImageLoaderInterface):
+    """Empty FOV, never loaded by this benchmark."""
+
+    def load_data(self, resource: Any = None) -> np.ndarray:
+        """Return the synthetic FOV."""
+        return np.zeros((FOV, FOV), dtype="uint16")
+
+    def find_data_type(self, resource: Any = None) -> str:
+        """Return the data type without loading the data."""
+        return "uint16"
+
+
+def _build_tiled_image(num_fovs: int, z_planes: int, seed: int = 0) -> TiledImage:
+    rng = np.random.default_rng(seed)
+    grid = math.ceil(math.sqrt(num_fovs))
+    pitch = FOV * 0.9
+    acquisition = AcquisitionDetails(
+        channels=[ChannelInfo(channel_label="DAPI")], pixelsize=0.65
+    )
+    loader = SyntheticLoader()
+    tiles = []
+    for fov in range(num_fovs):
+        x = 1_000.0 + (fov % grid) * pitch + rng.normal(scale=2.0)
+        y = 2_000.0 + (fov // grid) * pitch + rng.normal(scale=2.0)
+        for z in range(z_planes):
+            drift_x, drift_y = rng.normal(scale=0.3, size=2)
+            tiles.append(
+                Tile(
+                    fov_name=f"FOV_{fov}",
+                    start_x=x + drift_x,
+                    start_y=y + drift_y,
+                    start_z=z,
+                    length_x=FOV,
+                    length_y=FOV,
+                    collection=SingleImage(image_path="plate_well"),
+                    image_loader=loader,
+                    acquisition_details=acquisition,
+                )
+            )
+    (tiled_image,) = tiled_image_from_tiles(
+        tiles=tiles, converter_options=ConverterOptions()
+    )
+    return tiled_image
+
+
+def main() -> None:
+    """Run the benchmark for every requested number of FOVs."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--fovs", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--z-planes", type=int, default=10)
+    parser.add_argument(
+        "--tiling",
+        choices=[mode.value for mode in TilingMode],
+        default=TilingMode.SNAP_TO_CORNERS.value,
+    )
+    args = parser.parse_args()
+
+    pipeline = build_default_registration_pipeline(
+        AlignmentCorrections(align_xy=True), TilingMode(args.tiling)
+    )
+    print(f"{'fovs':>7} {'regions':>9} {'step by step [s]':>17} {'fused [s]':>10}")
+    for num_fovs in args.fovs:
+        tiled_image = _build_tiled_image(num_fovs, args.z_planes)
+        expected = copy.deepcopy(tiled_image)
+        timer = time.perf_counter()
+        for step in pipeline:
+            expected = _registration_registry[step["name"]](expected, **step["params"])
+        baseline = time.perf_counter() - timer
+        timer = time.perf_counter()
+        result = apply_registration_pipeline(tiled_image, pipeline)
+        fused = time.perf_counter() - timer
+        np.testing.assert_array_equal(
+            result.region_table.columns.starts, expected.region_table.columns.starts
+        )
+        num_regions = len(result.region_table)
+        print(f"{num_fovs:>7} {num_regions:>9} {baseline:>17.3f} {fused:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Benchmark sharding and compression settings of the OME-Zarr writer.
+
+Writes a synthetic ``--grid`` x ``--grid`` plate well (OME-NGFF 0.5) with
+``write_tiled_image_as_zarr`` for every combination of sharding strategy and
+compressor, and reports the number of files, the bytes on disk and the write
+throughput (uncompressed MiB of level 0 per second, pyramid included).
+
+Usage:
+    python benchmarks/bench_sharding_codecs.py --grid 8 --fov 512
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Any
+
+import numpy as np
+
+from ome_zarr_converters_tools.core._tile import Tile
+from ome_zarr_converters_tools.core._tile_to_tiled_images import tiled_image_from_tiles
+from ome_zarr_converters_tools.models import (
+    AcquisitionDetails,
+    ChannelInfo,
+    ChunkBasedSharding,
+    CompressionOptions,
+    CompressorType,
+    ConverterOptions,
+    FovBasedSharding,
+    NoSharding,
+    OmeZarrOptions,
+    OverwriteMode,
+    SingleImage,
+    WriterMode,
+)
+from ome_zarr_converters_tools.models._loader import ImageLoaderInterface
+from ome_zarr_converters_tools.pipelines._write_ome_zarr import (
+    write_tiled_image_as_zarr,
+)
+
+SHARDINGS = {
+    "none": NoSharding(),
+    "4x4 chunks": ChunkBasedSharding(xy_chunks=4),
+    "2x2 FOVs": FovBasedSharding(xy_fovs=2),
+}
+COMPRESSORS = {
+    "default": CompressionOptions(),
+    "blosc-zstd": CompressionOptions(compressor=CompressorType.BLOSC_ZSTD),
+    "blosc-lz4": CompressionOptions(compressor=CompressorType.BLOSC_LZ4),
+    "zstd": CompressionOptions(compressor=CompressorType.ZSTD, level=3),
+    "none": CompressionOptions(compressor=CompressorType.NONE),
+}
+
+
+class NoisyLoader(ImageLoaderInterface):
+    """Smooth gradient plus noise, compressible like a real FOV."""
+
+    fov: int
+    seed: int
+
+    def load_data(self, resource: Any = None) -> np.ndarray:
+        """Return the synthetic FOV."""
+        rng = np.random.default_rng(self.seed)
+        gradient = np.add.outer(np.arange(self.fov), np.arange(self.fov)) * 2
+        noise = rng.integers(0, 64, (self.fov, self.fov))
+        return (gradient + noise + 100 * self.seed).astype("uint16")
+
+    def find_data_type(self, resource: Any = None) -> str:
+        """Return the data type without loading the data."""
+        return "uint16"
+
+
+def _build_tiled_image(grid: int, fov: int, sharding: Any, compression: Any):
+    acquisition = AcquisitionDetails(
+        channels=[ChannelInfo(channel_label="DAPI")], pixelsize=1.0
+    )
+    tiles = [
+        Tile(
+            fov_name=f"FOV_{y}_{x}",
+            start_x=x * fov,
+            start_y=y * fov,
+            length_x=fov,
+            length_y=fov,
+            collection=SingleImage(image_path="plate_well"),
+            image_loader=NoisyLoader(fov=fov, seed=y * grid + x),
+            acquisition_details=acquisition,
+        )
+        for y in range(grid)
+        for x in range(grid)
+    ]
+    options = ConverterOptions(
+        omezarr_options=OmeZarrOptions(
+            ngff_version="0.5", sharding=sharding, compression=compression
+        )
+    )
+    (tiled_image,) = tiled_image_from_tiles(tiles=tiles, converter_options=options)
+    return tiled_image, options
+
+
+def _disk_usage(path: str) -> tuple[int, int]:
+    num_files, num_bytes = 0, 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            num_files += 1
+            num_bytes += os.path.getsize(os.path.join(root, name))
+    return num_files, num_bytes
+
+
+def main() -> None:
+    """Write the plate well with every sharding/compressor combination."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--grid", type=int, default=8)
+    parser.add_argument("--fov", type=int, default=512)
+    args = parser.parse_args()
+
+    image_mib = (args.grid * args.fov) ** 2 * 2 / 2**20
+    print(f"{args.grid}x{args.grid} FOVs of {args.fov}px ({image_mib:.0f} MiB)")
+    print(
+        f"{'sharding':>12} {'compressor':>12} {'files':>8} {'MiB on disk':>12} "
+        f"{'MiB/s':>8}"
+    )
+    for sharding_name, sharding in SHARDINGS.items():
+        for compressor_name, compression in COMPRESSORS.items():
+            tiled_image, options = _build_tiled_image(
+                args.grid, args.fov, sharding, compression
+            )
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                zarr_url = f"{tmp_dir}/image.zarr"
+                timer = time.perf_counter()
+                write_tiled_image_as_zarr(
+                    zarr_url=zarr_url,
+                    tiled_image=tiled_image,
+                    converter_options=options,
+                    writer_mode=WriterMode.BY_FOV,
+                    overwrite_mode=OverwriteMode.OVERWRITE,
+                )
+                wall = time.perf_counter() - timer
+                num_files, num_bytes = _disk_usage(zarr_url)
+            print(
+                f"{sharding_name:>12} {compressor_name:>12} {num_files:>8} "
+                f"{num_bytes / 2**20:>12.1f} {image_mib / wall:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
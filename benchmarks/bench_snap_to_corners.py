@@ -0,0 +1,99 @@
+"""Benchmark the snap to corners tiling of ``calculate_snap_to_corner_offset``.
+
+Builds square slide scans of ``--fovs`` FOVs with 10% overlap and stage
+jitter, and times:
+
+- ``grid scan``: every FOV scans all the free points of the perfect grid
+  (previous behaviour, O(N^3)), only up to ``--max-grid-scan`` FOVs,
+- ``ring search``: every FOV searches the closest free grid point in rings
+  of grid cells around its position.
+
+Usage:
+    python benchmarks/bench_snap_to_corners.py --fovs 100 1000 3600 10000
+"""
+
+import argparse
+import math
+import time
+
+import numpy as np
+from ngio import Roi, RoiSlice
+
+from ome_zarr_converters_tools.core._dummy_tiles import DummyLoader, TileShape
+from ome_zarr_converters_tools.core._tile_region import TileSlice
+from ome_zarr_converters_tools.pipelines._snap_utils import (
+    calculate_snap_to_corner_offset,
+    tiles_to_boxes,
+)
+
+FOV = 2048
+
+
+def _slide_scan(num_fovs: int, seed: int = 0) -> dict[str, TileSlice]:
+    rng = np.random.default_rng(seed)
+    grid = math.ceil(math.sqrt(num_fovs))
+    pitch = FOV * 0.9
+    tiles = {}
+    for fov in range(num_fovs):
+        y, x = divmod(fov, grid)
+        jitter_x, jitter_y = rng.normal(scale=3.0, size=2)
+        name = f"FOV_{fov}"
+        roi = Roi(
+            name=name,
+            slices=[
+                RoiSlice(axis_name="x", start=x * pitch + jitter_x, length=FOV),
+                RoiSlice(axis_name="y", start=y * pitch + jitter_y, length=FOV),
+            ],
+            space="pixel",
+        )
+        loader = DummyLoader(shape=TileShape(x=FOV, y=FOV), text=name)
+        tiles[name] = TileSlice(roi=roi, image_loader=loader)
+    return tiles
+
+
+def _grid_scan_offsets(tiles: dict[str, TileSlice]) -> dict[str, dict[str, float]]:
+    """The previous implementation, scanning the whole perfect grid."""
+    boxes = tiles_to_boxes(list(tiles.values()))
+    len_x, len_y = boxes[0].x_len, boxes[0].y_len
+    grid = [
+        (i * len_x, j * len_y) for i in range(len(tiles)) for j in range(len(tiles))
+    ]
+    offsets = {}
+    for name, box in zip(tiles, boxes, strict=True):
+        min_distance, min_id = math.inf, -1
+        for i, (px, py) in enumerate(grid):
+            distance = np.sqrt((box.x - px) ** 2 + (box.y - py) ** 2)
+            if distance < min_distance:
+                min_distance, min_id = distance, i
+        px, py = grid.pop(min_id)
+        offsets[name] = {"x": px - box.x, "y": py - box.y}
+    return offsets
+
+
+def main() -> None:
+    """Run the benchmark for every requested number of FOVs."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--fovs", type=int, nargs="+", default=[100, 400, 1_000, 3_600, 10_000]
+    )
+    parser.add_argument("--max-grid-scan", type=int, default=400)
+    args = parser.parse_args()
+
+    print(f"{'fovs':>7} {'grid scan [s]':>14} {'ring search [s]':>16}")
+    for num_fovs in args.fovs:
+        tiles = _slide_scan(num_fovs)
+        baseline = float("nan")
+        if num_fovs <= args.max_grid_scan:
+            timer = time.perf_counter()
+            expected = _grid_scan_offsets(tiles)
+            baseline = time.perf_counter() - timer
+        timer = time.perf_counter()
+        offsets = calculate_snap_to_corner_offset(tiles)
+        elapsed = time.perf_counter() - timer
+        if num_fovs <= args.max_grid_scan:
+            assert offsets == expected, "ring search differs from the grid scan"
+        print(f"{num_fovs:>7} {baseline:>14.3f} {elapsed:>16.3f}")
+
+
+if __name__ == "__main__":
+    main()
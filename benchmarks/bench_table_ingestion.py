@@ -0,0 +1,112 @@
+"""Benchmark building Tiles from a tiles table with ``hcs_images_from_dataframe``.
+
+Builds a synthetic HCS tiles table (384 wells, one attribute column) with
+``--rows`` rows and times:
+
+- ``iterrows``: one ``DataFrame.iterrows`` step and four validated models per
+  row (previous behaviour), only for tables up to ``--max-iterrows`` rows,
+- ``columnar``: ``hcs_images_from_dataframe``, validating the table column by
+  column and assembling the models with ``model_construct``.
+
+Usage:
+    python benchmarks/bench_table_ingestion.py --rows 10000 100000 1000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from ome_zarr_converters_tools.core._table import hcs_images_from_dataframe
+from ome_zarr_converters_tools.core._tile import Tile
+from ome_zarr_converters_tools.models import (
+    AcquisitionDetails,
+    ChannelInfo,
+    DefaultImageLoader,
+    ImageInPlate,
+)
+
+FOV = 2048
+
+
+def _tiles_table(num_rows: int) -> pd.DataFrame:
+    index = np.arange(num_rows)
+    well = index % 384
+    fov = index // 384
+    return pd.DataFrame(
+        {
+            "file_path": [f"tile_{i}.tif" for i in index],
+            "row": well // 24 + 1,
+            "column": well % 24 + 1,
+            "fov_name": [f"FOV_{i}" for i in fov],
+            "start_x": (fov % 32) * FOV * 0.65,
+            "start_y": (fov // 32) * FOV * 0.65,
+            "length_x": FOV,
+            "length_y": FOV,
+            "drug": np.where(well % 2 == 0, "DMSO", "Taxol"),
+        }
+    )
+
+
+def _iterrows_ingestion(
+    tiles_table: pd.DataFrame, acquisition_details: AcquisitionDetails
+) -> list[Tile]:
+    """The previous row by row ingestion."""
+    tiles = []
+    for _, row in tiles_table.iterrows():
+        loader_data, collection_data, tile_data, attributes = {}, {}, {}, {}
+        for key, value in row.to_dict().items():
+            if key in DefaultImageLoader.model_fields:
+                loader_data[key] = value
+            elif key in ImageInPlate.model_fields:
+                collection_data[key] = value
+            elif key in Tile.model_fields:
+                tile_data[key] = value
+            else:
+                attributes[key] = [value]
+        tiles.append(
+            Tile(
+                **tile_data,
+                image_loader=DefaultImageLoader(**loader_data),
+                collection=ImageInPlate(**collection_data, plate_name="Plate"),
+                acquisition_details=acquisition_details,
+                attributes=attributes,
+            )
+        )
+    return tiles
+
+
+def main() -> None:
+    """Run the benchmark for every requested table size."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--max-iterrows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    acquisition_details = AcquisitionDetails(
+        channels=[ChannelInfo(channel_label="DAPI")], pixelsize=0.65
+    )
+    print(f"{'rows':>9} {'iterrows [s]':>13} {'columnar [s]':>13} {'speedup':>8}")
+    for num_rows in args.rows:
+        tiles_table = _tiles_table(num_rows)
+        baseline = float("nan")
+        if num_rows <= args.max_iterrows:
+            timer = time.perf_counter()
+            _iterrows_ingestion(tiles_table, acquisition_details)
+            baseline = time.perf_counter() - timer
+        timer = time.perf_counter()
+        hcs_images_from_dataframe(
+            tiles_table=tiles_table, acquisition_details=acquisition_details
+        )
+        columnar = time.perf_counter() - timer
+        print(
+            f"{num_rows:>9} {baseline:>13.2f} {columnar:>13.2f} "
+            f"{baseline / columnar:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Benchmark building the regions of a TiledImage with ``tiled_image_from_tiles``.
+
+Builds ``--tiles`` tiles of one image (stage positions in micrometers, with
+jitter) and times:
+
+- ``per tile``: one ROI per tile, converting every start and length with the
+  scalar ngio ``world_to_pixel`` / ``pixel_to_world`` round trip and a
+  validated ``Roi`` (previous behaviour), only up to ``--max-per-tile`` tiles,
+- ``batch``: ``tiled_image_from_tiles``, converting the coordinates of all
+  the tiles with NumPy and building the region columns directly.
+
+Usage:
+    python benchmarks/bench_tile_to_regions.py --tiles 10000 100000 1000000
+"""
+
+import argparse
+import math
+import time
+from typing import Any
+
+import numpy as np
+from ngio.common._roi import Roi, RoiSlice, pixel_to_world, world_to_pixel
+
+from ome_zarr_converters_tools.core._region_table import RegionTable
+from ome_zarr_converters_tools.core._tile import Tile
+from ome_zarr_converters_tools.core._tile_region import TileSlice
+from ome_zarr_converters_tools.core._tile_to_tiled_images import tiled_image_from_tiles
+from ome_zarr_converters_tools.models import (
+    AcquisitionDetails,
+    ChannelInfo,
+    ConverterOptions,
+    SingleImage,
+)
+from ome_zarr_converters_tools.models._loader import ImageLoaderInterface
+
+FOV = 2048
+
+
+class SyntheticLoader(ImageLoaderInterface):
+    """Empty FOV, never loaded by this benchmark."""
+
+    def load_data(self, resource: Any = None) -> np.ndarray:
+        """Return the synthetic FOV."""
+        return np.zeros((FOV, FOV), dtype="uint16")
+
+    def find_data_type(self, resource: Any = None) -> str:
+        """Return the data type without loading the data."""
+        return "uint16"
+
+
+def _tiles(num_tiles: int, seed: int = 0) -> list[Tile]:
+    rng = np.random.default_rng(seed)
+    grid = math.ceil(math.sqrt(num_tiles))
+    acquisition = AcquisitionDetails(
+        channels=[ChannelInfo(channel_label="DAPI")], pixelsize=0.65
+    )
+    collection = SingleImage(image_path="plate_well")
+    loader = SyntheticLoader()
+    jitter = rng.normal(scale=2.0, size=(num_tiles, 2)).tolist()
+    return [
+        Tile.model_construct(
+            fov_name=f"FOV_{i}",
+            start_x=(i % grid) * FOV * 0.65 * 0.9 + jitter[i][0],
+            start_y=(i // grid) * FOV * 0.65 * 0.9 + jitter[i][1],
+            start_z=0.0,
+            start_c=0,
+            start_t=0.0,
+            length_x=float(FOV),
+            length_y=float(FOV),
+            length_z=1.0,
+            length_c=1,
+            length_t=1.0,
+            attributes={},
+            collection=collection,
+            image_loader=loader,
+            acquisition_details=acquisition,
+        )
+        for i in range(num_tiles)
+    ]
+
+
+def _scalar_to_world(value: float, spacing: float, coo_system: str) -> float:
+    if coo_system == "world":
+        world = pixel_to_world(world_to_pixel(value, spacing), spacing)
+        if abs(world - value) > 1e-6:
+            raise ValueError(f"Coordinate {value} is not representable.")
+        return world
+    world = pixel_to_world(value, spacing)
+    if abs(world_to_pixel(world, spacing) - value) > 1e-6:
+        raise ValueError(f"Coordinate {value} is not representable.")
+    return world
+
+
+def _per_tile_regions(tiles: list[Tile]) -> RegionTable:
+    """The previous ``Tile.to_roi``, one tile and one coordinate at a time."""
+    regions = []
+    for tile in tiles:
+        acquisition_details = tile.acquisition_details
+        spacing = {
+            "x": acquisition_details.pixelsize,
+            "y": acquisition_details.pixelsize,
+            "z": acquisition_details.z_spacing,
+            "t": acquisition_details.t_spacing,
+        }
+        slices, origins = [], {}
+        for ax in acquisition_details.axes:
+            start = getattr(tile, f"start_{ax}")
+            length = getattr(tile, f"length_{ax}")
+            start_coo = getattr(acquisition_details, f"start_{ax}_coo", None)
+            if start_coo is not None:
+                start = _scalar_to_world(start, spacing[ax], start_coo)
+            length_coo = getattr(acquisition_details, f"length_{ax}_coo", None)
+            if length_coo is not None:
+                length = _scalar_to_world(length, spacing[ax], length_coo)
+            slices.append(RoiSlice(start=start, length=length, axis_name=ax))
+            if ax in ["x", "y", "z"]:
+                origins[f"{ax}_micrometer_original"] = start
+        roi = Roi(name=tile.fov_name, slices=slices, space="world", **origins)
+        regions.append(TileSlice(roi=roi, image_loader=tile.image_loader))
+    return RegionTable(regions)
+
+
+def main() -> None:
+    """Run the benchmark for every requested number of tiles."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--tiles", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--max-per-tile", type=int, default=100_000)
+    args = parser.parse_args()
+
+    options = ConverterOptions()
+    print(f"{'tiles':>9} {'per tile [s]':>13} {'batch [s]':>10} {'speedup':>8}")
+    for num_tiles in args.tiles:
+        tiles = _tiles(num_tiles)
+        baseline = float("nan")
+        if num_tiles <= args.max_per_tile:
+            timer = time.perf_counter()
+            expected = _per_tile_regions(tiles)
+            baseline = time.perf_counter() - timer
+        timer = time.perf_counter()
+        (tiled_image,) = tiled_image_from_tiles(tiles=tiles, converter_options=options)
+        batch = time.perf_counter() - timer
+        if num_tiles <= args.max_per_tile:
+            assert tiled_image.region_table == expected, "batch regions differ"
+        print(
+            f"{num_tiles:>9} {baseline:>13.2f} {batch:>10.3f} {baseline / batch:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
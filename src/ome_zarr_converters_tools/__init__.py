@@ -17,21 +17,29 @@ from ome_zarr_converters_tools.fractal import (
 )
 from ome_zarr_converters_tools.models import (
     AcquisitionDetails,
+    ByteTargetChunking,
     ChannelInfo,
+    ChunkBasedSharding,
     ChunkingStrategy,
     CollectionInterface,
     CollectionInterfaceType,
+    CompressionOptions,
     ConverterOptions,
     DataTypeEnum,
     DefaultImageLoader,
     FixedSizeChunking,
     FovBasedChunking,
+    FovBasedSharding,
     ImageInPlate,
     ImageLoaderInterfaceType,
+    ImageProbe,
+    NoSharding,
     OmeZarrOptions,
     OverwriteMode,
+    ShardingStrategy,
     SingleImage,
     StageCorrections,
+    WriterOptions,
     default_axes_builder,
     join_url_paths,
 )
@@ -47,25 +55,33 @@ __all__ = [
     "AcquisitionDetails",
     "AcquisitionOptions",
     "AttributeType",
+    "ByteTargetChunking",
     "ChannelInfo",
+    "ChunkBasedSharding",
     "ChunkingStrategy",
     "CollectionInterface",
     "CollectionInterfaceType",
+    "CompressionOptions",
     "ConvertParallelInitArgs",
     "ConverterOptions",
     "DataTypeEnum",
     "DefaultImageLoader",
     "FixedSizeChunking",
     "FovBasedChunking",
+    "FovBasedSharding",
     "ImageInPlate",
     "ImageListUpdateDict",
     "ImageLoaderInterfaceType",
+    "ImageProbe",
+    "NoSharding",
     "OmeZarrOptions",
     "OverwriteMode",
+    "ShardingStrategy",
     "SingleImage",
     "StageCorrections",
     "Tile",
     "TiledImage",
+    "WriterOptions",
     "converters_tools_models",
     "default_axes_builder",
     "generic_compute_task",
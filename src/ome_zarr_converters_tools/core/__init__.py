@@ -4,7 +4,17 @@ from ome_zarr_converters_tools.core._table import (
     hcs_images_from_dataframe,
     single_images_from_dataframe,
 )
+from ome_zarr_converters_tools.core._table_scan import (
+    iter_hcs_images_from_table,
+    iter_single_images_from_table,
+    scan_tiles_table,
+)
 from ome_zarr_converters_tools.core._tile import AttributeType, Tile
+from ome_zarr_converters_tools.core._tile_cache import (
+    TileCache,
+    TileCacheStats,
+    get_tile_cache,
+)
 from ome_zarr_converters_tools.core._tile_region import (
     TiledImage,
     TileFOVGroup,
@@ -20,13 +30,19 @@ from ome_zarr_converters_tools.models._url_utils import (
 __all__ = [
     "AttributeType",
     "Tile",
+    "TileCache",
+    "TileCacheStats",
     "TileFOVGroup",
     "TileSlice",
     "TiledImage",
     "find_url_type",
+    "get_tile_cache",
     "hcs_images_from_dataframe",
+    "iter_hcs_images_from_table",
+    "iter_single_images_from_table",
     "join_url_paths",
     "local_url_to_path",
+    "scan_tiles_table",
     "single_images_from_dataframe",
     "tiled_image_from_tiles",
 ]
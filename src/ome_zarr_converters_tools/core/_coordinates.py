@@ -0,0 +1,93 @@
+"""Batch conversions of coordinates between world and pixel space.
+
+Element-wise equivalents of ``ngio.common._roi.world_to_pixel`` and
+``pixel_to_world`` over NumPy arrays, so that the positions of all the tiles
+of an acquisition are converted with a few array operations. `to_world`
+checks that every coordinate can be represented in both spaces, and reports
+all the coordinates that can't at once.
+"""
+
+from collections.abc import Sequence
+
+import numpy as np
+
+from ome_zarr_converters_tools.models._acquisition import COO_SYSTEM_TYPE
+
+# Offending coordinates listed in the error message
+_MAX_REPORTED = 10
+
+
+def world_to_pixel(
+    values: np.ndarray, pixel_size: float, eps: float = 1e-2
+) -> np.ndarray:
+    """Vectorized ``ngio.common._roi.world_to_pixel``."""
+    raster = values / pixel_size
+    rounded = np.round(raster)
+    return np.where(np.abs(rounded - raster) < eps, rounded, raster)
+
+
+def pixel_to_world(values: np.ndarray, pixel_size: float) -> np.ndarray:
+    """Vectorized ``ngio.common._roi.pixel_to_world``."""
+    return values * pixel_size
+
+
+def _not_representable_error(
+    values: np.ndarray,
+    bad: np.ndarray,
+    spacing: float,
+    space: str,
+    labels: Sequence[str] | None,
+) -> ValueError:
+    rows = np.flatnonzero(bad)
+    if len(values) == 1 and labels is None:
+        return ValueError(
+            f"Coordinate {values[0]}, with spacing {spacing}, "
+            f"cannot be accurately represented in {space} coordinates."
+        )
+    reported = [
+        f"{values[row]}" if labels is None else f"{values[row]} ({labels[row]})"
+        for row in rows[:_MAX_REPORTED].tolist()
+    ]
+    if len(rows) > _MAX_REPORTED:
+        reported.append(f"... ({len(rows) - _MAX_REPORTED} more)")
+    return ValueError(
+        f"{len(rows)} coordinates, with spacing {spacing}, cannot be accurately "
+        f"represented in {space} coordinates: {', '.join(reported)}."
+    )
+
+
+def to_world(
+    values: np.ndarray,
+    *,
+    spacing: float,
+    coo_system: COO_SYSTEM_TYPE,
+    eps: float = 1e-6,
+    labels: Sequence[str] | None = None,
+) -> np.ndarray:
+    """Convert coordinates to world space, checking they fit the pixel grid.
+
+    World coordinates are converted to pixels and back, pixel coordinates to
+    world and back, and the round trip must stay within `eps`.
+
+    Args:
+        values: Coordinates in `coo_system`.
+        spacing: Pixel size along the axis.
+        coo_system: Space of `values`, "world" or "pixel".
+        eps: Tolerance of the round trip.
+        labels: Optional label of every value, for the error message.
+
+    Raises:
+        ValueError: Listing the coordinates that cannot be represented.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if coo_system == "world":
+        world = pixel_to_world(world_to_pixel(values, spacing), spacing)
+        bad = np.abs(world - values) > eps
+        space = "pixel"
+    else:
+        world = pixel_to_world(values, spacing)
+        bad = np.abs(world_to_pixel(world, spacing) - values) > eps
+        space = "world"
+    if bad.any():
+        raise _not_representable_error(values, bad, spacing, space, labels)
+    return world
@@ -27,14 +27,19 @@ Design decisions
    Output chunk tasks reference these keys; the scheduler ensures each key
    is computed once regardless of how many chunks depend on it.
 
-3. **Inverted overlap index — O(L*k) instead of O(C*L)**
+3. **Vectorized inverted overlap index — O(L*k) in NumPy**
    A naive approach iterates all L loaders for every chunk (O(C*L)).
    With 100k loaders and 100k chunks that's 10^10 checks.
 
-   Instead we invert the loop: for each loader, use ``bisect`` on the
-   sorted chunk-start coordinates to find the (small) set of chunks it
-   overlaps, then record that mapping.  Cost: O(L*k) where k is the
-   average number of chunks a loader spans (typically 1-4 for aligned tiles).
+   Instead we invert the loop: all loader bounds are stacked into a single
+   ``(L, ndim, 2)`` array and ``np.searchsorted`` on the sorted chunk-start
+   coordinates gives, in one call per axis, the range of chunks each loader
+   spans.  The per-loader ranges are expanded into ``(chunk, loader)`` pairs
+   and sorted by chunk, producing a CSR-style mapping (``indptr`` +
+   ``loader_ids``).  Cost: O(L*k) where k is the average number of chunks a
+   loader spans (typically 1-4 for aligned tiles), with no per-loader Python
+   loop — graph construction for 1M loaders is dominated by building the
+   graph dict itself, not by the overlap search.
 
 4. **Flat loader args — no intermediate graph keys**
    Dask resolves graph keys that appear as *positional arguments* in a task
@@ -69,19 +74,49 @@ Design decisions
      chunks.
    - *No loaders*: a shared ``np.full`` fill key is reused across all empty
      chunks with the same shape, avoiding redundant graph entries.
+
+6. **Occlusion culling**
+   With last-writer-wins compositing, a loader whose intersection with a
+   chunk is completely covered by *later* loaders contributes nothing to
+   that chunk.  For every chunk with more than one loader we walk the loaders
+   back to front over a compressed coordinate grid (the distinct loader
+   edges inside the chunk) and drop the ones that add no uncovered cell.
+   Loaders that end up invisible in every chunk are removed from the graph
+   altogether, so their files are never read.  The culling counts are
+   reported in ``GraphBuildStats``.
+
+7. **Windowed region reads**
+   Loading a whole tile for every chunk it touches keeps the full tile in
+   memory until the last of those chunks is computed.  Regions can come with
+   an optional *region loader* that reads only a window of the tile; for
+   those, every ``(chunk, loader)`` pair gets its own read task returning
+   exactly the intersection, and the full loader is never called.  Peak
+   memory then scales with the chunk size rather than the tile size.
 """
 
 import itertools
+import math
 import operator
-from bisect import bisect_left, bisect_right
-from collections import defaultdict
 from collections.abc import Callable
+from logging import getLogger
+from typing import NamedTuple
 
 import dask.array as da
 import numpy as np
 from dask import base as dask_base
 from dask.highlevelgraph import HighLevelGraph
 
+logger = getLogger(__name__)
+
+# Upper bound on the number of cells of the compressed coverage grid used to
+# test occlusion within a single chunk.  Above it, we fall back to testing
+# containment in a single later loader (cheaper, but less exhaustive).
+_MAX_COVERAGE_CELLS = 1 << 16
+# Chunks with at most this many loaders are screened with a vectorized
+# pairwise test, processed in batches of at most this many pairwise elements.
+_MAX_PAIRWISE_LOADERS = 32
+_MAX_PAIRWISE_ELEMENTS = 1 << 22
+
 
 def _normalize_slice(s: slice, dim_size: int) -> tuple[int, int]:
     """Convert a ``slice`` to an explicit ``(start, stop)`` pair."""
@@ -89,61 +124,475 @@ def _normalize_slice(s: slice, dim_size: int) -> tuple[int, int]:
     return start, stop
 
 
+ChunksType = tuple[int | tuple[int, ...], ...]
+"""Per-axis chunking: a uniform chunk size or explicit chunk sizes (dask style)."""
+
+
 def _build_chunk_ranges(
-    shape: tuple[int, ...], chunks: tuple[int, ...]
+    shape: tuple[int, ...], chunks: ChunksType
 ) -> list[list[tuple[int, int]]]:
     """Return per-axis lists of ``(start, stop)`` for every chunk."""
     ranges = []
     for dim_size, chunk_size in zip(shape, chunks, strict=True):
         axis_ranges = []
-        for start in range(0, dim_size, chunk_size):
-            axis_ranges.append((start, min(start + chunk_size, dim_size)))
+        if isinstance(chunk_size, tuple):
+            if sum(chunk_size) != dim_size:
+                raise ValueError(
+                    f"Explicit chunk sizes {chunk_size} do not add up to the "
+                    f"axis size {dim_size}"
+                )
+            start = 0
+            for size in chunk_size:
+                axis_ranges.append((start, start + size))
+                start += size
+        else:
+            for start in range(0, dim_size, chunk_size):
+                axis_ranges.append((start, min(start + chunk_size, dim_size)))
         ranges.append(axis_ranges)
     return ranges
 
 
+def aligned_chunks(
+    origin: tuple[int, ...], shape: tuple[int, ...], chunks: tuple[int, ...]
+) -> tuple[tuple[int, ...], ...]:
+    """Explicit chunk sizes aligning a region to a global chunk grid.
+
+    A region of *shape* placed at *origin* in an array chunked with *chunks*
+    is split so that every chunk of the region falls within exactly one
+    chunk of the array.  Writing such a dask array chunk by chunk never has
+    two tasks writing to the same array chunk.
+
+    Args:
+        origin: Start of the region in the global array, per axis.
+        shape: Shape of the region.
+        chunks: Chunk size of the global array, per axis.
+
+    Returns:
+        Per-axis tuples of chunk sizes, as accepted by ``dask.array``.
+    """
+    result = []
+    for start, size, chunk in zip(origin, shape, chunks, strict=True):
+        first = min(size, chunk - start % chunk)
+        rest, last = divmod(size - first, chunk)
+        axis_chunks = (first,) + (chunk,) * rest + ((last,) if last else ())
+        result.append(tuple(c for c in axis_chunks if c > 0) or (0,))
+    return tuple(result)
+
+
+class ChunkOverlapIndex(NamedTuple):
+    """CSR-style mapping from output chunks to the loaders overlapping them.
+
+    Chunks are numbered in C (row-major) order over the chunk grid.  The
+    loaders overlapping chunk ``c`` are ``loader_ids[indptr[c]:indptr[c + 1]]``,
+    in ascending order (i.e. in compositing order).
+
+    Attributes:
+        indptr: ``(C + 1,)`` offsets into ``loader_ids``.
+        loader_ids: Loader indices, grouped by chunk.
+        grid_shape: Number of chunks along each axis.
+    """
+
+    indptr: np.ndarray
+    loader_ids: np.ndarray
+    grid_shape: tuple[int, ...]
+
+    def loaders_for(self, chunk_linear_idx: int) -> np.ndarray:
+        """Return the loader indices overlapping a chunk (by linear index)."""
+        return self.loader_ids[
+            self.indptr[chunk_linear_idx] : self.indptr[chunk_linear_idx + 1]
+        ]
+
+
+def _bounds_to_array(
+    regions_slices: list[tuple[slice, ...]], shape: tuple[int, ...]
+) -> np.ndarray:
+    """Stack the normalized region slices into an ``(L, ndim, 2)`` int64 array.
+
+    Equivalent to applying ``_normalize_slice`` to every slice, but the common
+    case (explicit integer bounds) is resolved with array operations.
+    """
+    ndim = len(shape)
+    num_regions = len(regions_slices)
+    starts = [s.start for slices in regions_slices for s in slices]
+    stops = [s.stop for slices in regions_slices for s in slices]
+    if len(starts) != num_regions * ndim or None in starts or None in stops:
+        # Open-ended or mis-sized slices: fall back to slice.indices per axis.
+        bounds = np.empty((num_regions, ndim, 2), dtype=np.int64)
+        for li, slices in enumerate(regions_slices):
+            bounds[li] = [_normalize_slice(s, shape[ax]) for ax, s in enumerate(slices)]
+        return bounds
+
+    dim_sizes = np.asarray(shape, dtype=np.int64)
+    bounds = np.stack(
+        [
+            np.asarray(starts, dtype=np.int64).reshape(num_regions, ndim),
+            np.asarray(stops, dtype=np.int64).reshape(num_regions, ndim),
+        ],
+        axis=-1,
+    )
+    # Same semantics as slice.indices for a unit step: negative bounds count
+    # from the end, then everything is clipped to [0, dim_size].
+    dim_sizes = dim_sizes[None, :, None]
+    bounds = np.where(bounds < 0, bounds + dim_sizes, bounds)
+    return np.clip(bounds, 0, dim_sizes)
+
+
 def _build_chunk_to_loaders(
     chunk_ranges: list[list[tuple[int, int]]],
-    all_loader_bounds: list[tuple[tuple[int, int], ...]],
-) -> dict[tuple[int, ...], list[int]]:
-    """Map each chunk index to the loader indices that overlap it.
-
-    Uses an *inverted* approach: iterate over loaders (not chunks) and use
-    ``bisect`` on the sorted chunk-start coordinates to find the chunk index
-    range each loader spans per axis.  The Cartesian product of those per-axis
-    ranges gives the set of chunks the loader overlaps.
-
-    Complexity: O(L * k) where L = number of loaders and k = average number
-    of chunks per loader (typically 1-4), instead of O(C * L) for the naive
-    "scan all loaders per chunk" approach.
+    loader_bounds: np.ndarray,
+) -> ChunkOverlapIndex:
+    """Map each chunk to the loader indices that overlap it.
+
+    Uses an *inverted*, vectorized approach: ``np.searchsorted`` on the sorted
+    chunk-start coordinates finds, for all loaders at once, the chunk index
+    range each loader spans per axis.  The per-loader Cartesian products of
+    those ranges are expanded with ``np.repeat`` (mixed-radix unravelling of
+    each loader's local offsets) and sorted by chunk with a stable sort, so
+    loaders stay in compositing order within each chunk.
+
+    Args:
+        chunk_ranges: Per-axis ``(start, stop)`` of every chunk.
+        loader_bounds: ``(L, ndim, 2)`` array of loader ``(start, stop)``.
+
+    Returns:
+        A ``ChunkOverlapIndex`` in CSR layout.
     """
     ndim = len(chunk_ranges)
+    grid_shape = tuple(len(axis_ranges) for axis_ranges in chunk_ranges)
+    num_chunks = math.prod(grid_shape)
+    num_loaders = loader_bounds.shape[0]
+    if num_loaders == 0 or num_chunks == 0:
+        return ChunkOverlapIndex(
+            indptr=np.zeros(num_chunks + 1, dtype=np.int64),
+            loader_ids=np.zeros(0, dtype=np.int64),
+            grid_shape=grid_shape,
+        )
+
+    first = np.empty((num_loaders, ndim), dtype=np.int64)
+    last = np.empty((num_loaders, ndim), dtype=np.int64)
+    for ax, axis_ranges in enumerate(chunk_ranges):
+        starts = np.fromiter(
+            (start for start, _ in axis_ranges), dtype=np.int64, count=grid_shape[ax]
+        )
+        # searchsorted(right) - 1  →  first chunk that could contain lo
+        # searchsorted(left)       →  first chunk whose start >= hi (exclusive)
+        first[:, ax] = np.searchsorted(starts, loader_bounds[:, ax, 0], side="right")
+        last[:, ax] = np.searchsorted(starts, loader_bounds[:, ax, 1], side="left")
+    first = np.maximum(first - 1, 0)
+    last = np.minimum(last, np.asarray(grid_shape, dtype=np.int64))
+    spans = np.maximum(last - first, 0)
+    # Empty loaders (e.g. clipped away at the array edge) overlap nothing.
+    spans[(loader_bounds[:, :, 1] <= loader_bounds[:, :, 0]).any(axis=1)] = 0
+
+    counts = spans.prod(axis=1)
+    total = int(counts.sum())
+    pair_loader = np.repeat(np.arange(num_loaders, dtype=np.int64), counts)
+    # Local offset of each (chunk, loader) pair within its loader's block.
+    block_starts = np.cumsum(counts) - counts
+    remainder = np.arange(total, dtype=np.int64) - np.repeat(block_starts, counts)
+
+    # Unravel the local offsets (mixed radix = the loader's spans) and ravel
+    # the resulting chunk coordinates over the global chunk grid.
+    pair_chunk = np.zeros(total, dtype=np.int64)
+    stride = 1
+    for ax in reversed(range(ndim)):
+        axis_spans = spans[pair_loader, ax]
+        coord = first[pair_loader, ax] + remainder % axis_spans
+        remainder //= axis_spans
+        pair_chunk += coord * stride
+        stride *= grid_shape[ax]
+
+    order = np.argsort(pair_chunk, kind="stable")
+    indptr = np.zeros(num_chunks + 1, dtype=np.int64)
+    np.cumsum(np.bincount(pair_chunk, minlength=num_chunks), out=indptr[1:])
+    return ChunkOverlapIndex(
+        indptr=indptr, loader_ids=pair_loader[order], grid_shape=grid_shape
+    )
+
+
+class GraphBuildStats(NamedTuple):
+    """Summary of a ``lazy_array_from_regions`` graph build.
+
+    Attributes:
+        num_loaders: Number of input regions.
+        num_chunks: Number of output chunks.
+        num_overlaps: Number of ``(chunk, loader)`` overlaps before culling.
+        num_culled_overlaps: Overlaps dropped because the loader is fully
+            occluded by later loaders within that chunk.
+        num_culled_loaders: Loaders dropped from the graph because they are
+            not visible in any chunk.
+    """
+
+    num_loaders: int
+    num_chunks: int
+    num_overlaps: int
+    num_culled_overlaps: int
+    num_culled_loaders: int
+
+
+class RegionsCompositionPlan(NamedTuple):
+    """Chunk grid and (culled) chunk→loader mapping for a set of regions.
+
+    Attributes:
+        chunk_ranges: Per-axis ``(start, stop)`` of every chunk.
+        loader_bounds: ``(L, ndim, 2)`` array of loader ``(start, stop)``.
+        overlap_index: Chunk→loader mapping of the loaders to composite.
+        stats: Build statistics.
+    """
+
+    chunk_ranges: list[list[tuple[int, int]]]
+    loader_bounds: np.ndarray
+    overlap_index: ChunkOverlapIndex
+    stats: GraphBuildStats
 
-    # Sorted chunk-start coordinates per axis, used for bisect lookups.
-    chunk_starts: list[list[int]] = [
-        [start for start, _ in axis_ranges] for axis_ranges in chunk_ranges
+
+def _visible_in_chunk(
+    chunk_bounds: np.ndarray, loader_bounds: np.ndarray
+) -> np.ndarray:
+    """Return which of the (ordered) loaders are visible within a chunk.
+
+    Args:
+        chunk_bounds: ``(ndim, 2)`` bounds of the chunk.
+        loader_bounds: ``(k, ndim, 2)`` bounds of the loaders overlapping the
+            chunk, in compositing order.
+
+    Returns:
+        A boolean mask of length ``k``; ``False`` marks loaders whose
+        intersection with the chunk is covered by later loaders.
+    """
+    lo = np.maximum(loader_bounds[:, :, 0], chunk_bounds[:, 0])
+    hi = np.minimum(loader_bounds[:, :, 1], chunk_bounds[:, 1])
+    num = lo.shape[0]
+    visible = np.ones(num, dtype=bool)
+
+    edges = [
+        np.unique(np.concatenate([lo[:, ax], hi[:, ax]])) for ax in range(lo.shape[1])
     ]
-    n_chunks: list[int] = [len(axis_ranges) for axis_ranges in chunk_ranges]
+    if math.prod(len(e) - 1 for e in edges) > _MAX_COVERAGE_CELLS:
+        # Too many distinct edges: only test containment in a later loader.
+        for j in range(num - 1):
+            later_lo, later_hi = lo[j + 1 :], hi[j + 1 :]
+            contains = (later_lo <= lo[j]).all(axis=1) & (later_hi >= hi[j]).all(axis=1)
+            visible[j] = not contains.any()
+        return visible
+
+    lo_idx = np.stack(
+        [np.searchsorted(e, lo[:, ax]) for ax, e in enumerate(edges)], axis=1
+    )
+    hi_idx = np.stack(
+        [np.searchsorted(e, hi[:, ax]) for ax, e in enumerate(edges)], axis=1
+    )
+    covered = np.zeros(tuple(max(len(e) - 1, 0) for e in edges), dtype=bool)
+    for j in reversed(range(num)):
+        cells = covered[
+            tuple(slice(a, b) for a, b in zip(lo_idx[j], hi_idx[j], strict=True))
+        ]
+        if cells.all():
+            visible[j] = False
+        else:
+            cells[...] = True
+    return visible
+
+
+def _chunk_bounds_array(
+    chunk_ranges: list[list[tuple[int, int]]],
+    grid_shape: tuple[int, ...],
+    chunk_linear: np.ndarray,
+) -> np.ndarray:
+    """Return the ``(n, ndim, 2)`` bounds of the given (linear) chunks."""
+    coords = np.unravel_index(chunk_linear, grid_shape)
+    return np.stack(
+        [
+            np.asarray(axis_ranges, dtype=np.int64)[coords[ax]]
+            for ax, axis_ranges in enumerate(chunk_ranges)
+        ],
+        axis=1,
+    )
+
+
+def _screen_occlusion_pairwise(
+    chunk_bounds: np.ndarray, loader_bounds: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Vectorized occlusion screening for chunks with the same loader count.
+
+    Args:
+        chunk_bounds: ``(n, ndim, 2)`` bounds of ``n`` chunks.
+        loader_bounds: ``(n, k, ndim, 2)`` bounds of the ``k`` loaders of
+            each chunk, in compositing order.
+
+    Returns:
+        ``(contained, ambiguous)`` boolean arrays of shape ``(n, k)``.
+        *contained* marks loaders whose intersection with the chunk lies
+        within a single later loader (certainly occluded).  *ambiguous* marks
+        loaders that are not contained but overlap two or more later loaders,
+        so that only the exact coverage test can tell whether they are hidden.
+    """
+    lo = np.maximum(loader_bounds[..., 0], chunk_bounds[:, None, :, 0])
+    hi = np.minimum(loader_bounds[..., 1], chunk_bounds[:, None, :, 1])
+    # Pairwise arrays are indexed [chunk, a, b] and test loader b against a.
+    lo_a, hi_a = lo[:, :, None], hi[:, :, None]
+    lo_b, hi_b = lo[:, None], hi[:, None]
+    k = lo.shape[1]
+    later = np.triu(np.ones((k, k), dtype=bool), 1)
+    overlaps = ((lo_a < hi_b) & (lo_b < hi_a)).all(axis=-1) & later
+    contains = ((lo_b <= lo_a) & (hi_b >= hi_a)).all(axis=-1) & later
+    contained = contains.any(axis=-1)
+    ambiguous = (overlaps.sum(axis=-1) >= 2) & ~contained
+    return contained, ambiguous
+
+
+def _cull_occluded_loaders(
+    overlap_index: ChunkOverlapIndex,
+    chunk_ranges: list[list[tuple[int, int]]],
+    loader_bounds: np.ndarray,
+) -> ChunkOverlapIndex:
+    """Drop, per chunk, the loaders fully occluded by later loaders.
+
+    Chunks are first screened in bulk (grouped by loader count) with a
+    pairwise overlap/containment test; only chunks where a loader could be
+    hidden by the union of several later loaders go through the exact
+    per-chunk coverage test.
+    """
+    indptr, loader_ids, grid_shape = overlap_index
+    counts = np.diff(indptr)
+    keep = np.ones(len(loader_ids), dtype=bool)
+    ndim = loader_bounds.shape[1]
+    exact: list[np.ndarray] = []
+    for k in np.unique(counts[counts > 1]).tolist():
+        group = np.flatnonzero(counts == k)
+        if k > _MAX_PAIRWISE_LOADERS:
+            exact.append(group)
+            continue
+        # Bound the size of the (n, k, k, ndim) pairwise temporaries.
+        batch = max(1, _MAX_PAIRWISE_ELEMENTS // (k * k * ndim))
+        for i in range(0, len(group), batch):
+            chunk_linear = group[i : i + batch]
+            positions = indptr[chunk_linear][:, None] + np.arange(k)
+            contained, ambiguous = _screen_occlusion_pairwise(
+                _chunk_bounds_array(chunk_ranges, grid_shape, chunk_linear),
+                loader_bounds[loader_ids[positions]],
+            )
+            keep[positions] = ~contained
+            exact.append(chunk_linear[ambiguous.any(axis=1)])
+
+    exact_chunks = np.concatenate(exact).tolist() if exact else []
+    for chunk_linear in exact_chunks:
+        chunk_bounds = _chunk_bounds_array(
+            chunk_ranges, grid_shape, np.array([chunk_linear])
+        )[0]
+        start, stop = indptr[chunk_linear], indptr[chunk_linear + 1]
+        keep[start:stop] = _visible_in_chunk(
+            chunk_bounds, loader_bounds[loader_ids[start:stop]]
+        )
+    if keep.all():
+        return overlap_index
+    pair_chunk = np.repeat(np.arange(len(counts), dtype=np.int64), counts)
+    new_indptr = np.zeros_like(indptr)
+    np.cumsum(np.bincount(pair_chunk[keep], minlength=len(counts)), out=new_indptr[1:])
+    return ChunkOverlapIndex(
+        indptr=new_indptr, loader_ids=loader_ids[keep], grid_shape=grid_shape
+    )
+
+
+def plan_regions_composition(
+    regions_slices: list[tuple[slice, ...]],
+    shape: tuple[int, ...],
+    chunks: ChunksType,
+    cull_occluded: bool = True,
+) -> RegionsCompositionPlan:
+    """Compute which loaders contribute to which output chunk.
+
+    Args:
+        regions_slices: Per-axis slices of every region, in compositing order.
+        shape: Output array shape.
+        chunks: Chunk size per axis, or explicit chunk sizes per axis.
+        cull_occluded: Whether to drop loaders fully occluded by later ones.
+
+    Returns:
+        The chunk grid, the chunk→loader mapping and the build statistics.
+    """
+    ndim = len(shape)
+    if len(chunks) != ndim:
+        raise ValueError(
+            f"chunks length ({len(chunks)}) must match shape length ({ndim})"
+        )
+    loader_bounds = _bounds_to_array(regions_slices, shape)
+    chunk_ranges = _build_chunk_ranges(shape, chunks)
+    overlap_index = _build_chunk_to_loaders(chunk_ranges, loader_bounds)
+    num_overlaps = len(overlap_index.loader_ids)
+    overlapping = np.zeros(len(regions_slices), dtype=bool)
+    overlapping[overlap_index.loader_ids] = True
+    if cull_occluded:
+        overlap_index = _cull_occluded_loaders(
+            overlap_index, chunk_ranges, loader_bounds
+        )
+    used = np.zeros(len(regions_slices), dtype=bool)
+    used[overlap_index.loader_ids] = True
+    stats = GraphBuildStats(
+        num_loaders=len(regions_slices),
+        num_chunks=len(overlap_index.indptr) - 1,
+        num_overlaps=num_overlaps,
+        num_culled_overlaps=num_overlaps - len(overlap_index.loader_ids),
+        num_culled_loaders=int(np.count_nonzero(overlapping & ~used)),
+    )
+    return RegionsCompositionPlan(
+        chunk_ranges=chunk_ranges,
+        loader_bounds=loader_bounds,
+        overlap_index=overlap_index,
+        stats=stats,
+    )
 
-    chunk_to_loaders: dict[tuple[int, ...], list[int]] = defaultdict(list)
 
-    for li, lb in enumerate(all_loader_bounds):
-        chunk_idx_ranges = []
-        for ax in range(ndim):
-            lo, hi = lb[ax]
-            # bisect_right(starts, lo) - 1  →  first chunk that could contain lo
-            # bisect_left(starts, hi)       →  first chunk whose start >= hi (exclusive)
-            first = bisect_right(chunk_starts[ax], lo) - 1
-            last = bisect_left(chunk_starts[ax], hi)
-            chunk_idx_ranges.append(range(max(0, first), min(last, n_chunks[ax])))
+def visible_regions_mask(
+    regions_slices: list[tuple[slice, ...]],
+    shape: tuple[int, ...],
+    chunks: ChunksType | None = None,
+) -> np.ndarray:
+    """Return which regions are visible somewhere under last-writer-wins.
 
-        for chunk_idx in itertools.product(*chunk_idx_ranges):
-            chunk_to_loaders[chunk_idx].append(li)
+    Regions that are completely covered by later regions (or that do not
+    intersect the output at all) are ``False`` and can be skipped when
+    compositing.
 
-    return chunk_to_loaders
+    Args:
+        regions_slices: Per-axis slices of every region, in compositing order.
+        shape: Output array shape.
+        chunks: Chunk size used to partition the occlusion test. Defaults to
+            the extent of the first region, which keeps the per-chunk coverage
+            grids small for tiled data.
+    """
+    if len(regions_slices) == 0:
+        return np.zeros(0, dtype=bool)
+    if chunks is None:
+        first = _bounds_to_array(regions_slices[:1], shape)[0]
+        chunks = tuple(max(1, int(hi - lo)) for lo, hi in first)
+    plan = plan_regions_composition(regions_slices, shape, chunks)
+    visible = np.zeros(len(regions_slices), dtype=bool)
+    visible[plan.overlap_index.loader_ids] = True
+    return visible
+
+
+def intersect_bounds(
+    a: tuple[tuple[int, int], ...], b: tuple[tuple[int, int], ...]
+) -> tuple[tuple[int, int], ...]:
+    """Intersection of two ``(start, stop)`` boxes in global coordinates."""
+    return tuple(
+        (max(a_ax[0], b_ax[0]), min(a_ax[1], b_ax[1]))
+        for a_ax, b_ax in zip(a, b, strict=True)
+    )
+
+
+def local_slices(
+    bounds: tuple[tuple[int, int], ...], origin: tuple[tuple[int, int], ...]
+) -> tuple[slice, ...]:
+    """Slices of *bounds* relative to the start of *origin*."""
+    return tuple(
+        slice(b_ax[0] - o_ax[0], b_ax[1] - o_ax[0])
+        for b_ax, o_ax in zip(bounds, origin, strict=True)
+    )
 
 
-def _composite_chunk(
+def composite_chunk(
     chunk_bounds: tuple[tuple[int, int], ...],
     dtype: np.dtype,
     fill_value: float,
@@ -193,9 +642,12 @@ def _composite_chunk(
 def lazy_array_from_regions(
     regions: list[tuple[tuple[slice, ...], Callable[[], np.ndarray]]],
     shape: tuple[int, ...],
-    chunks: tuple[int, ...],
+    chunks: ChunksType,
     dtype: str = "uint16",
     fill_value: float = 0,
+    cull_occluded: bool = True,
+    region_loaders: list[Callable[[tuple[slice, ...]], np.ndarray] | None]
+    | None = None,
 ) -> da.Array:
     """Build a lazy dask array from overlapping (slices, loader) regions.
 
@@ -208,26 +660,28 @@ def lazy_array_from_regions(
         regions: Each entry is ``(per_axis_slices, loader)`` where *loader* is
             a zero-argument callable returning an ``np.ndarray``.
         shape: Output array shape.
-        chunks: Chunk size per axis.
+        chunks: Chunk size per axis, or explicit chunk sizes per axis
+            (e.g. from ``aligned_chunks``).
         dtype: Output dtype.
         fill_value: Value used for areas not covered by any loader.
+        cull_occluded: Whether to skip loaders that are fully covered by later
+            loaders (see "Occlusion culling" in the module docstring).
+        region_loaders: Optional list parallel to *regions*.  Non-``None``
+            entries are callables taking per-axis slices local to the region
+            and returning that window of the data; they are used once per
+            overlapped chunk instead of the full loader (see "Windowed region
+            reads" in the module docstring).
 
     Returns:
         A lazy ``dask.array.Array``.
     """
-    ndim = len(shape)
-    if len(chunks) != ndim:
-        raise ValueError(
-            f"chunks length ({len(chunks)}) must match shape length ({ndim})"
-        )
-
-    # Convert per-region slices to explicit (start, stop) bounds.
-    all_loader_bounds: list[tuple[tuple[int, int], ...]] = [
-        tuple(_normalize_slice(s, shape[ax]) for ax, s in enumerate(slices))
-        for slices, _ in regions
-    ]
-
-    chunk_ranges = _build_chunk_ranges(shape, chunks)
+    # Convert per-region slices to explicit (start, stop) bounds and find the
+    # loaders visible in each chunk.  See ``plan_regions_composition``.
+    plan = plan_regions_composition(
+        [slices for slices, _ in regions], shape, chunks, cull_occluded=cull_occluded
+    )
+    chunk_ranges, loader_bounds, overlap_index, stats = plan
+    logger.debug(f"Lazy regions graph build: {stats}")
     chunks_normalized = tuple(
         tuple(stop - start for start, stop in axis_ranges)
         for axis_ranges in chunk_ranges
@@ -235,30 +689,71 @@ def lazy_array_from_regions(
 
     # Deterministic token — same inputs produce the same graph keys, enabling
     # dask-level caching.  (Earlier versions used ``tokenize(id(...))`` which
-    # changed every run.)
-    token = dask_base.tokenize(shape, chunks, dtype, fill_value, all_loader_bounds)
+    # changed every run.)  Tokenizing the bounds array hashes its buffer, which
+    # is much cheaper than walking a list of tuples.
+    if region_loaders is None:
+        region_loaders = [None] * len(regions)
+    elif len(region_loaders) != len(regions):
+        raise ValueError(
+            f"region_loaders length ({len(region_loaders)}) must match "
+            f"regions length ({len(regions)})"
+        )
+    windowed = np.array([rl is not None for rl in region_loaders], dtype=bool)
+    token = dask_base.tokenize(
+        shape, chunks, dtype, fill_value, cull_occluded, loader_bounds, windowed
+    )
     output_name = f"lazy-regions-{token}"
 
-    # --- Inverted overlap index -----------------------------------------
-    # O(L*k) instead of O(C*L).  See ``_build_chunk_to_loaders`` docstring.
-    chunk_to_loaders = _build_chunk_to_loaders(chunk_ranges, all_loader_bounds)
+    indptr = overlap_index.indptr.tolist()
+    loader_ids = overlap_index.loader_ids.tolist()
+    # One flat ``[lo0, hi0, lo1, hi1, ...]`` list per loader is much cheaper
+    # to materialize than nested per-axis lists.
+    flat_bounds = loader_bounds.reshape(len(regions), -1).tolist()
+
+    def _loader_bounds(li: int) -> tuple[tuple[int, int], ...]:
+        flat = flat_bounds[li]
+        return tuple(zip(flat[0::2], flat[1::2], strict=True))
 
     # --- Loader layer ---------------------------------------------------
-    # One graph key per loader.  Multiple output chunks that depend on the
-    # same loader reference this key; the scheduler computes it only once.
+    # One graph key per visible loader.  Multiple output chunks that depend on
+    # the same loader reference this key; the scheduler computes it only once.
+    # Loaders culled from every chunk get no key and are never called.
+    # Windowed loaders get no key here: they are read per chunk instead.
     loader_layer_name = f"loader-{token}"
-    loader_layer: dict = {}
-    for i, (_, loader) in enumerate(regions):
-        loader_layer[(loader_layer_name, i)] = (loader,)
+    visible = np.unique(overlap_index.loader_ids)
+    loader_layer: dict = {
+        (loader_layer_name, i): (regions[i][1],)
+        for i in visible[~windowed[visible]].tolist()
+    }
+
+    # --- Region-read layer ----------------------------------------------
+    # One graph key per (windowed loader, chunk) pair that is composited.
+    read_layer_name = f"region-read-{token}"
+    read_layer: dict = {}
+
+    def _loader_arg(
+        li: int, chunk_linear: int, chunk_bounds: tuple[tuple[int, int], ...]
+    ) -> tuple[tuple, tuple[tuple[int, int], ...]]:
+        """Return the ``(key, bounds)`` composite args of a loader in a chunk."""
+        lb = _loader_bounds(li)
+        region_loader = region_loaders[li]
+        if region_loader is None:
+            return (loader_layer_name, li), lb
+        inter = intersect_bounds(chunk_bounds, lb)
+        read_key = (read_layer_name, li, chunk_linear)
+        read_layer[read_key] = (region_loader, local_slices(inter, lb))
+        return read_key, inter
 
     # --- Output layer ---------------------------------------------------
     # One graph key per output chunk.  Three cases, from cheapest to most
     # expensive:
     output_layer: dict = {}
-    for chunk_idx in itertools.product(*(range(len(cr)) for cr in chunk_ranges)):
+    for chunk_linear, chunk_idx in enumerate(
+        itertools.product(*(range(len(cr)) for cr in chunk_ranges))
+    ):
         chunk_bounds = tuple(chunk_ranges[ax][idx] for ax, idx in enumerate(chunk_idx))
         chunk_shape = tuple(stop - start for start, stop in chunk_bounds)
-        loader_indices = chunk_to_loaders.get(chunk_idx, [])
+        loader_indices = loader_ids[indptr[chunk_linear] : indptr[chunk_linear + 1]]
 
         out_key = (output_name, *chunk_idx)
 
@@ -273,34 +768,35 @@ def lazy_array_from_regions(
 
         elif len(loader_indices) == 1:
             li = loader_indices[0]
-            lb = all_loader_bounds[li]
+            lb = _loader_bounds(li)
             fully_covers = all(
                 lb_ax[0] <= cb[0] and cb[1] <= lb_ax[1]
                 for cb, lb_ax in zip(chunk_bounds, lb, strict=True)
             )
             if fully_covers:
                 # Case 2a — Single loader fully covers the chunk.
-                # Emit a direct getitem slice from the loader's output.
-                # No _composite_chunk call, no fill allocation — just a view.
-                src_slices = tuple(
-                    slice(cb[0] - lb_ax[0], cb[1] - lb_ax[0])
-                    for cb, lb_ax in zip(chunk_bounds, lb, strict=True)
-                )
-                output_layer[out_key] = (
-                    operator.getitem,
-                    (loader_layer_name, li),
-                    src_slices,
-                )
+                # Emit a direct getitem slice from the loader's output (or a
+                # windowed read of exactly the chunk).
+                # No composite_chunk call, no fill allocation — just a view.
+                src_slices = local_slices(chunk_bounds, lb)
+                region_loader = region_loaders[li]
+                if region_loader is None:
+                    output_layer[out_key] = (
+                        operator.getitem,
+                        (loader_layer_name, li),
+                        src_slices,
+                    )
+                else:
+                    output_layer[out_key] = (region_loader, src_slices)
             else:
                 # Case 2b — Single loader, partial coverage.
                 # Must composite onto a fill background.
                 output_layer[out_key] = (
-                    _composite_chunk,
+                    composite_chunk,
                     chunk_bounds,
                     dtype,
                     fill_value,
-                    (loader_layer_name, li),
-                    all_loader_bounds[li],
+                    *_loader_arg(li, chunk_linear, chunk_bounds),
                 )
         else:
             # Case 3 — Multiple overlapping loaders.
@@ -309,10 +805,9 @@ def lazy_array_from_regions(
             # the plain-tuple entries (bounds) through unchanged.
             flat_args: list = []
             for li in loader_indices:
-                flat_args.append((loader_layer_name, li))
-                flat_args.append(all_loader_bounds[li])
+                flat_args.extend(_loader_arg(li, chunk_linear, chunk_bounds))
             output_layer[out_key] = (
-                _composite_chunk,
+                composite_chunk,
                 chunk_bounds,
                 dtype,
                 fill_value,
@@ -320,8 +815,16 @@ def lazy_array_from_regions(
             )
 
     graph = HighLevelGraph(
-        layers={loader_layer_name: loader_layer, output_name: output_layer},
-        dependencies={loader_layer_name: set(), output_name: {loader_layer_name}},
+        layers={
+            loader_layer_name: loader_layer,
+            read_layer_name: read_layer,
+            output_name: output_layer,
+        },
+        dependencies={
+            loader_layer_name: set(),
+            read_layer_name: set(),
+            output_name: {loader_layer_name, read_layer_name},
+        },
     )
 
     return da.Array(
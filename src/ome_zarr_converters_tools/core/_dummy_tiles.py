@@ -7,7 +7,7 @@ from PIL import Image, ImageDraw, ImageFont
 
 from ome_zarr_converters_tools.core._tile import Tile
 from ome_zarr_converters_tools.models import AcquisitionDetails, CollectionInterface
-from ome_zarr_converters_tools.models._loader import ImageLoaderInterface
+from ome_zarr_converters_tools.models._loader import ImageLoaderInterface, ImageProbe
 
 
 def rasterize_text_with_boundary(shape_x, shape_y, text, font_scale=0.34):
@@ -71,6 +71,11 @@ class DummyLoader(ImageLoaderInterface):
         shape = tuple(int(s) for s in shape if s is not None)
         return np.broadcast_to(arr, shape)
 
+    def probe(self, resource: None = None) -> ImageProbe:
+        """Find the shape and data type without rasterizing the text."""
+        shape = (self.shape.t, self.shape.c, self.shape.z, self.shape.y, self.shape.x)
+        return ImageProbe(shape=tuple(int(s) for s in shape), dtype="uint8")
+
     def find_data_type(self, resource: None = None) -> str:
         """Find the data type of the image data."""
         return "uint8"
@@ -0,0 +1,639 @@
+"""Columnar (structure-of-arrays) storage of the regions of a TiledImage.
+
+A TiledImage can hold hundreds of thousands of TileSlices.  Keeping each of
+them as a pydantic model (a ``TileSlice`` holding a ``Roi`` holding one
+``RoiSlice`` per axis) costs several kilobytes per region, and every
+registration step used to rebuild all of them through ``model_copy``.
+
+`RegionTable` keeps the same information as a handful of NumPy arrays:
+starts and lengths per axis, the FOV name of each region as an integer code,
+and an index into the list of image loaders.  Registration steps operate on
+these arrays directly, and ``TileSlice`` models are only materialized when
+the regions are accessed as a sequence (writers, serialization, user code).
+``tiled_image_from_tiles`` packs the Tiles into columns directly, converting
+the coordinates of all of them at once.
+
+The columns are the only state of the table.  Their arrays are read-only,
+and the TileSlices handed out (by iteration, indexing or `select`) are fresh
+copies detached from the table.  TileSlices are frozen, so assigning their
+ROI raises, and their ROIs are copies: modifying them does not change the
+table.  The regions are modified through the table methods (`shift`,
+`to_pixel`, `take`, `set_coordinates`, `append`), which replace the arrays
+and bump the table `version`, used to invalidate the geometry cached by the
+TiledImage.
+"""
+
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any, Generic, NamedTuple, overload
+
+import numpy as np
+from ngio import PixelSize, Roi, RoiSlice
+from pydantic import GetCoreSchemaHandler
+from pydantic_core import core_schema
+
+from ome_zarr_converters_tools.core._coordinates import to_world, world_to_pixel
+from ome_zarr_converters_tools.models._loader import ImageLoaderInterfaceType
+
+if TYPE_CHECKING:
+    from ome_zarr_converters_tools.core._tile import Tile
+    from ome_zarr_converters_tools.core._tile_region import TileSlice
+    from ome_zarr_converters_tools.models import AcquisitionDetails
+
+_MISSING = object()
+
+
+class RegionColumns(NamedTuple):
+    """Structure-of-arrays view of N regions over A axes.
+
+    Attributes:
+        axes: Axis names, in order of first appearance in the ROIs.
+        starts: ``(N, A)`` float64 starts, NaN where the start is None.
+        lengths: ``(N, A)`` float64 lengths, NaN where the length is None.
+        present: ``(N, A)`` bool, whether the ROI has a slice along the axis.
+        is_pixel: ``(N,)`` bool, whether the ROI is in pixel space.
+        fov_codes: ``(N,)`` int64 index into `fov_names`, -1 for unnamed ROIs.
+        fov_names: FOV (ROI) names, in order of first appearance.
+        labels: ``(N,)`` object array of ROI labels, or None if all unset.
+        extras: Extra ROI fields, float64 columns if every ROI holds a float
+            value, object columns otherwise (missing values are skipped).
+        loader_index: ``(N,)`` int64 index into `loaders`.
+        loaders: Distinct image loaders.
+    """
+
+    axes: tuple[str, ...]
+    starts: np.ndarray
+    lengths: np.ndarray
+    present: np.ndarray
+    is_pixel: np.ndarray
+    fov_codes: np.ndarray
+    fov_names: list[str]
+    labels: np.ndarray | None
+    extras: dict[str, np.ndarray]
+    loader_index: np.ndarray
+    loaders: list[Any]
+
+    def axis_index(self, axis: str) -> int | None:
+        """Column of an axis, None if no region has a slice along it."""
+        return self.axes.index(axis) if axis in self.axes else None
+
+    def take(self, indices: np.ndarray) -> "RegionColumns":
+        """Rows selected (or reordered) by an integer index array."""
+        return self._replace(
+            starts=self.starts[indices],
+            lengths=self.lengths[indices],
+            present=self.present[indices],
+            is_pixel=self.is_pixel[indices],
+            fov_codes=self.fov_codes[indices],
+            labels=None if self.labels is None else self.labels[indices],
+            extras={key: value[indices] for key, value in self.extras.items()},
+            loader_index=self.loader_index[indices],
+        )
+
+
+def _columns_from_regions(regions: Sequence["TileSlice"]) -> RegionColumns:
+    """Pack TileSlices into columns."""
+    axes: dict[str, int] = {}
+    for region in regions:
+        for roi_slice in region.roi.slices:
+            axes.setdefault(roi_slice.axis_name, len(axes))
+
+    num_regions, num_axes = len(regions), len(axes)
+    starts = np.full((num_regions, num_axes), np.nan)
+    lengths = np.full((num_regions, num_axes), np.nan)
+    present = np.zeros((num_regions, num_axes), dtype=bool)
+    is_pixel = np.zeros(num_regions, dtype=bool)
+    fov_codes = np.empty(num_regions, dtype=np.int64)
+    loader_index = np.empty(num_regions, dtype=np.int64)
+    fov_names: dict[str, int] = {}
+    loaders: dict[int, int] = {}
+    loaders_list: list[Any] = []
+    labels: list[int | None] = []
+    extras: dict[str, list[Any]] = {}
+
+    for row, region in enumerate(regions):
+        roi = region.roi
+        for roi_slice in roi.slices:
+            column = axes[roi_slice.axis_name]
+            present[row, column] = True
+            if roi_slice.start is not None:
+                starts[row, column] = roi_slice.start
+            if roi_slice.length is not None:
+                lengths[row, column] = roi_slice.length
+        is_pixel[row] = roi.space == "pixel"
+        fov_codes[row] = (
+            -1 if roi.name is None else fov_names.setdefault(roi.name, len(fov_names))
+        )
+        loader = region.image_loader
+        if id(loader) not in loaders:
+            loaders[id(loader)] = len(loaders_list)
+            loaders_list.append(loader)
+        loader_index[row] = loaders[id(loader)]
+        labels.append(roi.label)
+        for key, value in (roi.model_extra or {}).items():
+            if key not in extras:
+                extras[key] = [_MISSING] * num_regions
+            extras[key][row] = value
+
+    extra_columns = {}
+    for key, values in extras.items():
+        if all(type(value) is float for value in values):
+            extra_columns[key] = np.array(values, dtype=np.float64)
+        else:
+            column_values = np.empty(num_regions, dtype=object)
+            column_values[:] = values
+            extra_columns[key] = column_values
+
+    label_column = None
+    if any(label is not None for label in labels):
+        label_column = np.empty(num_regions, dtype=object)
+        label_column[:] = labels
+
+    return RegionColumns(
+        axes=tuple(axes),
+        starts=starts,
+        lengths=lengths,
+        present=present,
+        is_pixel=is_pixel,
+        fov_codes=fov_codes,
+        fov_names=list(fov_names),
+        labels=label_column,
+        extras=extra_columns,
+        loader_index=loader_index,
+        loaders=loaders_list,
+    )
+
+
+def _as_objects(values: np.ndarray | None, num_rows: int, fill: Any) -> np.ndarray:
+    """Object column of `values`, or of `fill` if None."""
+    if values is None:
+        return np.full(num_rows, fill, dtype=object)
+    return values.astype(object)
+
+
+def _concat_columns(first: RegionColumns, second: RegionColumns) -> RegionColumns:
+    """Rows of `first` followed by the rows of `second`.
+
+    Same columns as packing the regions of both with `_columns_from_regions`,
+    without materializing them.
+    """
+    axes = first.axes + tuple(ax for ax in second.axes if ax not in first.axes)
+    num_first, num_second = len(first.fov_codes), len(second.fov_codes)
+
+    def spread(columns: RegionColumns, values: np.ndarray, fill: Any) -> np.ndarray:
+        out = np.full((len(columns.fov_codes), len(axes)), fill, dtype=values.dtype)
+        out[:, [axes.index(ax) for ax in columns.axes]] = values
+        return out
+
+    def merge(items: list[Any], new_items: list[Any], key: Callable) -> np.ndarray:
+        """Extend `items` in place, return the index of `new_items` in it."""
+        index = {key(item): i for i, item in enumerate(items)}
+        remap = []
+        for item in new_items:
+            if key(item) not in index:
+                index[key(item)] = len(items)
+                items.append(item)
+            remap.append(index[key(item)])
+        # Trailing -1, so that code -1 (unnamed ROI) is mapped to itself
+        return np.array([*remap, -1], dtype=np.int64)
+
+    fov_names = list(first.fov_names)
+    fov_remap = merge(fov_names, second.fov_names, str)
+    loaders = list(first.loaders)
+    loader_remap = merge(loaders, second.loaders, id)
+
+    labels = None
+    if first.labels is not None or second.labels is not None:
+        labels = np.concatenate(
+            [
+                _as_objects(first.labels, num_first, None),
+                _as_objects(second.labels, num_second, None),
+            ]
+        )
+    extras = {}
+    for key in dict.fromkeys([*first.extras, *second.extras]):
+        values, new_values = first.extras.get(key), second.extras.get(key)
+        if (
+            values is not None
+            and new_values is not None
+            and values.dtype == new_values.dtype == np.float64
+        ):
+            extras[key] = np.concatenate([values, new_values])
+        else:
+            extras[key] = np.concatenate(
+                [
+                    _as_objects(values, num_first, _MISSING),
+                    _as_objects(new_values, num_second, _MISSING),
+                ]
+            )
+
+    return RegionColumns(
+        axes=axes,
+        starts=np.concatenate(
+            [spread(first, first.starts, np.nan), spread(second, second.starts, np.nan)]
+        ),
+        lengths=np.concatenate(
+            [
+                spread(first, first.lengths, np.nan),
+                spread(second, second.lengths, np.nan),
+            ]
+        ),
+        present=np.concatenate(
+            [spread(first, first.present, False), spread(second, second.present, False)]
+        ),
+        is_pixel=np.concatenate([first.is_pixel, second.is_pixel]),
+        fov_codes=np.concatenate([first.fov_codes, fov_remap[second.fov_codes]]),
+        fov_names=fov_names,
+        labels=labels,
+        extras=extras,
+        loader_index=np.concatenate(
+            [first.loader_index, loader_remap[second.loader_index]]
+        ),
+        loaders=loaders,
+    )
+
+
+def _tile_roi_axes(acquisition_details: "AcquisitionDetails") -> list[str]:
+    """Axis names of the ROI of a tile, in order (see ``Tile.to_roi``)."""
+    swap = {"x": "y", "y": "x"} if acquisition_details.stage_corrections.swap_xy else {}
+    return [swap.get(axis, axis) for axis in acquisition_details.axes]
+
+
+def _columns_from_tiles(tiles: Sequence["Tile"]) -> RegionColumns:
+    """Pack the world space ROIs of Tiles into columns (batch ``Tile.to_roi``).
+
+    The positions of the tiles sharing their acquisition details are
+    converted together, and all the coordinates that can't be represented in
+    pixel space are reported at once.
+    """
+    groups: dict[int, list[int]] = {}
+    for row, tile in enumerate(tiles):
+        groups.setdefault(id(tile.acquisition_details), []).append(row)
+    group_axes = {
+        key: _tile_roi_axes(tiles[rows[0]].acquisition_details)
+        for key, rows in groups.items()
+    }
+    axes: dict[str, int] = {}
+    for roi_axes in group_axes.values():
+        for axis in roi_axes:
+            axes.setdefault(axis, len(axes))
+
+    num_regions, num_axes = len(tiles), len(axes)
+    starts = np.full((num_regions, num_axes), np.nan)
+    lengths = np.full((num_regions, num_axes), np.nan)
+    present = np.zeros((num_regions, num_axes), dtype=bool)
+    extras: dict[str, np.ndarray] = {}
+    extras_present: dict[str, np.ndarray] = {}
+
+    for key, rows in groups.items():
+        group = [tiles[row] for row in rows]
+        acquisition_details = group[0].acquisition_details
+        stage_corrections = acquisition_details.stage_corrections
+        spacing = {
+            "x": acquisition_details.pixelsize,
+            "y": acquisition_details.pixelsize,
+            "z": acquisition_details.z_spacing,
+            "t": acquisition_details.t_spacing,
+        }
+        roi_axes = group_axes[key]
+        fields = attrgetter(
+            *(f"{kind}_{axis}" for axis in roi_axes for kind in ("start", "length"))
+        )
+        values = np.array([fields(tile) for tile in group], dtype=np.float64)
+        values = values.reshape(len(group), 2 * len(roi_axes))
+        labels = [tile.fov_name for tile in group]
+        row_index = np.array(rows)
+        for i, axis in enumerate(roi_axes):
+            start, length = values[:, 2 * i], values[:, 2 * i + 1]
+            start_coo = getattr(acquisition_details, f"start_{axis}_coo", None)
+            if start_coo is not None:
+                start = to_world(
+                    start, spacing=spacing[axis], coo_system=start_coo, labels=labels
+                )
+            if (axis == "x" and stage_corrections.flip_x) or (
+                axis == "y" and stage_corrections.flip_y
+            ):
+                start = -start
+            length_coo = getattr(acquisition_details, f"length_{axis}_coo", None)
+            if length_coo is not None:
+                length = to_world(
+                    length, spacing=spacing[axis], coo_system=length_coo, labels=labels
+                )
+            column = axes[axis]
+            starts[row_index, column] = start
+            lengths[row_index, column] = length
+            present[row_index, column] = True
+            if axis in ("x", "y", "z"):
+                name = f"{axis}_micrometer_original"
+                if name not in extras:
+                    extras[name] = np.full(num_regions, np.nan)
+                    extras_present[name] = np.zeros(num_regions, dtype=bool)
+                extras[name][row_index] = start
+                extras_present[name][row_index] = True
+
+    extra_columns = {}
+    for name, values in extras.items():
+        if extras_present[name].all():
+            extra_columns[name] = values
+        else:
+            column_values = np.full(num_regions, _MISSING, dtype=object)
+            column_values[extras_present[name]] = values[extras_present[name]]
+            extra_columns[name] = column_values
+
+    fov_names: dict[str, int] = {}
+    loaders: dict[int, int] = {}
+    loaders_list: list[Any] = []
+    fov_codes = np.empty(num_regions, dtype=np.int64)
+    loader_index = np.empty(num_regions, dtype=np.int64)
+    for row, tile in enumerate(tiles):
+        fov_codes[row] = fov_names.setdefault(tile.fov_name, len(fov_names))
+        loader = tile.image_loader
+        if id(loader) not in loaders:
+            loaders[id(loader)] = len(loaders_list)
+            loaders_list.append(loader)
+        loader_index[row] = loaders[id(loader)]
+
+    return RegionColumns(
+        axes=tuple(axes),
+        starts=starts,
+        lengths=lengths,
+        present=present,
+        is_pixel=np.zeros(num_regions, dtype=bool),
+        fov_codes=fov_codes,
+        fov_names=list(fov_names),
+        labels=None,
+        extras=extra_columns,
+        loader_index=loader_index,
+        loaders=loaders_list,
+    )
+
+
+def _nan_to_none(values: np.ndarray) -> list[list[float | None]]:
+    """Nested list of the values, with None in place of NaN."""
+    objects = values.astype(object)
+    objects[np.isnan(values)] = None
+    nested: list[list[float | None]] = objects.tolist()
+    return nested
+
+
+def _frozen(columns: RegionColumns) -> RegionColumns:
+    """Mark the arrays of the columns read-only (in place), and return them."""
+    arrays = [columns.starts, columns.lengths, columns.present, columns.is_pixel]
+    arrays += [columns.fov_codes, columns.loader_index, *columns.extras.values()]
+    if columns.labels is not None:
+        arrays.append(columns.labels)
+    for array in arrays:
+        array.flags.writeable = False
+    return columns
+
+
+def _regions_from_columns(columns: RegionColumns) -> list["TileSlice"]:
+    """Materialize TileSlices from columns (without re-validating them)."""
+    from ome_zarr_converters_tools.core._tile_region import TileSlice
+
+    starts = _nan_to_none(columns.starts)
+    lengths = _nan_to_none(columns.lengths)
+    present = columns.present.tolist()
+    is_pixel = columns.is_pixel.tolist()
+    fov_codes = columns.fov_codes.tolist()
+    loader_index = columns.loader_index.tolist()
+    extras = {key: value.tolist() for key, value in columns.extras.items()}
+    labels = None if columns.labels is None else columns.labels.tolist()
+
+    regions: list[TileSlice] = []
+    for row in range(len(fov_codes)):
+        slices = [
+            RoiSlice.model_construct(
+                axis_name=axis, start=starts[row][column], length=lengths[row][column]
+            )
+            for column, axis in enumerate(columns.axes)
+            if present[row][column]
+        ]
+        fields: dict[str, Any] = {
+            key: values[row]
+            for key, values in extras.items()
+            if values[row] is not _MISSING
+        }
+        if labels is not None and labels[row] is not None:
+            fields["label"] = labels[row]
+        code = fov_codes[row]
+        roi = Roi.model_construct(
+            name=None if code < 0 else columns.fov_names[code],
+            slices=slices,
+            space="pixel" if is_pixel[row] else "world",
+            **fields,
+        )
+        regions.append(
+            TileSlice.model_construct(
+                roi=roi, image_loader=columns.loaders[loader_index[row]]
+            )
+        )
+    return regions
+
+
+class RegionTable(Generic[ImageLoaderInterfaceType]):
+    """Columnar store of the TileSlices of a TiledImage.
+
+    Behaves as a sequence of ``TileSlice`` (and validates from / serializes to
+    a list of them), while registration steps work on `columns`.  The
+    TileSlices handed out are detached copies, see the module docstring.
+    """
+
+    def __init__(self, regions: Iterable["TileSlice"] = ()) -> None:
+        self._columns = _frozen(_columns_from_regions(list(regions)))
+        # Snapshots of the appended regions, packed on the next column access
+        self._pending: list[TileSlice] = []
+        self._version = 0
+
+    @classmethod
+    def from_regions(
+        cls, regions: "Iterable[TileSlice] | RegionTable"
+    ) -> "RegionTable":
+        """Wrap a sequence of TileSlices (a RegionTable is returned as is)."""
+        if isinstance(regions, RegionTable):
+            return regions
+        return cls(regions)
+
+    @classmethod
+    def from_columns(cls, columns: RegionColumns) -> "RegionTable":
+        """Wrap columns (the arrays are not copied, but become read-only)."""
+        table = cls()
+        table._columns = _frozen(columns)
+        return table
+
+    @classmethod
+    def __get_pydantic_core_schema__(
+        cls, source_type: Any, handler: GetCoreSchemaHandler
+    ) -> core_schema.CoreSchema:
+        from ome_zarr_converters_tools.core._tile_region import TileSlice
+
+        args = getattr(source_type, "__args__", ())
+        item_type: Any = TileSlice[args[0]] if args else TileSlice  # type: ignore[valid-type]
+        list_schema = handler.generate_schema(list[item_type])
+        from_list = core_schema.no_info_after_validator_function(cls, list_schema)
+        return core_schema.json_or_python_schema(
+            json_schema=from_list,
+            python_schema=core_schema.union_schema(
+                [core_schema.is_instance_schema(cls), from_list]
+            ),
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                lambda table: table._rows(), return_schema=list_schema
+            ),
+        )
+
+    # --- Sequence of TileSlices ---
+
+    def _rows(self) -> list["TileSlice"]:
+        """All the regions, as detached TileSlices."""
+        return _regions_from_columns(self.columns)
+
+    def __len__(self) -> int:
+        return len(self._columns.fov_codes) + len(self._pending)
+
+    def __iter__(self) -> Iterator["TileSlice"]:
+        return iter(self._rows())
+
+    @overload
+    def __getitem__(self, index: int) -> "TileSlice": ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list["TileSlice"]: ...
+
+    def __getitem__(self, index: int | slice) -> "TileSlice | list[TileSlice]":
+        if isinstance(index, slice):
+            return self.select(range(len(self))[index])
+        return self.select([range(len(self))[index]])[0]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, RegionTable):
+            return self._rows() == other._rows()
+        if isinstance(other, list):
+            return self._rows() == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"RegionTable({len(self)} regions)"
+
+    def append(self, region: "TileSlice") -> None:
+        """Append a copy of a TileSlice."""
+        roi = region.roi.model_copy(deep=True)
+        self._pending.append(region.model_copy(update={"roi": roi}))
+        self._version += 1
+
+    def extend(self, regions: Iterable["TileSlice"]) -> None:
+        """Append copies of several TileSlices."""
+        for region in regions:
+            self.append(region)
+
+    @property
+    def version(self) -> int:
+        """Counter bumped by every modification of the regions."""
+        return self._version
+
+    # --- Columnar access ---
+
+    @property
+    def columns(self) -> RegionColumns:
+        """The columns, with read-only arrays.
+
+        Use `set_coordinates` (or the other table methods) to modify them.
+        """
+        if self._pending:
+            pending = _columns_from_regions(self._pending)
+            self._columns = _frozen(_concat_columns(self._columns, pending))
+            self._pending = []
+        return self._columns
+
+    def _replace(self, **arrays: Any) -> None:
+        """Replace some column arrays, and bump the version."""
+        self._columns = _frozen(self.columns._replace(**arrays))
+        self._version += 1
+
+    def set_coordinates(
+        self, starts: np.ndarray | None = None, lengths: np.ndarray | None = None
+    ) -> None:
+        """Replace the ``(N, A)`` starts and / or lengths of the regions.
+
+        Raises:
+            ValueError: If an array does not have the shape of the columns.
+        """
+        columns = self.columns
+        arrays = {}
+        for name, values in (("starts", starts), ("lengths", lengths)):
+            if values is None:
+                continue
+            values = np.array(values, dtype=np.float64)
+            if values.shape != columns.starts.shape:
+                raise ValueError(
+                    f"Expected {name} of shape {columns.starts.shape}, "
+                    f"got {values.shape}."
+                )
+            arrays[name] = values
+        self._replace(**arrays)
+
+    def select(self, rows: Iterable[int]) -> list["TileSlice"]:
+        """Materialize only some regions (detached from the table)."""
+        indices = np.fromiter(rows, dtype=np.int64)
+        return _regions_from_columns(self.columns.take(indices))
+
+    def take(self, indices: np.ndarray) -> None:
+        """Reorder (or select) the regions by an integer index array."""
+        self._columns = _frozen(self.columns.take(indices))
+        self._version += 1
+
+    def fov_order(self) -> np.ndarray:
+        """Row order grouping the regions by FOV, in order of first appearance.
+
+        Raises:
+            ValueError: If a region ROI has no name.
+        """
+        fov_codes = self.columns.fov_codes
+        if (fov_codes < 0).any():
+            raise ValueError("TileSlice ROI must have a name to group by FOV.")
+        return np.argsort(fov_codes, kind="stable")
+
+    def shift(self, vector: Mapping[str, float | np.ndarray]) -> None:
+        """Move the regions by a delta per axis (a scalar or one per region).
+
+        Vectorized ``move_roi_by``: regions without a slice along an axis are
+        left unchanged along it.
+        """
+        columns = self.columns
+        starts = columns.starts.copy()
+        for axis, delta in vector.items():
+            column = columns.axis_index(axis)
+            if column is not None:
+                starts[:, column] += delta
+        self._replace(starts=starts)
+
+    def to_pixel(self, pixel_size: PixelSize) -> None:
+        """Convert the world space regions to pixel space (``Roi.to_pixel``)."""
+        columns = self.columns
+        world = ~columns.is_pixel
+        if not world.any():
+            return
+        starts, lengths = columns.starts.copy(), columns.lengths.copy()
+        for column, axis in enumerate(columns.axes):
+            axis_size = pixel_size.get(axis, default=1.0)
+            for values in (starts, lengths):
+                values[world, column] = world_to_pixel(values[world, column], axis_size)
+        self._replace(
+            starts=starts, lengths=lengths, is_pixel=np.ones_like(columns.is_pixel)
+        )
+
+    def bounding_rows(self) -> list[int]:
+        """Rows holding the minimum start and the maximum end along each axis.
+
+        The union of these regions is the union of all of them; rows are
+        picked as ``bulk_roi_union`` does (first occurrence, axes of the first
+        region), and the first row is always included.
+        """
+        columns = self.columns
+        if len(columns.fov_codes) == 0:
+            raise ValueError("Cannot compute the union of an empty set of regions.")
+        rows = {0}
+        for column in np.flatnonzero(columns.present[0]):
+            rows.add(int(np.argmin(columns.starts[:, column])))
+            ends = columns.starts[:, column] + columns.lengths[:, column]
+            rows.add(int(np.argmax(ends)))
+        return sorted(rows)
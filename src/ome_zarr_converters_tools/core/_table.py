@@ -1,81 +1,275 @@
-"""Functions to build TiledImage models from Tile models."""
+"""Functions to build Tile models from a tiles table.
 
-from typing import Any
+The table is ingested column-wise: its columns are split once between the
+image loader, the collection and the tile fields (the remaining columns become
+attributes), each column is validated as a whole against the type of its
+field, and the models are then assembled row by row with `model_construct`,
+skipping the per-row validation.
+
+Filters that only depend on the collection (the built-in path and well
+filters) are evaluated once per distinct collection, and the rows they reject
+are dropped before any validation or Tile construction. Other filters are
+applied to the built tiles.
+"""
+
+from collections.abc import Callable, Iterable, Sequence
+from functools import cache
+from typing import TYPE_CHECKING, Annotated, Any
 
 import pandas as pd
+from pydantic import BaseModel, TypeAdapter, ValidationError
 
 from ome_zarr_converters_tools.core._tile import Tile
 from ome_zarr_converters_tools.models import (
     AcquisitionDetails,
+    CollectionInterface,
     DefaultImageLoader,
     ImageInPlate,
     SingleImage,
 )
 
+if TYPE_CHECKING:
+    from ome_zarr_converters_tools.pipelines._filters import FilterModel
 
-def _build_default_image_loader(
-    *,
-    data: dict[str, Any],
-) -> tuple[DefaultImageLoader, dict[str, Any]]:
-    """Build an image loader for a tile row dictionary."""
-    image_loader_data = {}
-    out_data = {}
-    for key, value in data.items():
-        if key in DefaultImageLoader.model_fields.keys():
-            image_loader_data[key] = value
+# Tile fields that are not read from the tiles table
+_TILE_MODEL_FIELDS = ("attributes", "collection", "image_loader", "acquisition_details")
+
+# Extra columns are stored as attributes. Since we support condition tables
+# with multiple values per attribute, each value is wrapped in a list.
+_ATTRIBUTE_ADAPTER: TypeAdapter[list[Any]] = TypeAdapter(
+    list[str | int | float | bool | None]
+)
+
+
+@cache
+def _column_adapter(model: type[BaseModel], field: str) -> TypeAdapter[list[Any]]:
+    """TypeAdapter validating a whole column against a field of `model`."""
+    info = model.model_fields[field]
+    item_type: Any = info.annotation
+    if info.metadata:
+        item_type = Annotated[(item_type, *info.metadata)]
+    return TypeAdapter(list[item_type])
+
+
+def _validate_column(
+    values: list[Any], column: str, adapter: TypeAdapter[list[Any]]
+) -> list[Any]:
+    """Validate all the values of a column at once."""
+    try:
+        return adapter.validate_python(values)
+    except ValidationError as e:
+        raise ValueError(
+            f"Invalid values in column '{column}' of the tiles table: {e}"
+        ) from e
+
+
+def _partition_columns(
+    columns: Iterable[str], models: Sequence[type[BaseModel]]
+) -> tuple[list[list[str]], list[str]]:
+    """Split the table columns between the models, and the attribute columns.
+
+    Each column goes to the first model that has a field with the same name.
+    """
+    model_columns: list[list[str]] = [[] for _ in models]
+    attribute_columns = []
+    for column in columns:
+        for model, group in zip(models, model_columns, strict=True):
+            if column in model.model_fields:
+                group.append(column)
+                break
         else:
-            out_data[key] = value
-    image_loader = DefaultImageLoader(**image_loader_data)
-    return image_loader, out_data
-
-
-def _build_plate_collection(
-    *, data: dict[str, Any], plate_name: str, acquisition: int
-) -> tuple[ImageInPlate, dict[str, Any]]:
-    """Build an ImageInPlate collection for a tile row dictionary."""
-    collection_data = {}
-    out_data = {}
-    for key, value in data.items():
-        if key in ImageInPlate.model_fields.keys():
-            collection_data[key] = value
+            attribute_columns.append(column)
+    return model_columns, attribute_columns
+
+
+def _validate_model_columns(
+    table: dict[str, list[Any]],
+    model: type[BaseModel],
+    columns: list[str],
+    exclude: Iterable[str] = (),
+) -> dict[str, list[Any]]:
+    """Validate the columns of the fields of `model`.
+
+    Raises:
+        ValueError: If a required field (not in `exclude`) has no column, or a
+            column has invalid values.
+    """
+    exclude = set(exclude)
+    missing = [
+        name
+        for name, info in model.model_fields.items()
+        if info.is_required() and name not in columns and name not in exclude
+    ]
+    if missing:
+        raise ValueError(
+            f"The tiles table is missing the columns {missing} "
+            f"required by {model.__name__}."
+        )
+    return {
+        column: _validate_column(table[column], column, _column_adapter(model, column))
+        for column in columns
+    }
+
+
+def _build_collections(
+    *,
+    table: dict[str, list[Any]],
+    num_rows: int,
+    collection_type: type[CollectionInterface],
+    columns: list[str],
+    constants: dict[str, Any],
+    collection_filter: Callable[[CollectionInterface], bool] | None = None,
+) -> list[CollectionInterface | None]:
+    """Build one collection per row, validating each distinct collection once.
+
+    Collections can have field validators, so they are validated as models
+    rather than column-wise. Every row gets its own copy, since the tiling
+    suffix is set per tile when building the TiledImages. Rows whose
+    collection is rejected by `collection_filter` get None.
+    """
+    if columns:
+        rows: Iterable[tuple[Any, ...]] = zip(
+            *(table[column] for column in columns), strict=True
+        )
+    else:
+        rows = [()] * num_rows
+    validated: dict[tuple[Any, ...], CollectionInterface | None] = {}
+    collections: list[CollectionInterface | None] = []
+    for row in rows:
+        if row in validated:
+            collection = validated[row]
         else:
-            out_data[key] = value
-    collection = ImageInPlate(
-        **collection_data, plate_name=plate_name, acquisition=acquisition
+            collection_data = dict(zip(columns, row, strict=True))
+            collection = collection_type(**collection_data, **constants)
+            if collection_filter is not None and not collection_filter(collection):
+                collection = None
+            validated[row] = collection
+        collections.append(None if collection is None else collection.model_copy())
+    return collections
+
+
+def _split_filters(
+    filters: Sequence["FilterModel"] | None,
+) -> tuple[Callable[[CollectionInterface], bool] | None, list["FilterModel"]]:
+    """Split the filters between collection filters and per-tile filters."""
+    if not filters:
+        return None, []
+    # Imported here, since the pipelines depend on the core models
+    from ome_zarr_converters_tools.pipelines._filters import split_collection_filters
+
+    return split_collection_filters(filters)
+
+
+def _apply_tile_filters(
+    tiles: list[Tile], filters: Sequence["FilterModel"]
+) -> list[Tile]:
+    """Apply the filters that need the built tiles."""
+    if not filters:
+        return tiles
+    from ome_zarr_converters_tools.pipelines._filters import apply_filter_pipeline
+
+    return apply_filter_pipeline(tiles, filters_config=filters)
+
+
+def _check_reserved_columns(
+    columns: Iterable[str], collection_constants: dict[str, Any]
+) -> None:
+    """Raise a ValueError if the table has columns set by the converter."""
+    reserved = [*collection_constants, *_TILE_MODEL_FIELDS]
+    conflicts = [column for column in columns if column in reserved]
+    if conflicts:
+        raise ValueError(
+            f"The tiles table can't have the columns {conflicts}, "
+            "they are set by the converter."
+        )
+
+
+def _tiles_from_columns(
+    *,
+    tiles_table: dict[str, list[Any]],
+    num_rows: int,
+    acquisition_details: AcquisitionDetails,
+    collection_type: type[CollectionInterface],
+    collection_constants: dict[str, Any],
+    filters: Sequence["FilterModel"] | None = None,
+) -> list[Tile]:
+    """Build one Tile per row (kept by `filters`) of a dict of columns."""
+    _check_reserved_columns(tiles_table, collection_constants)
+    (loader_columns, collection_columns, tile_columns), attribute_columns = (
+        _partition_columns(tiles_table, (DefaultImageLoader, collection_type, Tile))
+    )
+    collection_filter, tile_filters = _split_filters(filters)
+    maybe_collections = _build_collections(
+        table=tiles_table,
+        num_rows=num_rows,
+        collection_type=collection_type,
+        columns=collection_columns,
+        constants=collection_constants,
+        collection_filter=collection_filter,
+    )
+    collections = [c for c in maybe_collections if c is not None]
+    if len(collections) < num_rows:
+        kept = [i for i, c in enumerate(maybe_collections) if c is not None]
+        tiles_table = {
+            column: [values[i] for i in kept] for column, values in tiles_table.items()
+        }
+        num_rows = len(kept)
+
+    loader_data = _validate_model_columns(
+        tiles_table, DefaultImageLoader, loader_columns
+    )
+    tile_data = _validate_model_columns(
+        tiles_table, Tile, tile_columns, exclude=_TILE_MODEL_FIELDS
+    )
+    attributes_data = {
+        column: _validate_column(tiles_table[column], column, _ATTRIBUTE_ADAPTER)
+        for column in attribute_columns
+    }
+
+    empty_rows = [()] * num_rows
+    loader_rows = zip(*loader_data.values(), strict=True) if loader_data else empty_rows
+    tile_rows = zip(*tile_data.values(), strict=True) if tile_data else empty_rows
+    attributes_rows = (
+        zip(*attributes_data.values(), strict=True) if attributes_data else empty_rows
+    )
+    tiles = []
+    for collection, loader_row, tile_row, attributes_row in zip(
+        collections, loader_rows, tile_rows, attributes_rows, strict=True
+    ):
+        image_loader = DefaultImageLoader.model_construct(
+            **dict(zip(loader_columns, loader_row, strict=True))
+        )
+        tile: Tile = Tile.model_construct(
+            **dict(zip(tile_columns, tile_row, strict=True)),
+            image_loader=image_loader,
+            collection=collection,
+            acquisition_details=acquisition_details,
+            attributes={
+                column: [value]
+                for column, value in zip(attribute_columns, attributes_row, strict=True)
+            },
+        )
+        tiles.append(tile)
+    return _apply_tile_filters(tiles, tile_filters)
+
+
+def _tiles_from_dataframe(
+    *,
+    tiles_table: pd.DataFrame,
+    acquisition_details: AcquisitionDetails,
+    collection_type: type[CollectionInterface],
+    collection_constants: dict[str, Any],
+    filters: Sequence["FilterModel"] | None,
+) -> list[Tile]:
+    """Build one Tile per row of a pandas tiles table."""
+    return _tiles_from_columns(
+        tiles_table={column: tiles_table[column].tolist() for column in tiles_table},
+        num_rows=len(tiles_table),
+        acquisition_details=acquisition_details,
+        collection_type=collection_type,
+        collection_constants=collection_constants,
+        filters=filters,
     )
-    return collection, out_data
-
-
-def _build_single_image_collection(
-    *, data: dict[str, Any]
-) -> tuple[SingleImage, dict[str, Any]]:
-    """Build a SingleImage collection for a tile row dictionary."""
-    collection_data = {}
-    out_data = {}
-    for key, value in data.items():
-        if key in SingleImage.model_fields.keys():
-            collection_data[key] = value
-        else:
-            out_data[key] = value
-    collection = SingleImage(**collection_data)
-    return collection, out_data
-
-
-def build_tile_data_and_attributes_from_row(
-    *, data: dict[str, Any]
-) -> tuple[dict[str, Any], dict[str, Any]]:
-    """Split a tile row dictionary into tile data and attributes."""
-    tile_data = {}
-    attributes_data = {}
-    for key, value in data.items():
-        if key in Tile.model_fields.keys():
-            tile_data[key] = value
-        else:
-            # Extra fields will be added as attributes later
-            # Since we support condition tables with
-            # multiple values per attribute, we need to store them as lists
-            attributes_data[key] = [value]
-    return tile_data, attributes_data
 
 
 def hcs_images_from_dataframe(
@@ -84,6 +278,7 @@ def hcs_images_from_dataframe(
     acquisition_details: AcquisitionDetails,
     plate_name: str | None = None,
     acquisition_id: int = 0,
+    filters: Sequence["FilterModel"] | None = None,
 ) -> list[Tile]:
     """Build a list of TiledImages belonging to an HCS acquisition.
 
@@ -92,58 +287,37 @@ def hcs_images_from_dataframe(
         acquisition_details: AcquisitionDetails model for the acquisition.
         plate_name: Optional name of the plate.
         acquisition_id: Acquisition index.
+        filters: Optional filters selecting the tiles to build.
     """
-    plate_name = plate_name or "Plate"
-    tiles = []
-    for _, row in tiles_table.iterrows():
-        row_dict = row.to_dict()
-        image_loader, row_dict = _build_default_image_loader(data=row_dict)
-        collection, row_dict = _build_plate_collection(
-            data=row_dict,
-            plate_name=plate_name,
-            acquisition=acquisition_id,
-        )
-        tile_data, attributes_data = build_tile_data_and_attributes_from_row(
-            data=row_dict
-        )
-        tile = Tile(
-            **tile_data,
-            image_loader=image_loader,
-            collection=collection,
-            acquisition_details=acquisition_details,
-            attributes=attributes_data,
-        )
-        tiles.append(tile)
-    return tiles
+    return _tiles_from_dataframe(
+        tiles_table=tiles_table,
+        acquisition_details=acquisition_details,
+        collection_type=ImageInPlate,
+        collection_constants={
+            "plate_name": plate_name or "Plate",
+            "acquisition": acquisition_id,
+        },
+        filters=filters,
+    )
 
 
 def single_images_from_dataframe(
     *,
     tiles_table: pd.DataFrame,
     acquisition_details: AcquisitionDetails,
+    filters: Sequence["FilterModel"] | None = None,
 ) -> list[Tile]:
     """Build a list of TiledImages belonging to an HCS acquisition.
 
     Args:
         tiles_table: DataFrame containing the tiles table.
         acquisition_details: AcquisitionDetails model for the acquisition.
+        filters: Optional filters selecting the tiles to build.
     """
-    tiles = []
-    for _, row in tiles_table.iterrows():
-        row_dict = row.to_dict()
-        image_loader, row_dict = _build_default_image_loader(data=row_dict)
-        collection, row_dict = _build_single_image_collection(
-            data=row_dict,
-        )
-        tile_data, attributes_data = build_tile_data_and_attributes_from_row(
-            data=row_dict
-        )
-        tile = Tile(
-            **tile_data,
-            image_loader=image_loader,
-            collection=collection,
-            acquisition_details=acquisition_details,
-            attributes=attributes_data,
-        )
-        tiles.append(tile)
-    return tiles
+    return _tiles_from_dataframe(
+        tiles_table=tiles_table,
+        acquisition_details=acquisition_details,
+        collection_type=SingleImage,
+        collection_constants={},
+        filters=filters,
+    )
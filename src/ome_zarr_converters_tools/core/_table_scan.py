@@ -0,0 +1,223 @@
+"""Functions to stream Tile models from tiles tables too large for memory.
+
+The tiles table is scanned lazily with polars (`scan_csv` or `scan_parquet`),
+so that predicates filter the rows while the file is read. A first pass reads
+only the collection columns to count the rows of every output image and group
+the images in batches of about `batch_size` rows. The table is then read once
+more, sorted by batch, and streamed one batch at a time, each batch holding
+all the tiles of its images. Every batch can be aggregated into TiledImages
+on its own.
+
+Filters that only depend on the collection (the built-in path and well
+filters) are evaluated on the distinct collections found by the first pass,
+and only the images they keep are read afterwards.
+"""
+
+from collections.abc import Iterable, Iterator, Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import polars as pl
+
+from ome_zarr_converters_tools.core._table import (
+    _build_collections,
+    _check_reserved_columns,
+    _partition_columns,
+    _split_filters,
+    _tiles_from_columns,
+)
+from ome_zarr_converters_tools.core._tile import Tile
+from ome_zarr_converters_tools.models import (
+    AcquisitionDetails,
+    CollectionInterface,
+    DefaultImageLoader,
+    ImageInPlate,
+    SingleImage,
+)
+
+if TYPE_CHECKING:
+    from ome_zarr_converters_tools.pipelines._filters import FilterModel
+
+# Batch index of every row, added while streaming the table
+_BATCH_COLUMN = "__tiles_batch__"
+
+
+def scan_tiles_table(source: str | Path, **scan_kwargs: Any) -> pl.LazyFrame:
+    """Lazily scan a tiles table from a CSV or a Parquet file.
+
+    Args:
+        source: Path to the tiles table. Files ending in `.parquet` are read
+            with `polars.scan_parquet`, all others with `polars.scan_csv`.
+        **scan_kwargs: Additional keyword arguments for the polars scan.
+    """
+    if Path(source).suffix.lower() == ".parquet":
+        return pl.scan_parquet(source, **scan_kwargs)
+    return pl.scan_csv(source, **scan_kwargs)
+
+
+def _iter_tile_batches(
+    *,
+    tiles_table: pl.LazyFrame | str | Path,
+    acquisition_details: AcquisitionDetails,
+    collection_type: type[CollectionInterface],
+    collection_constants: dict[str, Any],
+    predicate: pl.Expr | None,
+    filters: Sequence["FilterModel"] | None,
+    batch_size: int,
+) -> Iterator[list[Tile]]:
+    """Yield the tiles of the table in batches of whole output images."""
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1.")
+    if not isinstance(tiles_table, pl.LazyFrame):
+        tiles_table = scan_tiles_table(tiles_table)
+    if predicate is not None:
+        tiles_table = tiles_table.filter(predicate)
+    columns = tiles_table.collect_schema().names()
+    _check_reserved_columns(columns, collection_constants)
+    (_, key_columns), _ = _partition_columns(
+        columns, (DefaultImageLoader, collection_type)
+    )
+
+    collection_filter, tile_filters = _split_filters(filters)
+    if key_columns:
+        counts = tiles_table.group_by(key_columns, maintain_order=True).len().collect()
+    else:
+        counts = tiles_table.select(pl.len()).collect()
+    if collection_filter is not None:
+        collections = _build_collections(
+            table=counts.select(key_columns).to_dict(as_series=False),
+            num_rows=counts.height,
+            collection_type=collection_type,
+            columns=key_columns,
+            constants=collection_constants,
+            collection_filter=collection_filter,
+        )
+        keep = [collection is not None for collection in collections]
+        counts = counts.filter(pl.Series(keep, dtype=pl.Boolean))
+    image_rows = counts["len"].to_list()
+
+    # Number the batches of whole images, about `batch_size` rows each
+    batch_of_image, batch, num_rows = [], 0, 0
+    for rows in image_rows:
+        if num_rows >= batch_size:
+            batch, num_rows = batch + 1, 0
+        batch_of_image.append(batch)
+        num_rows += rows
+    if not batch_of_image:
+        return
+    if key_columns:
+        # Tag every row with its batch and sort by batch (keeping the table
+        # order within a batch), so that the table is read once and streamed
+        # batch after batch. Null keys are a collection of their own, as in
+        # the counts.
+        batch_ids = counts.select(key_columns).with_columns(
+            pl.Series(_BATCH_COLUMN, batch_of_image, dtype=pl.UInt32)
+        )
+        tagged = tiles_table.join(
+            batch_ids.lazy(),
+            on=key_columns,
+            how="inner",
+            nulls_equal=True,
+            maintain_order="left",
+        ).sort(_BATCH_COLUMN, maintain_order=True)
+    else:
+        tagged = tiles_table.with_columns(
+            pl.lit(0, dtype=pl.UInt32).alias(_BATCH_COLUMN)
+        )
+    for batch_frame in _iter_batch_frames(tagged.collect_batches()):
+        tiles = _tiles_from_columns(
+            tiles_table=batch_frame.to_dict(as_series=False),
+            num_rows=batch_frame.height,
+            acquisition_details=acquisition_details,
+            collection_type=collection_type,
+            collection_constants=collection_constants,
+            filters=tile_filters,
+        )
+        if tiles:
+            yield tiles
+
+
+def _iter_batch_frames(frames: Iterable[pl.DataFrame]) -> Iterator[pl.DataFrame]:
+    """Regroup frames sorted by batch into one frame per batch."""
+    pending: list[pl.DataFrame] = []
+    for frame in frames:
+        for part in frame.partition_by(_BATCH_COLUMN, maintain_order=True):
+            if pending and part[_BATCH_COLUMN][0] != pending[0][_BATCH_COLUMN][0]:
+                yield pl.concat(pending).drop(_BATCH_COLUMN)
+                pending = []
+            pending.append(part)
+    if pending:
+        yield pl.concat(pending).drop(_BATCH_COLUMN)
+
+
+def iter_hcs_images_from_table(
+    tiles_table: pl.LazyFrame | str | Path,
+    *,
+    acquisition_details: AcquisitionDetails,
+    plate_name: str | None = None,
+    acquisition_id: int = 0,
+    predicate: pl.Expr | None = None,
+    filters: Sequence["FilterModel"] | None = None,
+    batch_size: int = 100_000,
+) -> Iterator[list[Tile]]:
+    """Stream the tiles of an HCS acquisition in batches of whole images.
+
+    Each batch holds all the tiles of one or more wells, and about
+    `batch_size` tiles (a single well larger than `batch_size` is yielded
+    on its own).
+
+    Args:
+        tiles_table: Lazy polars frame, or path to a CSV or Parquet tiles table.
+        acquisition_details: AcquisitionDetails model for the acquisition.
+        plate_name: Optional name of the plate.
+        acquisition_id: Acquisition index.
+        predicate: Optional polars expression selecting the rows to convert,
+            evaluated during the scan.
+        filters: Optional filters selecting the tiles to build.
+        batch_size: Target number of tiles per batch.
+    """
+    yield from _iter_tile_batches(
+        tiles_table=tiles_table,
+        acquisition_details=acquisition_details,
+        collection_type=ImageInPlate,
+        collection_constants={
+            "plate_name": plate_name or "Plate",
+            "acquisition": acquisition_id,
+        },
+        predicate=predicate,
+        filters=filters,
+        batch_size=batch_size,
+    )
+
+
+def iter_single_images_from_table(
+    tiles_table: pl.LazyFrame | str | Path,
+    *,
+    acquisition_details: AcquisitionDetails,
+    predicate: pl.Expr | None = None,
+    filters: Sequence["FilterModel"] | None = None,
+    batch_size: int = 100_000,
+) -> Iterator[list[Tile]]:
+    """Stream the tiles of single images in batches of whole images.
+
+    Each batch holds all the tiles of one or more images, and about
+    `batch_size` tiles (a single image larger than `batch_size` is yielded
+    on its own).
+
+    Args:
+        tiles_table: Lazy polars frame, or path to a CSV or Parquet tiles table.
+        acquisition_details: AcquisitionDetails model for the acquisition.
+        predicate: Optional polars expression selecting the rows to convert,
+            evaluated during the scan.
+        filters: Optional filters selecting the tiles to build.
+        batch_size: Target number of tiles per batch.
+    """
+    yield from _iter_tile_batches(
+        tiles_table=tiles_table,
+        acquisition_details=acquisition_details,
+        collection_type=SingleImage,
+        collection_constants={},
+        predicate=predicate,
+        filters=filters,
+        batch_size=batch_size,
+    )
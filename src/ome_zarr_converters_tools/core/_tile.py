@@ -2,9 +2,15 @@
 
 from typing import Any, Generic, TypeAlias
 
-from ngio.common._roi import Roi, RoiSlice, pixel_to_world, world_to_pixel
+import numpy as np
+from ngio.common._roi import Roi
 from pydantic import BaseModel, ConfigDict, Field
 
+from ome_zarr_converters_tools.core._coordinates import to_world
+from ome_zarr_converters_tools.core._region_table import (
+    _columns_from_tiles,
+    _regions_from_columns,
+)
 from ome_zarr_converters_tools.models._acquisition import (
     COO_SYSTEM_TYPE,
     AcquisitionDetails,
@@ -24,24 +30,12 @@ def safe_to_world(
     coo_system: COO_SYSTEM_TYPE,
     eps: float = 1e-6,
 ) -> float:
-    """Convert from world to pixel and back to world to ensure alignment."""
-    if coo_system == "world":
-        pixel_coord = world_to_pixel(start, spacing)
-        world_coord = pixel_to_world(pixel_coord, spacing)
-        if abs(world_coord - start) > eps:
-            raise ValueError(
-                f"Coordinate {start}, with spacing {spacing}, "
-                f"cannot be accurately represented in pixel coordinates."
-            )
-        return world_coord
-    world_coord = pixel_to_world(start, spacing)
-    pixel_coord = world_to_pixel(world_coord, spacing)
-    if abs(pixel_coord - start) > eps:
-        raise ValueError(
-            f"Coordinate {start}, with spacing {spacing}, "
-            f"cannot be accurately represented in world coordinates."
-        )
-    return world_coord
+    """Convert from world to pixel and back to world to ensure alignment.
+
+    Scalar version of `to_world`, which converts many coordinates at once.
+    """
+    world = to_world(np.array([start]), spacing=spacing, coo_system=coo_system, eps=eps)
+    return float(world[0])
 
 
 AttributeType: TypeAlias = (
@@ -108,58 +102,19 @@ class Tile(BaseModel, Generic[CollectionInterfaceType, ImageLoaderInterfaceType]
     model_config = ConfigDict(extra="forbid")
 
     def to_roi(self) -> Roi:
-        """Convert the Tile to a Roi."""
-        acquisition_details = self.acquisition_details
-        stage_corrections = acquisition_details.stage_corrections
-        spacing = {
-            "x": acquisition_details.pixelsize,
-            "y": acquisition_details.pixelsize,
-            "z": acquisition_details.z_spacing,
-            "t": acquisition_details.t_spacing,
-        }
-        origins = {}
-        roi_slices = {}
-        for ax in acquisition_details.axes:
-            if ax == "x" and stage_corrections.swap_xy:
-                ax = "y"
-            elif ax == "y" and stage_corrections.swap_xy:
-                ax = "x"
-
-            start_field = f"start_{ax}"
-            start = getattr(self, start_field)
-            start_coo_system = getattr(acquisition_details, f"{start_field}_coo", None)
-            if start_coo_system is not None:
-                start = safe_to_world(
-                    start=start, spacing=spacing[ax], coo_system=start_coo_system
-                )
-
-            if ax == "x" and stage_corrections.flip_x:
-                start = -start
-            if ax == "y" and stage_corrections.flip_y:
-                start = -start
-
-            length_field = f"length_{ax}"
-            length = getattr(self, length_field)
-            length_coo_system = getattr(
-                acquisition_details, f"{length_field}_coo", None
-            )
-            if length_coo_system is not None:
-                length = safe_to_world(
-                    start=length, spacing=spacing[ax], coo_system=length_coo_system
-                )
-            roi_slices[ax] = RoiSlice(start=start, length=length, axis_name=ax)
-            if ax in ["x", "y", "z"]:
-                origins[f"{ax}_micrometer_original"] = start
-
-        return Roi(
-            name=self.fov_name,
-            slices=list(roi_slices.values()),
-            space="world",
-            **origins,
-        )
+        """Convert the Tile to a Roi.
+
+        `tiled_image_from_tiles` converts all the tiles of an image at once.
+        """
+        (region,) = _regions_from_columns(_columns_from_tiles([self]))
+        return region.roi
 
     def find_data_type(self, resource: Any | None = None) -> str:
-        """Find the data type of the image data."""
+        """Find the data type of the image data.
+
+        Unless set in the acquisition details, the data type is probed by the
+        image loader (from the file header for `DefaultImageLoader`).
+        """
         if self.acquisition_details.data_type is not None:
             return self.acquisition_details.data_type
         return self.image_loader.find_data_type(resource)
@@ -0,0 +1,173 @@
+"""Process-wide LRU cache of decoded tiles.
+
+The same tile can be loaded several times during a conversion: to find the
+data type, by the writer, by multi-FOV groups sharing a loader, or by later
+passes. `TileSlice.load_data` consults the cache returned by
+`get_tile_cache`, keyed on the image loader (its class and JSON dump) and the
+resource, so that repeated loads are served from memory.
+
+The cache is disabled (a budget of 0 bytes) until configured with
+`TileCache.configure`. Each process has its own cache: workers of the
+"By Tile (Using Processes)" writer are configured with the budget of the
+parent when they start, so the budget applies to each of them.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any, NamedTuple
+
+import numpy as np
+from pydantic import BaseModel
+from pydantic_core import PydanticSerializationError
+
+
+class TileCacheStats(NamedTuple):
+    """Counters of a TileCache.
+
+    Attributes:
+        hits: Loads served from the cache.
+        misses: Loads that had to decode the tile.
+        evictions: Tiles dropped to stay within the budget.
+        num_tiles: Tiles currently cached.
+        nbytes: Bytes currently cached.
+        max_bytes: Byte budget of the cache.
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    num_tiles: int
+    nbytes: int
+    max_bytes: int
+
+
+def tile_cache_key(loader: BaseModel, resource: Any = None) -> Hashable | None:
+    """Key identifying the data loaded by `loader` from `resource`.
+
+    Returns None if the loader can't be serialized to JSON, in which case its
+    tiles are not cached.
+    """
+    try:
+        dump = loader.model_dump_json()
+    except (PydanticSerializationError, TypeError, ValueError):
+        return None
+    digest = hashlib.sha1(dump.encode(), usedforsecurity=False).hexdigest()
+    loader_type = type(loader)
+    return (loader_type.__module__, loader_type.__qualname__, digest, repr(resource))
+
+
+class TileCache:
+    """Thread-safe LRU cache of decoded tiles with a byte budget.
+
+    The cache holds read-only copies of the tiles, `get_or_load` hands out
+    writable copies of them. Memory-mapped arrays and tiles larger than the
+    whole budget are never cached.
+    """
+
+    def __init__(self, max_bytes: int = 0) -> None:
+        self._lock = threading.Lock()
+        self._tiles: OrderedDict[Hashable, np.ndarray] = OrderedDict()
+        self._max_bytes = max_bytes
+        self._nbytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def configure(self, max_bytes: int) -> None:
+        """Set the byte budget, evicting tiles if needed (0 disables caching)."""
+        if max_bytes < 0:
+            raise ValueError("max_bytes must be non-negative.")
+        with self._lock:
+            self._max_bytes = max_bytes
+            self._evict()
+
+    def clear(self) -> None:
+        """Drop all cached tiles and reset the counters."""
+        with self._lock:
+            self._tiles.clear()
+            self._nbytes = 0
+            self._hits = self._misses = self._evictions = 0
+
+    def stats(self) -> TileCacheStats:
+        """Current counters of the cache."""
+        with self._lock:
+            return TileCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                num_tiles=len(self._tiles),
+                nbytes=self._nbytes,
+                max_bytes=self._max_bytes,
+            )
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache has a non-zero budget."""
+        return self._max_bytes > 0
+
+    def get(self, key: Hashable | None) -> np.ndarray | None:
+        """Return a cached tile (marking it as recently used), None if missing.
+
+        The returned array is the read-only array shared by the cache. Lookups
+        of a None key are not counted, other lookups count as a hit or a miss.
+        """
+        if key is None:
+            return None
+        with self._lock:
+            data = self._tiles.get(key)
+            if data is None:
+                self._misses += 1
+            else:
+                self._tiles.move_to_end(key)
+                self._hits += 1
+            return data
+
+    def put(self, key: Hashable, data: np.ndarray) -> None:
+        """Cache a copy of a tile, evicting the least recently used ones if needed.
+
+        `data` itself is left untouched (and writable).
+        """
+        if isinstance(data, np.memmap) or data.nbytes > self._max_bytes:
+            return
+        data = data.copy()
+        data.setflags(write=False)
+        with self._lock:
+            previous = self._tiles.pop(key, None)
+            if previous is not None:
+                self._nbytes -= previous.nbytes
+            self._tiles[key] = data
+            self._nbytes += data.nbytes
+            self._evict()
+
+    def get_or_load(
+        self, key: Hashable | None, load: Callable[[], np.ndarray]
+    ) -> np.ndarray:
+        """Return the cached tile for `key`, or load and cache it.
+
+        The returned array is always writable, cached tiles are copied. Loads
+        bypass the cache if it is disabled or `key` is None.
+        """
+        if key is None or not self.enabled:
+            return load()
+        data = self.get(key)
+        if data is not None:
+            return data.copy()
+        data = load()
+        self.put(key, data)
+        return data
+
+    def _evict(self) -> None:
+        while self._nbytes > self._max_bytes:
+            _, data = self._tiles.popitem(last=False)
+            self._nbytes -= data.nbytes
+            self._evictions += 1
+
+
+_TILE_CACHE = TileCache()
+
+
+def get_tile_cache() -> TileCache:
+    """Return the process-wide tile cache."""
+    return _TILE_CACHE
@@ -1,15 +1,20 @@
 """Models for defining regions to be converted into OME-Zarr format."""
 
 import math
-from collections.abc import Callable
-from typing import Any, Generic, Self
+from collections.abc import Callable, Iterable
+from typing import Any, Generic, Self, TypeVar, cast
 
 import dask.array as da
 import numpy as np
 from ngio import PixelSize, Roi
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 
-from ome_zarr_converters_tools.core._dask_lazy_loader import lazy_array_from_regions
+from ome_zarr_converters_tools.core._dask_lazy_loader import (
+    ChunksType,
+    lazy_array_from_regions,
+    visible_regions_mask,
+)
+from ome_zarr_converters_tools.core._region_table import RegionTable
 from ome_zarr_converters_tools.core._roi_utils import (
     bulk_roi_union,
     move_roi_by,
@@ -17,6 +22,7 @@ from ome_zarr_converters_tools.core._roi_utils import (
     shape_from_rois,
 )
 from ome_zarr_converters_tools.core._tile import AttributeType, Tile
+from ome_zarr_converters_tools.core._tile_cache import get_tile_cache, tile_cache_key
 from ome_zarr_converters_tools.models._acquisition import (
     CANONICAL_AXES_TYPE,
     ChannelInfo,
@@ -26,8 +32,83 @@ from ome_zarr_converters_tools.models._collection import (
 )
 from ome_zarr_converters_tools.models._loader import (
     ImageLoaderInterfaceType,
+    ImageProbe,
 )
 
+T = TypeVar("T")
+
+
+class _GeometryCache:
+    """Values derived from a set of regions, memoized until they change.
+
+    The cached values are valid for one `source` object (compared by identity)
+    and one `key` (compared by equality); any change of either clears them.
+    The cache is dropped when pickled, so it never inflates worker payloads,
+    and is ignored when comparing the models holding it.
+    """
+
+    def __init__(self) -> None:
+        self._source: object = None
+        self._key: tuple[Any, ...] | None = None
+        self._values: dict[str, Any] = {}
+
+    def get(
+        self, source: object, key: tuple[Any, ...], name: str, compute: Callable[[], T]
+    ) -> T:
+        """Return the cached `name` value, computing it if missing or stale."""
+        if source is not self._source or key != self._key:
+            self._source, self._key, self._values = source, key, {}
+        if name not in self._values:
+            self._values[name] = compute()
+        return cast("T", self._values[name])
+
+    def __reduce__(self) -> tuple[type["_GeometryCache"], tuple[()]]:
+        return (_GeometryCache, ())
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _GeometryCache)
+
+    __hash__ = None  # type: ignore[assignment]
+
+
+def _write_visible_regions(
+    out: np.ndarray,
+    slices: list[tuple[tuple[slice, ...], Callable[[], np.ndarray]]],
+    regions: Iterable["TileSlice"],
+    axes: list[CANONICAL_AXES_TYPE],
+    resource: Any | None,
+) -> None:
+    """Load regions into ``out`` in order, skipping fully occluded ones.
+
+    `slices` are the slicings of `regions`, as prepared for loading. Each
+    visible region is loaded directly into its view of ``out``.
+    """
+    slicings = [slicing for slicing, _ in slices]
+    visible = visible_regions_mask(slicings, out.shape)
+    for slicing, region, is_visible in zip(slicings, regions, visible, strict=True):
+        if is_visible:
+            region.load_into(out[slicing], axes=axes, resource=resource)
+
+
+def _region_loaders(
+    regions: Iterable["TileSlice"],
+    axes: list[CANONICAL_AXES_TYPE],
+    resource: Any | None,
+) -> list[Callable[[tuple[slice, ...]], np.ndarray] | None]:
+    """Windowed loaders for the regions whose image loader supports them."""
+
+    def make_region_loader(
+        region: TileSlice,
+    ) -> Callable[[tuple[slice, ...]], np.ndarray]:
+        return lambda slices: region.load_region(slices, axes=axes, resource=resource)
+
+    return [
+        make_region_loader(region)
+        if region.image_loader.supports_region_loading(resource)
+        else None
+        for region in regions
+    ]
+
 
 class TileSlice(BaseModel, Generic[ImageLoaderInterfaceType]):
     """The smallest unit of a tiled image.
@@ -35,11 +116,13 @@ class TileSlice(BaseModel, Generic[ImageLoaderInterfaceType]):
     Usually corresponds to the minimal unit in which the source data
     can be loaded (e.g., a single tiff file from the microscope).
 
+    TileSlices are frozen: the regions of a TiledImage are modified through
+    its `RegionTable`, the TileSlices it hands out are copies.
     """
 
     roi: Roi
     image_loader: ImageLoaderInterfaceType
-    model_config = ConfigDict(extra="forbid")
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
     @classmethod
     def from_tile(cls, tile: Tile) -> Self:
@@ -53,8 +136,16 @@ class TileSlice(BaseModel, Generic[ImageLoaderInterfaceType]):
     def load_data(
         self, *, axes: list[CANONICAL_AXES_TYPE], resource: Any | None = None
     ) -> np.ndarray:
-        """Load the image data for this TileSlice using the image loader."""
-        data = self.image_loader.load_data(resource=resource)
+        """Load the image data for this TileSlice using the image loader.
+
+        The data is served from the process-wide tile cache when enabled (see
+        `get_tile_cache`), as a copy that the caller may modify.
+        """
+        cache = get_tile_cache()
+        key = tile_cache_key(self.image_loader, resource) if cache.enabled else None
+        data = cache.get_or_load(
+            key, lambda: self.image_loader.load_data(resource=resource)
+        )
         # Padding data to match the ROI shape if necessary
         n_axes = len(axes)
         data_axes = data.ndim
@@ -64,9 +155,65 @@ class TileSlice(BaseModel, Generic[ImageLoaderInterfaceType]):
             data = data.reshape((1,) * (n_axes - data_axes) + data.shape)
         return data
 
+    def load_into(
+        self,
+        out: np.ndarray,
+        *,
+        axes: list[CANONICAL_AXES_TYPE],
+        resource: Any | None = None,
+    ) -> None:
+        """Load the image data for this TileSlice into `out`, in place.
+
+        `out` has one axis per axis in `axes` (usually a view of a larger
+        image), the image loader fills it without an intermediate copy when
+        it can. If the tile cache is enabled, a copy of the loaded tile is
+        cached, as in `load_data`.
+        """
+        if out.ndim != len(axes):
+            raise ValueError("Expected one output axis per axis.")
+        cache = get_tile_cache()
+        key = tile_cache_key(self.image_loader, resource) if cache.enabled else None
+        if key is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                out[...] = cached
+                return
+        self.image_loader.load_into(out, resource=resource)
+        if key is not None:
+            cache.put(key, out)
+
+    def probe(
+        self, *, axes: list[CANONICAL_AXES_TYPE], resource: Any | None = None
+    ) -> ImageProbe:
+        """Shape (padded as in `load_data`) and data type, without loading data."""
+        shape, dtype = self.image_loader.probe(resource=resource)
+        n_axes = len(axes)
+        if len(shape) > n_axes:
+            raise ValueError("Data has more axes than expected.")
+        shape = (1,) * (n_axes - len(shape)) + tuple(shape)
+        return ImageProbe(shape=shape, dtype=dtype)
+
+    def load_region(
+        self,
+        slices: tuple[slice, ...],
+        *,
+        axes: list[CANONICAL_AXES_TYPE],
+        resource: Any | None = None,
+    ) -> np.ndarray:
+        """Load a region of this TileSlice, with one slice per axis in `axes`."""
+        if len(slices) != len(axes):
+            raise ValueError("Expected one slice per axis.")
+        return self.image_loader.load_region(slices, resource=resource)
+
 
 class TileFOVGroup(BaseModel, Generic[ImageLoaderInterfaceType]):
-    """Group of TileSlices belonging to the same acquisition FOV."""
+    """Group of TileSlices belonging to the same acquisition FOV.
+
+    The shape, ROI and reference slice (as an index into `regions`) are
+    computed once and cached until the ROIs of `regions` change. The cache is
+    keyed on the geometry of the ROIs only, so the groups handed out by
+    `TiledImage.group_by_fov` for the same FOV share it.
+    """
 
     fov_name: str
     regions: list[TileSlice[ImageLoaderInterfaceType]] = Field(default_factory=list)
@@ -75,34 +222,55 @@ class TileFOVGroup(BaseModel, Generic[ImageLoaderInterfaceType]):
 
     model_config = ConfigDict(extra="forbid")
 
+    _cache: _GeometryCache = PrivateAttr(default_factory=_GeometryCache)
+
+    def _cached(self, name: str, compute: Callable[[], T]) -> T:
+        geometry = tuple(
+            (
+                region.roi.space,
+                tuple((s.axis_name, s.start, s.length) for s in region.roi.slices),
+            )
+            for region in self.regions
+        )
+        key = (geometry, tuple(self.axes), self.pixel_size)
+        return self._cache.get(None, key, name, compute)
+
     def shape(self) -> tuple[int, ...]:
         """Get the shape of the FOV group by computing the union of all regions."""
-        return shape_from_rois(
-            [region.roi for region in self.regions],
-            self.axes,
-            self.pixel_size,
+        return self._cached(
+            "shape",
+            lambda: shape_from_rois(
+                [region.roi for region in self.regions],
+                self.axes,
+                self.pixel_size,
+            ),
         )
 
     def roi(self) -> Roi:
         """Get the global ROI covering all TileSlices in the FOV group."""
-        union_roi = bulk_roi_union([region.roi for region in self.regions])
+        union_roi = self._cached(
+            "roi", lambda: bulk_roi_union([region.roi for region in self.regions])
+        ).model_copy(deep=True)
         union_roi.name = self.fov_name
         return union_roi
 
     def ref_slice(self) -> TileSlice[ImageLoaderInterfaceType]:
         """Get a reference TileSlice for this FOV group."""
+        return self.regions[self._cached("ref_index", self._find_ref_index)]
+
+    def _find_ref_index(self) -> int:
         point = {}
         for axis in self.axes:
             point[axis] = 0.0
 
-        ref_region = self.regions[0]
-        ref_distance = roi_to_point_distance(ref_region.roi, point)
-        for region in self.regions[1:]:
+        ref_index = 0
+        ref_distance = roi_to_point_distance(self.regions[0].roi, point)
+        for index, region in enumerate(self.regions[1:], start=1):
             distance = roi_to_point_distance(region.roi, point)
             if distance < ref_distance:
-                ref_region = region
+                ref_index = index
                 ref_distance = distance
-        return ref_region
+        return ref_index
 
     def _prepare_slice_loading(
         self, resource: Any | None = None
@@ -110,12 +278,13 @@ class TileFOVGroup(BaseModel, Generic[ImageLoaderInterfaceType]):
         """Prepare the TileSlices and their corresponding slicing tuples for loading."""
         slices = []
         group_roi = self.roi()
+        ref_roi = self.ref_slice().roi
         # Find the offset between the group ROI and the origin ROI
         offset = {}
         for axis in self.axes:
             group_slice = group_roi.get(axis)
             assert group_slice is not None
-            ref_slice_axis = self.ref_slice().roi.get(axis)
+            ref_slice_axis = ref_roi.get(axis)
             assert ref_slice_axis is not None
             start = ref_slice_axis.start
             assert start is not None
@@ -139,27 +308,28 @@ class TileFOVGroup(BaseModel, Generic[ImageLoaderInterfaceType]):
     def load_data(self, resource: Any | None = None) -> np.ndarray:
         """Load the full image data for this FOV group using."""
         shape = self.shape()
-        ref_slice = self.ref_slice()
-        ref_data = ref_slice.load_data(axes=self.axes, resource=resource)
-        full_image = np.zeros(shape, dtype=ref_data.dtype)
+        ref_probe = self.ref_slice().probe(axes=self.axes, resource=resource)
+        full_image = np.zeros(shape, dtype=ref_probe.dtype)
         slices = self._prepare_slice_loading(resource=resource)
-        for slicing, loader in slices:
-            full_image[slicing] = loader()
+        _write_visible_regions(full_image, slices, self.regions, self.axes, resource)
         return full_image
 
     def load_data_dask(
-        self, resource: Any | None = None, chunks: tuple[int, ...] | None = None
+        self, resource: Any | None = None, chunks: ChunksType | None = None
     ) -> da.Array:
         """Load the full image data for this FOV group using Dask."""
         shape = self.shape()
-        ref_slice = self.ref_slice()
-        ref_data = ref_slice.load_data(axes=self.axes, resource=resource)
-        dtype = str(ref_data.dtype)
+        ref_probe = self.ref_slice().probe(axes=self.axes, resource=resource)
         slices = self._prepare_slice_loading(resource=resource)
         if chunks is None:
-            chunks = ref_data.shape
+            chunks = ref_probe.shape
         return lazy_array_from_regions(
-            slices, shape=shape, chunks=chunks, dtype=dtype, fill_value=0.0
+            slices,
+            shape=shape,
+            chunks=chunks,
+            dtype=ref_probe.dtype,
+            fill_value=0.0,
+            region_loaders=_region_loaders(self.regions, self.axes, resource),
         )
 
 
@@ -168,9 +338,16 @@ class TiledImage(BaseModel, Generic[CollectionInterfaceType, ImageLoaderInterfac
 
     Can contain multiple TileFOVGroups, each containing multiple TileSlices
     or it can directly contain a single TileFOVGroup.
+
+    The regions are stored in a columnar `RegionTable`, which validates from
+    and serializes to a list of TileSlices and can be used as one.
+
+    The FOV grouping (the rows of each FOV), shape and ROI are cached until
+    the regions are modified (see `RegionTable.version`) or the axes or pixel
+    sizes change.
     """
 
-    regions: list[TileSlice[ImageLoaderInterfaceType]] = Field(default_factory=list)
+    regions: RegionTable[ImageLoaderInterfaceType] = Field(default_factory=RegionTable)
     path: str
     name: str | None = None
     pixelsize: float = 1.0
@@ -184,26 +361,67 @@ class TiledImage(BaseModel, Generic[CollectionInterfaceType, ImageLoaderInterfac
 
     model_config = ConfigDict(extra="forbid")
 
+    _cache: _GeometryCache = PrivateAttr(default_factory=_GeometryCache)
+
+    def _cached(self, name: str, compute: Callable[[], T]) -> T:
+        table = self.region_table
+        key = (
+            table.version,
+            tuple(self.axes),
+            self.pixelsize,
+            self.z_spacing,
+            self.t_spacing,
+        )
+        return self._cache.get(table, key, name, compute)
+
     def group_by_fov(self) -> list[TileFOVGroup[ImageLoaderInterfaceType]]:
-        """Group TileSlices by field of view name."""
-        fov_dict: dict[str, list[TileSlice]] = {}
-        for region in self.regions:
-            fov_name = region.roi.name
-            if fov_name is None:
-                raise ValueError("TileSlice ROI must have a name to group by FOV.")
-            if fov_name not in fov_dict:
-                fov_dict[fov_name] = []
-            fov_dict[fov_name].append(region)
-        return [
-            TileFOVGroup(
+        """Group TileSlices by field of view name.
+
+        The groups and their TileSlices are new on every call, so they can
+        be modified without affecting the TiledImage or later calls. The
+        grouping is cached until the regions change, and the groups of a FOV
+        share the cache of their geometry (see `TileFOVGroup`).
+        """
+        regions = list(self.regions)
+        fov_caches: dict[str, _GeometryCache] = self._cached("fov_caches", dict)
+        groups = []
+        for fov_name, rows in self._cached("fov_rows", self._fov_rows):
+            group = TileFOVGroup(
                 fov_name=fov_name,
-                regions=regions,
+                regions=[regions[row] for row in rows],
                 axes=self.axes,
                 pixel_size=self.pixel_size,
             )
-            for fov_name, regions in fov_dict.items()
+            group._cache = fov_caches.setdefault(fov_name, group._cache)
+            groups.append(group)
+        return groups
+
+    def _fov_rows(self) -> list[tuple[str, list[int]]]:
+        """Rows of the regions of each FOV, in order of first appearance."""
+        table = self.region_table
+        order = table.fov_order()
+        if len(order) == 0:
+            return []
+        codes = table.columns.fov_codes[order]
+        splits = np.flatnonzero(np.diff(codes)) + 1
+        fov_names = table.columns.fov_names
+        return [
+            (fov_names[code], rows.tolist())
+            for code, rows in zip(
+                codes[np.r_[0, splits]].tolist(), np.split(order, splits), strict=True
+            )
         ]
 
+    @property
+    def region_table(self) -> RegionTable[ImageLoaderInterfaceType]:
+        """The columnar store of the regions.
+
+        A list of TileSlices assigned to `regions` is converted on access.
+        """
+        if not isinstance(self.regions, RegionTable):
+            self.regions = RegionTable(self.regions)
+        return self.regions
+
     @property
     def pixel_size(self) -> PixelSize:
         """Return the PixelSize of the TiledImage."""
@@ -214,37 +432,48 @@ class TiledImage(BaseModel, Generic[CollectionInterfaceType, ImageLoaderInterfac
             t=self.t_spacing,
         )
 
-    def add_tile(self, tile: Tile) -> None:
-        """Add a Tile to the TiledImage as a TileRegion."""
-        if self.channels != tile.acquisition_details.channels:
+    def check_tile(self, tile: Tile) -> None:
+        """Raise a ValueError if the Tile can't be added to the TiledImage."""
+        acquisition_details = tile.acquisition_details
+        if self.channels != acquisition_details.channels:
             raise ValueError("Tile channels do not match TiledImage channels.")
-        if self.axes != tile.acquisition_details.axes:
+        if self.axes != acquisition_details.axes:
             raise ValueError("Tile axes do not match TiledImage axes.")
-        if self.pixelsize != tile.acquisition_details.pixelsize:
+        if self.pixelsize != acquisition_details.pixelsize:
             raise ValueError("Tile pixelsize does not match TiledImage pixelsize.")
-        if self.z_spacing != tile.acquisition_details.z_spacing:
+        if self.z_spacing != acquisition_details.z_spacing:
             raise ValueError("Tile z_spacing does not match TiledImage z_spacing.")
-        if self.t_spacing != tile.acquisition_details.t_spacing:
+        if self.t_spacing != acquisition_details.t_spacing:
             raise ValueError("Tile t_spacing does not match TiledImage t_spacing.")
+
+    def add_tile(self, tile: Tile) -> None:
+        """Add a Tile to the TiledImage as a TileRegion."""
+        self.check_tile(tile)
         tile_region = TileSlice.from_tile(tile)
         self.regions.append(tile_region)
 
+    def _bounding_rois(self) -> list[Roi]:
+        """The ROIs of the regions spanning the union of all regions."""
+        table = self.region_table
+        return [region.roi for region in table.select(table.bounding_rows())]
+
     def shape(self) -> tuple[int, ...]:
         """Get the shape of the TiledImage by computing the union of all regions."""
-        return shape_from_rois(
-            [region.roi for region in self.regions],
-            self.axes,
-            self.pixel_size,
+        return self._cached(
+            "shape",
+            lambda: shape_from_rois(self._bounding_rois(), self.axes, self.pixel_size),
         )
 
     def roi(self) -> Roi:
         """Get the global ROI covering all TileSlices in the TiledImage."""
-        union_roi = bulk_roi_union([region.roi for region in self.regions])
+        union_roi = self._cached(
+            "roi", lambda: bulk_roi_union(self._bounding_rois())
+        ).model_copy(deep=True)
         union_roi.name = self.name or self.path
         return union_roi
 
     def _prepare_slice_loading(
-        self, resource: Any | None = None
+        self, regions: Iterable[TileSlice], resource: Any | None = None
     ) -> list[tuple[tuple[slice, ...], Callable[[], np.ndarray]]]:
         """Prepare the TileSlices and their corresponding slicing tuples for loading."""
 
@@ -254,7 +483,7 @@ class TiledImage(BaseModel, Generic[CollectionInterfaceType, ImageLoaderInterfac
             return lambda: region.load_data(axes=self.axes, resource=resource)
 
         slices = []
-        for region in self.regions:
+        for region in regions:
             roi_slice = region.roi.to_slicing_dict(pixel_size=self.pixel_size)
             slicing = []
             for axis in self.axes:
@@ -269,20 +498,26 @@ class TiledImage(BaseModel, Generic[CollectionInterfaceType, ImageLoaderInterfac
         shape = self.shape()
         dtype = np.dtype(self.data_type)
         full_image = np.zeros(shape, dtype=dtype)
-        slices = self._prepare_slice_loading(resource=resource)
-        for slicing, loader in slices:
-            full_image[slicing] = loader()
+        regions = list(self.regions)
+        slices = self._prepare_slice_loading(regions, resource=resource)
+        _write_visible_regions(full_image, slices, regions, self.axes, resource)
         return full_image
 
     def load_data_dask(
-        self, resource: Any | None = None, chunks: tuple[int, ...] | None = None
+        self, resource: Any | None = None, chunks: ChunksType | None = None
     ) -> da.Array:
         """Load the full image data for this TiledImage using Dask."""
         shape = self.shape()
         dtype = self.data_type
-        slices = self._prepare_slice_loading(resource=resource)
+        regions = list(self.regions)
+        slices = self._prepare_slice_loading(regions, resource=resource)
         if chunks is None:
             chunks = shape
         return lazy_array_from_regions(
-            slices, shape=shape, chunks=chunks, dtype=dtype, fill_value=0.0
+            slices,
+            shape=shape,
+            chunks=chunks,
+            dtype=dtype,
+            fill_value=0.0,
+            region_loaders=_region_loaders(regions, self.axes, resource),
         )
@@ -2,6 +2,10 @@
 
 from typing import Any
 
+from ome_zarr_converters_tools.core._region_table import (
+    RegionTable,
+    _columns_from_tiles,
+)
 from ome_zarr_converters_tools.core._tile import Tile
 from ome_zarr_converters_tools.core._tile_region import TiledImage
 from ome_zarr_converters_tools.models import ConverterOptions, TilingMode
@@ -25,7 +29,10 @@ def tiled_image_from_tiles(
 
     """
     split_tiles = converter_options.tiling_mode == TilingMode.NO_TILING
-    tiled_images = {}
+    tiled_images: dict[str, TiledImage] = {}
+    image_tiles: dict[str, list[Tile]] = {}
+    # Acquisition details already checked against each image
+    checked: dict[str, set[int]] = {}
 
     if len(tiles) == 0:
         raise ValueError("No tiles provided to build TiledImage.")
@@ -48,6 +55,15 @@ def tiled_image_from_tiles(
                 collection=tile.collection,
                 attributes=tile.attributes,
             )
-        tiled_images[path].add_tile(tile)
+            image_tiles[path] = []
+            checked[path] = set()
+        if id(tile.acquisition_details) not in checked[path]:
+            tiled_images[path].check_tile(tile)
+            checked[path].add(id(tile.acquisition_details))
+        image_tiles[path].append(tile)
 
+    # The regions of each image are built at once, without TileSlice models
+    for path, tiled_image in tiled_images.items():
+        columns = _columns_from_tiles(image_tiles[path])
+        tiled_image.regions = RegionTable.from_columns(columns)
     return list(tiled_images.values())
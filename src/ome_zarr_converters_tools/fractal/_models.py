@@ -166,6 +166,11 @@ def converters_tools_models(
             "models/_converter_options.py",
             "TempJsonOptions",
         ),
+        (
+            base,
+            "models/_converter_options.py",
+            "WriterOptions",
+        ),
         (
             base,
             "models/_converter_options.py",
@@ -176,6 +181,31 @@ def converters_tools_models(
             "models/_converter_options.py",
             "FixedSizeChunking",
         ),
+        (
+            base,
+            "models/_converter_options.py",
+            "ByteTargetChunking",
+        ),
+        (
+            base,
+            "models/_converter_options.py",
+            "NoSharding",
+        ),
+        (
+            base,
+            "models/_converter_options.py",
+            "ChunkBasedSharding",
+        ),
+        (
+            base,
+            "models/_converter_options.py",
+            "FovBasedSharding",
+        ),
+        (
+            base,
+            "models/_converter_options.py",
+            "CompressionOptions",
+        ),
         (
             base,
             "models/_acquisition.py",
@@ -16,20 +16,30 @@ from ome_zarr_converters_tools.models._collection import (
 from ome_zarr_converters_tools.models._converter_options import (
     AlignmentCorrections,
     BackendType,
+    ByteTargetChunking,
+    ChunkBasedSharding,
     ChunkingStrategy,
+    CompressionOptions,
+    CompressorType,
     ConverterOptions,
     DefaultNgffVersion,
     FixedSizeChunking,
     FovBasedChunking,
+    FovBasedSharding,
     NgffVersions,
+    NoSharding,
     OmeZarrOptions,
     OverwriteMode,
+    ShardingStrategy,
+    ShuffleType,
     TilingMode,
     WriterMode,
+    WriterOptions,
 )
 from ome_zarr_converters_tools.models._loader import (
     DefaultImageLoader,
     ImageLoaderInterfaceType,
+    ImageProbe,
 )
 from ome_zarr_converters_tools.models._url_utils import (
     find_url_type,
@@ -41,25 +51,35 @@ __all__ = [
     "AcquisitionDetails",
     "AlignmentCorrections",
     "BackendType",
+    "ByteTargetChunking",
     "ChannelInfo",
+    "ChunkBasedSharding",
     "ChunkingStrategy",
     "CollectionInterface",
     "CollectionInterfaceType",
+    "CompressionOptions",
+    "CompressorType",
     "ConverterOptions",
     "DataTypeEnum",
     "DefaultImageLoader",
     "DefaultNgffVersion",
     "FixedSizeChunking",
     "FovBasedChunking",
+    "FovBasedSharding",
     "ImageInPlate",
     "ImageLoaderInterfaceType",
+    "ImageProbe",
     "NgffVersions",
+    "NoSharding",
     "OmeZarrOptions",
     "OverwriteMode",
+    "ShardingStrategy",
+    "ShuffleType",
     "SingleImage",
     "StageCorrections",
     "TilingMode",
     "WriterMode",
+    "WriterOptions",
     "default_axes_builder",
     "find_url_type",
     "join_url_paths",
@@ -1,3 +1,4 @@
+import math
 from enum import StrEnum
 from typing import Annotated, Literal
 
@@ -6,6 +7,7 @@ from pydantic import (
     BaseModel,
     ConfigDict,
     Field,
+    model_validator,
 )
 
 
@@ -41,16 +43,34 @@ class Scalings(StrEnum):
         return float(self.value)
 
 
+class CompressorType(StrEnum):
+    DEFAULT = "Default"
+    BLOSC_ZSTD = "Blosc (zstd)"
+    BLOSC_LZ4 = "Blosc (lz4)"
+    ZSTD = "Zstd"
+    NONE = "None"
+
+
+class ShuffleType(StrEnum):
+    NO_SHUFFLE = "No Shuffle"
+    SHUFFLE = "Byte Shuffle"
+    BIT_SHUFFLE = "Bit Shuffle"
+
+
 class WriterMode(StrEnum):
     BY_TILE = "By Tile"
     BY_FOV = "By FOV"
     BY_FOV_DASK = "By FOV (Using Dask)"
     BY_TILE_DASK = "By Tile (Using Dask)"
+    BY_TILE_THREADS = "By Tile (Using Threads)"
+    BY_TILE_PROCESSES = "By Tile (Using Processes)"
+    BY_CHUNK = "By Chunk"
     IN_MEMORY = "In Memory"
 
 
 class AlignmentCorrections(BaseModel):
     """Alignment correction for stage positions."""
+
     align_xy: bool = Field(default=False, title="Align XY")
     """
     Whether to align the positions in the XY plane by FOV.
@@ -104,6 +124,20 @@ class FovBasedChunking(BaseModel):
         chunk_size = int(fov_xy_shape * scaling_factor)
         return max(1, chunk_size)
 
+    def get_chunks(
+        self,
+        axes: list[str],
+        fov_shape: tuple[int, ...],
+        shape: tuple[int, ...],
+        itemsize: int,
+    ) -> tuple[int, ...]:
+        """Chunk size for an image with FOVs of `fov_shape`."""
+        chunks = {"z": self.z_chunk, "c": self.c_chunk, "t": self.t_chunk}
+        return tuple(
+            self.get_xy_chunk(size) if ax in ("x", "y") else chunks.get(ax, 1)
+            for ax, size in zip(axes, fov_shape, strict=True)
+        )
+
 
 class FixedSizeChunking(BaseModel):
     """Chunking strategy with fixed chunk sizes."""
@@ -132,18 +166,234 @@ class FixedSizeChunking(BaseModel):
     def get_xy_chunk(self, fov_shape: int) -> int:
         return self.xy_chunk
 
+    def get_chunks(
+        self,
+        axes: list[str],
+        fov_shape: tuple[int, ...],
+        shape: tuple[int, ...],
+        itemsize: int,
+    ) -> tuple[int, ...]:
+        """Chunk size for an image with FOVs of `fov_shape`."""
+        chunks = {"z": self.z_chunk, "c": self.c_chunk, "t": self.t_chunk}
+        return tuple(
+            self.get_xy_chunk(size) if ax in ("x", "y") else chunks.get(ax, 1)
+            for ax, size in zip(axes, fov_shape, strict=True)
+        )
+
+
+def _split_edge(size: int, target: float) -> int:
+    """Part of a FOV edge of `size` pixels, at most about `target` pixels.
+
+    The edge is split in the fewest equal parts (a divisor of `size`) of at
+    most `target` pixels. If those parts would be smaller than half of
+    `target` (e.g. for a prime `size`), the edge is split by ceil-division
+    instead, and the parts are no longer aligned to the FOV.
+    """
+    if size <= target:
+        return size
+    min_parts = math.ceil(size / target)
+    for parts in range(min_parts, math.floor(2 * size / target) + 1):
+        if size % parts == 0:
+            return size // parts
+    return math.ceil(size / min_parts)
+
+
+class ByteTargetChunking(BaseModel):
+    """Chunking strategy targeting a size in bytes per chunk."""
+
+    mode: Literal["Target Size"] = "Target Size"
+    """
+    Chunking based on a target chunk size in bytes.
+    """
+    target_mb: float = Field(default=16, gt=0, title="Target Chunk Size (MB)")
+    """
+    Target size of a chunk in MB (uncompressed). Chunks are grown along Z,
+    then XY (by whole FOVs), then C and T up to this size, or split in XY
+    if a single FOV plane is larger.
+    """
+
+    def get_chunks(
+        self,
+        axes: list[str],
+        fov_shape: tuple[int, ...],
+        shape: tuple[int, ...],
+        itemsize: int,
+    ) -> tuple[int, ...]:
+        """Chunk size for an image with FOVs of `fov_shape`.
+
+        Chunks stay aligned to the FOVs: in XY they are either a whole number
+        of FOVs or a FOV split in equal parts close to the budget. FOV edges
+        that can't be split so (e.g. a prime number of pixels) are split in
+        near-equal parts, not aligned to the FOV (see `_split_edge`).
+        """
+        budget = self.target_mb * 1e6 / itemsize
+        chunks = dict.fromkeys(axes, 1)
+        sizes = dict(zip(axes, fov_shape, strict=True))
+        extents = dict(zip(axes, shape, strict=True))
+        xy_axes = [ax for ax in ("y", "x") if ax in sizes]
+        for ax in xy_axes:
+            chunks[ax] = sizes[ax]
+
+        def num_elements() -> int:
+            return math.prod(chunks.values())
+
+        # Split FOV planes larger than the budget, in parts that divide them.
+        # The budget is shared evenly between the XY edges, an edge shorter
+        # than its share leaves the rest to the other one.
+        remaining = budget
+        for i, ax in enumerate(sorted(xy_axes, key=sizes.__getitem__)):
+            target = remaining ** (1 / (len(xy_axes) - i))
+            chunks[ax] = _split_edge(sizes[ax], target)
+            remaining /= min(sizes[ax], target)
+        # Grow along Z (within the FOV), then XY by whole FOVs, then C and T.
+        if "z" in sizes:
+            chunks["z"] = max(1, min(sizes["z"], int(budget // num_elements())))
+        if (
+            chunks.get("z", 1) == sizes.get("z", 1)
+            and xy_axes
+            and all(chunks[ax] == sizes[ax] for ax in xy_axes)
+        ):
+            num_fovs = math.isqrt(max(1, int(budget // num_elements())))
+            for ax in xy_axes:
+                max_fovs = max(1, extents[ax] // sizes[ax])
+                chunks[ax] = sizes[ax] * min(num_fovs, max_fovs)
+        for other in ("c", "t"):
+            if other in sizes:
+                growth = max(1, int(budget // num_elements()))
+                chunks[other] = min(extents[other], growth)
+        return tuple(chunks[ax] for ax in axes)
+
 
 ChunkingStrategy = Annotated[
-    FovBasedChunking | FixedSizeChunking, Field(discriminator="mode")
+    FovBasedChunking | FixedSizeChunking | ByteTargetChunking,
+    Field(discriminator="mode"),
 ]
 
 
+class NoSharding(BaseModel):
+    """No sharding, every chunk is stored in its own file."""
+
+    mode: Literal["No Sharding"] = "No Sharding"
+    """
+    No sharding.
+    """
+    model_config = ConfigDict(extra="forbid")
+
+
+class ChunkBasedSharding(BaseModel):
+    """Sharding strategy grouping a fixed number of chunks per shard.
+
+    Requires OME-NGFF 0.5 (Zarr v3).
+    """
+
+    mode: Literal["Chunks"] = "Chunks"
+    """
+    Shard size given in number of chunks.
+    """
+    xy_chunks: int = Field(default=4, ge=1, title="Chunks per Shard in XY")
+    """
+    Number of chunks per shard along X and Y.
+    """
+    z_chunks: int = Field(default=1, ge=1, title="Chunks per Shard in Z")
+    """
+    Number of chunks per shard along Z.
+    """
+    c_chunks: int = Field(default=1, ge=1, title="Chunks per Shard in C")
+    """
+    Number of chunks per shard along C.
+    """
+    t_chunks: int = Field(default=1, ge=1, title="Chunks per Shard in T")
+    """
+    Number of chunks per shard along T.
+    """
+    model_config = ConfigDict(extra="forbid")
+
+    def get_xy_shard(self, fov_xy_shape: int, xy_chunk: int) -> int:
+        return xy_chunk * self.xy_chunks
+
+
+class FovBasedSharding(BaseModel):
+    """Sharding strategy grouping a fixed number of FOVs per shard.
+
+    Requires OME-NGFF 0.5 (Zarr v3).
+    """
+
+    mode: Literal["Same as FOVs"] = "Same as FOVs"
+    """
+    Shard size given in number of FOVs.
+    """
+    xy_fovs: int = Field(default=4, ge=1, title="FOVs per Shard in XY")
+    """
+    Number of FOVs per shard along X and Y. The shard size is rounded up to
+    a whole number of chunks.
+    """
+    z_chunks: int = Field(default=1, ge=1, title="Chunks per Shard in Z")
+    """
+    Number of chunks per shard along Z.
+    """
+    c_chunks: int = Field(default=1, ge=1, title="Chunks per Shard in C")
+    """
+    Number of chunks per shard along C.
+    """
+    t_chunks: int = Field(default=1, ge=1, title="Chunks per Shard in T")
+    """
+    Number of chunks per shard along T.
+    """
+    model_config = ConfigDict(extra="forbid")
+
+    def get_xy_shard(self, fov_xy_shape: int, xy_chunk: int) -> int:
+        return -(-fov_xy_shape * self.xy_fovs // xy_chunk) * xy_chunk
+
+
+ShardingStrategy = Annotated[
+    NoSharding | ChunkBasedSharding | FovBasedSharding, Field(discriminator="mode")
+]
+
+
+class CompressionOptions(BaseModel):
+    """Compression of the OME-Zarr arrays.
+
+    Attributes:
+        compressor: Compressor to use, "Default" leaves the choice to ngio.
+        level: Compression level.
+        shuffle: Shuffle filter applied before Blosc compression.
+    """
+
+    compressor: CompressorType = Field(
+        default=CompressorType.DEFAULT, title="Compressor"
+    )
+    """
+    Compressor to use. "Default" uses the ngio/zarr default compressor.
+    """
+    level: int = Field(default=5, ge=0, le=22, title="Compression Level")
+    """
+    Compression level: 0-9 for Blosc, 0-22 for Zstd. Ignored for "Default"
+    and "None".
+    """
+    shuffle: ShuffleType = Field(default=ShuffleType.SHUFFLE, title="Shuffle")
+    """
+    Shuffle filter, only used by the Blosc compressors.
+    """
+    model_config = ConfigDict(extra="forbid")
+
+    @model_validator(mode="after")
+    def _check_blosc_level(self) -> "CompressionOptions":
+        blosc = (CompressorType.BLOSC_ZSTD, CompressorType.BLOSC_LZ4)
+        if self.compressor in blosc and self.level > 9:
+            raise ValueError(
+                f"Blosc compression level must be between 0 and 9, got {self.level}."
+            )
+        return self
+
+
 class OmeZarrOptions(BaseModel):
     """Options specific to OME-Zarr writing.
 
     Attributes:
         num_levels: Number of resolution levels to create.
         chunks: Chunking strategy to use.
+        sharding: Sharding strategy to use (OME-NGFF 0.5 only).
+        compression: Compression of the arrays.
         ngff_version: Version of the OME-NGFF specification to target.
         table_backend: Backend type for storing tables.
     """
@@ -152,12 +402,80 @@ class OmeZarrOptions(BaseModel):
     chunks: ChunkingStrategy = Field(
         default_factory=FovBasedChunking, title="Chunking Strategy"
     )
+    sharding: ShardingStrategy = Field(
+        default_factory=NoSharding, title="Sharding Strategy"
+    )
+    compression: CompressionOptions = Field(
+        default_factory=CompressionOptions, title="Compression"
+    )
     ngff_version: NgffVersions = DefaultNgffVersion
     table_backend: BackendType = Field(
         default=BackendType.ANNDATA, title="Table Backend"
     )
     model_config = ConfigDict(extra="forbid")
 
+    @model_validator(mode="after")
+    def _check_sharding_version(self) -> "OmeZarrOptions":
+        if not isinstance(self.sharding, NoSharding) and self.ngff_version == "0.4":
+            raise ValueError(
+                "Sharding requires OME-NGFF 0.5 (Zarr v3), "
+                f"got ngff_version={self.ngff_version!r}."
+            )
+        return self
+
+
+class WriterOptions(BaseModel):
+    """Options for the parallel writer modes.
+
+    Attributes:
+        num_workers: Number of workers (threads or processes) loading tiles.
+        num_writers: Number of threads writing decoded tiles to the OME-Zarr.
+        max_buffer_mb: Maximum size of the tiles loaded but not yet written.
+        fused_pyramid: Write all pyramid levels during the write pass.
+        prefetch: Number of tiles or FOVs loaded ahead by the sequential
+            writer modes.
+        histogram_windows: Compute the channel windows from the written data.
+    """
+
+    num_workers: int = Field(default=4, ge=1, title="Number of Workers")
+    """
+    Number of workers loading (decoding) tiles in parallel: threads for
+    "By Tile (Using Threads)", processes for "By Tile (Using Processes)".
+    """
+    num_writers: int = Field(default=2, ge=1, title="Number of Writer Threads")
+    """
+    Number of threads writing decoded tiles to the OME-Zarr.
+    """
+    max_buffer_mb: int = Field(default=1024, ge=1, title="Max Buffer Size (MB)")
+    """
+    Upper bound on the memory held by tiles that are loaded but not yet
+    written. Workers wait for buffer space before loading the next tile.
+    """
+    fused_pyramid: bool = Field(default=False, title="Fused Pyramid Generation")
+    """
+    Downsample each written block in memory and write it to all the pyramid
+    levels, instead of building the coarser levels from level 0 on disk
+    afterwards. Blocks not aligned to the downsampling factor are rebuilt
+    from disk. Not supported by "By Tile (Using Processes)".
+    """
+    prefetch: int = Field(default=0, ge=0, title="Prefetch Depth")
+    """
+    Number of tiles ("By Tile") or FOVs ("By FOV") loaded on a background
+    thread while the current one is written. The data loaded ahead is also
+    bounded by the max buffer size. 0 disables prefetching.
+    """
+    histogram_windows: bool = Field(
+        default=False, title="Channel Windows from Written Data"
+    )
+    """
+    Compute the channel display windows from a histogram of the full
+    resolution data accumulated while it is written (uint8 and uint16 only),
+    instead of reading the lowest resolution level back with ngio. Pixels
+    covered by several overlapping tiles are counted once per write, so the
+    windows can differ slightly from ngio's and between writer modes.
+    """
+    model_config = ConfigDict(extra="forbid")
+
 
 class TempJsonOptions(BaseModel):
     """Options for temporary JSON storage during conversion.
@@ -199,8 +517,20 @@ class ConverterOptions(BaseModel):
         - By FOV (Using Dask): Write fields of view in parallel using Dask.
         This is usually faster than writing by FOV sequentially,
         but may consume more memory.
+        - By Tile (Using Threads): Load tiles on a thread pool and write them
+        from writer threads, with memory bounded by the writer options.
+        - By Tile (Using Processes): Load and write tiles from worker
+        processes. Useful for image loaders that hold the GIL while decoding.
+        - By Chunk: Assemble each output chunk in memory from the tiles
+        touching it and write it exactly once. Avoids rewriting chunks shared
+        by several tiles, which is costly on network file systems.
         - In Memory: Load all data into memory before writing."""
 
+    writer_options: WriterOptions = Field(
+        default_factory=WriterOptions, title="Writer Options"
+    )
+    """Options for the parallel writer modes."""
+
     alignment_correction: AlignmentCorrections = Field(
         default_factory=AlignmentCorrections,
         title="Alignment Corrections",
@@ -1,16 +1,25 @@
 """Models for defining regions to be converted into OME-Zarr format."""
 
 from abc import ABC, abstractmethod
-from typing import Any, TypeVar
+from functools import lru_cache
+from typing import Any, NamedTuple, TypeVar, cast
 
 import numpy as np
 import tifffile
+import zarr
 from PIL import Image
 from pydantic import BaseModel, ConfigDict
 
 from ome_zarr_converters_tools.models._url_utils import join_url_paths
 
 
+class ImageProbe(NamedTuple):
+    """Shape and data type of an image, as returned by `load_data`."""
+
+    shape: tuple[int, ...]
+    dtype: str
+
+
 class ImageLoaderInterface(BaseModel, ABC):
     model_config = ConfigDict(extra="ignore")
 
@@ -19,9 +28,86 @@ class ImageLoaderInterface(BaseModel, ABC):
         """Load the image data as a NumPy array."""
         pass
 
+    def probe(self, resource: Any = None) -> ImageProbe:
+        """Find the shape and data type of the image data.
+
+        Loaders able to read them from the file headers should override this,
+        the default implementation loads the full image.
+        """
+        data = self.load_data(resource)
+        return ImageProbe(shape=tuple(data.shape), dtype=str(data.dtype))
+
     def find_data_type(self, resource: Any = None) -> str:
         """Find the data type of the image data."""
-        return str(self.load_data(resource).dtype)
+        return self.probe(resource).dtype
+
+    def load_into(self, out: np.ndarray, resource: Any = None) -> None:
+        """Load the image data into `out`, in place.
+
+        Args:
+            out: Destination array (possibly a non-contiguous view), of the
+                image shape with optional leading singleton axes.
+            resource: Optional resource, as in `load_data`.
+
+        Loaders able to decode directly into the destination should override
+        this, the default implementation loads the image and copies it.
+        """
+        out[...] = self.load_data(resource)
+
+    def supports_region_loading(self, resource: Any = None) -> bool:
+        """Whether `load_region` reads a region without decoding the full image.
+
+        Loaders returning True are read one output chunk at a time when
+        building lazy arrays, so peak memory scales with the chunk instead of
+        the image.
+        """
+        return False
+
+    def load_region(
+        self, slices: tuple[slice, ...], resource: Any = None
+    ) -> np.ndarray:
+        """Load a rectangular region of the image data as a NumPy array.
+
+        Args:
+            slices: One slice per axis. If there are more slices than image
+                dimensions, the image is treated as having leading singleton
+                axes (as when a 2D tile is padded to the image axes).
+            resource: Optional resource, as in `load_data`.
+
+        The default implementation loads the full image and slices it.
+        """
+        return read_region(self.load_data(resource), slices)
+
+
+def read_region(data: Any, slices: tuple[slice, ...]) -> np.ndarray:
+    """Read `slices` from an array-like, padding leading singleton axes.
+
+    Args:
+        data: A NumPy array or any array-like supporting basic slicing
+            (e.g. a zarr array).
+        slices: One slice per axis; extra leading slices address singleton
+            axes prepended to `data`.
+    """
+    extra = len(slices) - data.ndim
+    if extra < 0:
+        raise ValueError("Data has more axes than expected.")
+    region = np.asarray(data[slices[extra:]])
+    return region.reshape((1,) * extra + region.shape)[slices[:extra]]
+
+
+@lru_cache(maxsize=4096)
+def _tiff_reads_by_region(path: str, memory_map: bool) -> bool:
+    """Whether a region of a TIFF is read without decoding the full image.
+
+    True for tiled TIFFs and TIFFs stored in several strips, and with
+    `memory_map` for TIFFs that can be memory-mapped. Only the file layout
+    is read, and it is remembered per path.
+    """
+    with tifffile.TiffFile(path) as tif:
+        if memory_map and tif.series[0].dataoffset is not None:
+            return True
+        page = tif.pages.first
+        return page.is_tiled or len(page.dataoffsets) > 1
 
 
 ImageLoaderInterfaceType = TypeVar(
@@ -30,10 +116,20 @@ ImageLoaderInterfaceType = TypeVar(
 
 
 class DefaultImageLoader(ImageLoaderInterface):
+    """Load TIFF, PNG, JPEG, BMP and NPY files from disk.
+
+    Attributes:
+        file_path: Path of the image file, relative to the resource if any.
+        memory_map: Memory-map uncompressed, contiguous TIFF and NPY files
+            instead of reading them into memory. Files whose layout does not
+            allow it are read as usual.
+    """
+
     file_path: str
+    memory_map: bool = False
 
-    def load_data(self, resource: Any = None) -> np.ndarray:
-        """Load the image data as a NumPy array."""
+    def _resolve_path(self, resource: Any = None) -> str:
+        """Join the optional resource (base directory or URL) and file path."""
         try:
             if resource is not None:
                 # Ensure we can convert to str
@@ -46,7 +142,34 @@ class DefaultImageLoader(ImageLoaderInterface):
             path = join_url_paths(resource, self.file_path)
         else:
             path = self.file_path
+        return path
+
+    def _suffix(self) -> str:
+        return self.file_path.split("/")[-1].split(".")[-1].lower()
+
+    def _memory_map(self, path: str) -> np.ndarray | None:
+        """Read-only memory map of the image, None if the file can't be mapped."""
+        suffix = self._suffix()
+        try:
+            if suffix in ["tiff", "tif"]:
+                # Only uncompressed images stored contiguously can be mapped
+                return tifffile.memmap(path, mode="r")
+            if suffix == "npy":
+                # A cast rather than np.asarray, which would drop np.memmap
+                return cast("np.ndarray", np.load(path, mmap_mode="r"))
+        except ValueError:
+            # e.g. compressed or tiled TIFFs, NPYs holding Python objects
+            return None
+        return None
 
+    def load_data(self, resource: Any = None) -> np.ndarray:
+        """Load the image data as a NumPy array.
+
+        With `memory_map`, a read-only memory map is returned when possible.
+        """
+        path = self._resolve_path(resource)
+        if self.memory_map and (mapped := self._memory_map(path)) is not None:
+            return mapped
         suffix = path.split("/")[-1].split(".")[-1]
         if suffix.lower() in ["tiff", "tif"]:
             with tifffile.TiffFile(path) as tif:
@@ -62,3 +185,94 @@ class DefaultImageLoader(ImageLoaderInterface):
                 "supported types are .tiff, .tif, .png, .jpg, .jpeg, .bmp, .npy"
             )
         return image
+
+    def probe(self, resource: Any = None) -> ImageProbe:
+        """Find the shape and data type of the image from the file header.
+
+        TIFF files are probed from the page metadata, PIL images are opened
+        lazily and NPY files are memory-mapped, so no pixel data is decoded.
+        """
+        path = self._resolve_path(resource)
+        suffix = path.split("/")[-1].split(".")[-1]
+        if suffix.lower() in ["tiff", "tif"]:
+            with tifffile.TiffFile(path) as tif:
+                series = tif.series[0]
+                return ImageProbe(shape=tuple(series.shape), dtype=str(series.dtype))
+        if suffix.lower() in ["png", "jpg", "jpeg", "bmp"]:
+            with Image.open(path) as image:
+                # A single pixel of the same mode gives the dtype and channels
+                pixel = np.asarray(Image.new(image.mode, (1, 1)))
+                shape = (image.height, image.width, *pixel.shape[2:])
+                return ImageProbe(shape=shape, dtype=str(pixel.dtype))
+        if suffix.lower() == "npy":
+            array = np.load(path, mmap_mode="r")
+            return ImageProbe(shape=tuple(array.shape), dtype=str(array.dtype))
+        return super().probe(resource)
+
+    def load_into(self, out: np.ndarray, resource: Any = None) -> None:
+        """Load the image data into `out`, in place.
+
+        TIFF files are decoded directly into `out` when it is a C-contiguous
+        array of the image data type, NPY files are memory-mapped and copied
+        into `out` without an intermediate array. Otherwise the image is
+        loaded and copied. With `memory_map`, mappable files are copied from
+        their memory map.
+        """
+        path = self._resolve_path(resource)
+        if self.memory_map and (mapped := self._memory_map(path)) is not None:
+            out[...] = mapped
+            return
+        suffix = self._suffix()
+        if suffix in ["tiff", "tif"]:
+            with tifffile.TiffFile(path) as tif:
+                series = tif.series[0]
+                # tifffile reshapes the array it decodes into to the series
+                # shape: pass a view of `out` with that shape (a C-contiguous
+                # array reshapes without copying), not `out` itself.
+                if (
+                    out.flags.c_contiguous
+                    and out.dtype == series.dtype
+                    and out.size == series.size
+                ):
+                    tif.asarray(out=out.reshape(series.shape))
+                else:
+                    out[...] = tif.asarray()
+        elif suffix == "npy":
+            out[...] = np.load(path, mmap_mode="r")
+        else:
+            super().load_into(out, resource)
+
+    def supports_region_loading(self, resource: Any = None) -> bool:
+        """Tiled and multi-strip TIFF files are read per tile/strip.
+
+        They are read through tifffile's zarr store. A TIFF stored in a single
+        strip would be decoded whole for every region, so it is loaded once
+        instead. With `memory_map`, mappable TIFF and NPY files are read
+        through their memory map.
+        """
+        suffix = self._suffix()
+        if suffix == "npy":
+            return self.memory_map
+        if suffix not in ["tiff", "tif"]:
+            return False
+        return _tiff_reads_by_region(self._resolve_path(resource), self.memory_map)
+
+    def load_region(
+        self, slices: tuple[slice, ...], resource: Any = None
+    ) -> np.ndarray:
+        """Load a rectangular region of the image data as a NumPy array.
+
+        For TIFF files only the strips or tiles intersecting the region are
+        decoded, memory-mapped files are sliced directly. Other formats fall
+        back to loading the full image.
+        """
+        if not self.supports_region_loading(resource):
+            return super().load_region(slices, resource)
+        path = self._resolve_path(resource)
+        if self.memory_map and (mapped := self._memory_map(path)) is not None:
+            return read_region(mapped, slices)
+        if self._suffix() == "npy":
+            return super().load_region(slices, resource)
+        with tifffile.TiffFile(path) as tif, tif.aszarr(level=0) as store:
+            array = zarr.open_array(store, mode="r")
+            return read_region(array, slices)
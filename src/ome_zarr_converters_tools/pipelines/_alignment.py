@@ -1,32 +1,46 @@
-import math
 import warnings
+from collections.abc import Sequence
 from typing import Literal
 
-from ngio import RoiSlice
+import numpy as np
 
 from ome_zarr_converters_tools.core import (
     TiledImage,
     TileSlice,
 )
-from ome_zarr_converters_tools.core._roi_utils import move_roi_by, move_to
+from ome_zarr_converters_tools.core._region_table import RegionTable
 from ome_zarr_converters_tools.models import AlignmentCorrections
+from ome_zarr_converters_tools.pipelines._region_transform import RegionTransform
 
+RegionsType = Sequence[TileSlice] | RegionTable
 
-def _align_xy_regions(regions: list[TileSlice]) -> list[TileSlice]:
-    ref_region = regions[0]
-    ref_start = {}
+
+def _align_xy(transform: RegionTransform) -> None:
+    """Move every region to the x/y start of the first region of its FOV."""
+    columns = transform.table.columns
+    if len(columns.fov_codes) == 0:
+        return
+    # First row of each FOV (unnamed regions are aligned together).
+    _, codes = np.unique(columns.fov_codes, return_inverse=True)
+    first_rows = np.full(codes.max() + 1, len(codes))
+    np.minimum.at(first_rows, codes, np.arange(len(codes)))
     for ax in ["x", "y"]:
-        slice_ = ref_region.roi.get(ax)
-        assert slice_ is not None
-        ref_start[ax] = slice_.start or 0.0
-    update_regions = [ref_region.model_copy()]
-    for region in regions[1:]:
-        region.roi = move_to(region.roi, ref_start)
-        update_regions.append(region)
-    return update_regions
+        column = columns.axis_index(ax)
+        if column is None:
+            continue
+        present = np.flatnonzero(columns.present[:, column])
+        transform.copy_starts(column, present, first_rows[codes[present]])
+
 
+def _align_xy_regions(regions: RegionsType) -> RegionTable:
+    """Move every region to the x/y start of the first region of its FOV."""
+    transform = RegionTransform(RegionTable.from_regions(regions))
+    _align_xy(transform)
+    transform.apply()
+    return transform.table
 
-def _align_z_regions(regions: list[TileSlice]) -> list[TileSlice]:
+
+def _align_z_regions(regions: RegionsType) -> RegionsType:
     warnings.warn(
         "Z alignment is not implemented yet. Returning regions unchanged.",
         UserWarning,
@@ -35,7 +49,7 @@ def _align_z_regions(regions: list[TileSlice]) -> list[TileSlice]:
     return regions
 
 
-def _align_t_regions(regions: list[TileSlice]) -> list[TileSlice]:
+def _align_t_regions(regions: RegionsType) -> RegionsType:
     warnings.warn(
         "T alignment is not implemented yet. Returning regions unchanged.",
         UserWarning,
@@ -44,17 +58,19 @@ def _align_t_regions(regions: list[TileSlice]) -> list[TileSlice]:
     return regions
 
 
-def _align_regions(
-    regions: list[TileSlice],
+def fov_alignment_corrections_transform(
+    tiled_image: TiledImage,
+    transform: RegionTransform,
     alignment_corrections: AlignmentCorrections,
-) -> list[TileSlice]:
+) -> None:
+    """Lazy `apply_fov_alignment_corrections`, composed into `transform`."""
+    transform.take(transform.table.fov_order())
     if alignment_corrections.align_xy:
-        regions = _align_xy_regions(regions)
+        _align_xy(transform)
     if alignment_corrections.align_z:
-        regions = _align_z_regions(regions)
+        _align_z_regions(transform.table)
     if alignment_corrections.align_t:
-        regions = _align_t_regions(regions)
-    return regions
+        _align_t_regions(transform.table)
 
 
 def apply_fov_alignment_corrections(
@@ -73,15 +89,27 @@ def apply_fov_alignment_corrections(
             corrections to apply.
 
     """
-    fov_tiles = tiled_image.group_by_fov()
-    aligned_regions = []
-    for fov_tile in fov_tiles:
-        aligned = _align_regions(fov_tile.regions, alignment_corrections)
-        aligned_regions.extend(aligned)
-    tiled_image.regions = aligned_regions
+    transform = RegionTransform(tiled_image.region_table)
+    fov_alignment_corrections_transform(tiled_image, transform, alignment_corrections)
+    transform.apply()
     return tiled_image
 
 
+def align_to_pixel_grid_transform(
+    tiled_image: TiledImage,
+    transform: RegionTransform,
+    mode: Literal["round", "floor", "ceil"] = "floor",
+) -> None:
+    """`apply_align_to_pixel_grid`, applying the moves pending in `transform`.
+
+    Rounding does not compose with translations, so the pending moves are
+    written to the table first.
+    """
+    transform.apply()
+    apply_align_to_pixel_grid(tiled_image, mode=mode)
+    transform.reset()
+
+
 def apply_align_to_pixel_grid(
     tiled_image: TiledImage, mode: Literal["round", "floor", "ceil"] = "floor"
 ) -> TiledImage:
@@ -90,60 +118,46 @@ def apply_align_to_pixel_grid(
     For each tile, adjust the start position to the nearest pixel grid position.
     """
     if mode == "round":
-        op = round
+        op = np.round
     elif mode == "floor":
-        op = math.floor
+        op = np.floor
     elif mode == "ceil":
-        op = math.ceil
+        op = np.ceil
     else:
         raise ValueError(f"Mode '{mode}' is not recognized.")
 
-    pixel_size = tiled_image.pixel_size
-    for region in tiled_image.regions:
-        adjusted_slices = []
-        roi = region.roi.to_pixel(pixel_size=pixel_size)
-        for roi_slice in roi.slices:
-            start = roi_slice.start
-            length = roi_slice.length
-            assert start is not None and length is not None
-            new_start = op(start)
-            new_length = op(length)
-            adjusted_slices.append(
-                RoiSlice(
-                    axis_name=roi_slice.axis_name,
-                    start=new_start,
-                    length=new_length,
-                )
-            )
-        updated_roi = roi.model_copy(update={"slices": adjusted_slices})
-        region.roi = updated_roi
+    table = tiled_image.region_table
+    table.to_pixel(tiled_image.pixel_size)
+    columns = table.columns
+    table.set_coordinates(starts=op(columns.starts), lengths=op(columns.lengths))
     return tiled_image
 
 
+def remove_offsets_transform(
+    tiled_image: TiledImage, transform: RegionTransform
+) -> None:
+    """Lazy `apply_remove_offsets`, composed into `transform`."""
+    columns = transform.table.columns
+    # Starts set to None count as 0
+    starts = np.where(columns.present, np.nan_to_num(transform.starts()), np.inf)
+    min_starts = starts.min(axis=0, initial=np.inf)
+
+    # Compute the vector shifts to move the minimum to zero
+    offset_shifts = {
+        axis: -min_start
+        for axis, min_start in zip(columns.axes, min_starts.tolist(), strict=True)
+        if min_start != np.inf
+    }
+    transform.shift(offset_shifts)
+
+
 def apply_remove_offsets(tiled_image: TiledImage) -> TiledImage:
     """Remove any offsets from the tile positions.
 
     This will find the minimum position in each dimension and
         subtract it from all tiles.
     """
-    tile_slices = tiled_image.regions
-
-    # Find the minimum start position for each axis
-    min_starts = {}
-    for tile in tile_slices:
-        for roi_slice in tile.roi.slices:
-            axis = roi_slice.axis_name
-            start = roi_slice.start or 0.0
-            if axis not in min_starts:
-                min_starts[axis] = start
-            else:
-                min_starts[axis] = min(min_starts[axis], start)
-
-    # Compute the vector shifts to move the minimum to zero
-    offset_shifts = {axis: -min_start for axis, min_start in min_starts.items()}
-
-    # Apply the shifts to each tile's ROI
-    for tile in tile_slices:
-        tile.roi = move_roi_by(tile.roi, offset_shifts)
-    tiled_image = tiled_image.model_copy(update={"regions": tile_slices})
-    return tiled_image
+    transform = RegionTransform(tiled_image.region_table)
+    remove_offsets_transform(tiled_image, transform)
+    transform.apply()
+    return tiled_image.model_copy()
@@ -0,0 +1,114 @@
+"""Streaming per-channel histograms for the channel display windows.
+
+The writers already hold every block they write in memory, so the channel
+windows can be computed from a histogram accumulated on the fly instead of
+reading the image back once it is written.  Only integer types with a small
+range (uint8, uint16) are supported: one exact bin per value.
+"""
+
+import threading
+from typing import Any
+
+import numpy as np
+from ngio import Roi
+
+_FIXED_BINS_DTYPES = (np.dtype("uint8"), np.dtype("uint16"))
+
+
+class ChannelHistogram:
+    """Exact per-channel histogram of uint8/uint16 data."""
+
+    def __init__(self, num_channels: int, dtype: str | np.dtype) -> None:
+        dtype = np.dtype(dtype)
+        if not self.supports(dtype):
+            raise ValueError(
+                f"Streaming histograms only support {_FIXED_BINS_DTYPES}, got {dtype}."
+            )
+        self.num_bins = int(np.iinfo(dtype).max) + 1
+        self.counts = np.zeros((num_channels, self.num_bins), dtype=np.int64)
+
+    @staticmethod
+    def supports(dtype: str | np.dtype) -> bool:
+        """Whether the data type can be histogrammed with fixed bins."""
+        return np.dtype(dtype) in _FIXED_BINS_DTYPES
+
+    def channel_counts(self, data: np.ndarray, channel_axis: int | None) -> np.ndarray:
+        """Histogram of a block, one row per channel (or a single row)."""
+        if channel_axis is None:
+            return np.bincount(data.ravel(), minlength=self.num_bins)[None]
+        data = np.moveaxis(data, channel_axis, 0)
+        return np.stack(
+            [np.bincount(channel.ravel(), minlength=self.num_bins) for channel in data]
+        )
+
+    def percentiles(
+        self, percentiles: tuple[float, float] = (0.1, 99.9)
+    ) -> list[tuple[float, float]]:
+        """Start and end percentiles of the non-zero values of each channel.
+
+        Matches ``numpy.percentile(..., method="nearest")`` on the non-zero
+        values, the statistic used by ngio's
+        ``set_channel_windows_with_percentiles``. Channels with no non-zero
+        value get a (0, 0) window.
+        """
+        starts_ends = []
+        for counts in self.counts:
+            cumulative = np.cumsum(counts[1:])
+            num_values = int(cumulative[-1])
+            if num_values == 0:
+                starts_ends.append((0.0, 0.0))
+                continue
+            window = []
+            for percentile in percentiles:
+                rank = int(np.around(percentile / 100 * (num_values - 1)))
+                # Bins are offset by one, since zeros are excluded.
+                window.append(float(np.searchsorted(cumulative, rank, "right") + 1))
+            starts_ends.append((window[0], window[1]))
+        return starts_ends
+
+
+class HistogramWriter:
+    """Accumulate a `ChannelHistogram` of the blocks written to an image.
+
+    Exposes the subset of the ngio ``Image`` interface used by the writers
+    (``chunks``, ``set_roi`` and ``set_array``) and forwards the writes to
+    the wrapped image. Lazy (dask) blocks are not in memory and are not
+    histogrammed: `complete` is False once such a block has been written.
+
+    Overlapping tiles are counted once per write, so pixels covered by
+    several tiles weigh more than in the final image; this is negligible for
+    display windows.
+    """
+
+    def __init__(
+        self, image: Any, axes: tuple[str, ...], num_channels: int, dtype: str
+    ) -> None:
+        self.image = image
+        self.axes = tuple(axes)
+        self.histogram = ChannelHistogram(num_channels=num_channels, dtype=dtype)
+        self.complete = True
+        self._lock = threading.Lock()
+
+    @property
+    def chunks(self) -> tuple[int, ...]:
+        return tuple(self.image.chunks)
+
+    def set_roi(self, roi: Roi, patch: Any, **kwargs: Any) -> None:
+        """Write a block to the ROI of the image and histogram it."""
+        self.image.set_roi(roi=roi, patch=patch, **kwargs)
+        self._update(patch, kwargs.get("axes_order"))
+
+    def set_array(self, patch: Any, axes_order: Any = None, **kwargs: Any) -> None:
+        """Write a block to the image (indexed by slices) and histogram it."""
+        self.image.set_array(patch=patch, axes_order=axes_order, **kwargs)
+        self._update(patch, axes_order)
+
+    def _update(self, patch: Any, axes_order: Any) -> None:
+        if not isinstance(patch, np.ndarray):
+            self.complete = False
+            return
+        axes = self.axes if axes_order is None else tuple(axes_order)
+        channel_axis = axes.index("c") if "c" in axes else None
+        counts = self.histogram.channel_counts(patch, channel_axis)
+        with self._lock:
+            self.histogram.counts += counts
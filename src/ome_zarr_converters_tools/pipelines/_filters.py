@@ -1,11 +1,14 @@
 import re
-from collections.abc import Sequence
+from collections.abc import Callable, Sequence
 from typing import Annotated, Any, Literal, ParamSpec, Protocol
 
 from pydantic import BaseModel, Field
 
 from ome_zarr_converters_tools.core._tile import Tile
-from ome_zarr_converters_tools.models._collection import ImageInPlate
+from ome_zarr_converters_tools.models._collection import (
+    CollectionInterface,
+    ImageInPlate,
+)
 
 
 class FilterModel(BaseModel):
@@ -25,17 +28,23 @@ class RegexIncludeFilter(FilterModel):
     regex: str
 
 
-def _regex_bases_match(tile: Tile, regex: str) -> bool:
-    base_path = tile.collection.path()
+def _regex_bases_match(collection: CollectionInterface, regex: str) -> bool:
+    base_path = collection.path()
     if re.search(regex, base_path):
         return True
     return False
 
 
+def _keep_path_include_regex(
+    collection: CollectionInterface, filter_params: RegexIncludeFilter
+) -> bool:
+    return _regex_bases_match(collection, filter_params.regex)
+
+
 def apply_path_include_regex_filter(
     tile: Tile, filter_params: RegexIncludeFilter
 ) -> bool:
-    return _regex_bases_match(tile, filter_params.regex)
+    return _keep_path_include_regex(tile.collection, filter_params)
 
 
 class RegexExcludeFilter(FilterModel):
@@ -51,10 +60,16 @@ class RegexExcludeFilter(FilterModel):
     regex: str
 
 
+def _keep_path_exclude_regex(
+    collection: CollectionInterface, filter_params: RegexExcludeFilter
+) -> bool:
+    return not _regex_bases_match(collection, filter_params.regex)
+
+
 def apply_path_exclude_regex_filter(
     tile: Tile, filter_params: RegexExcludeFilter
 ) -> bool:
-    return not _regex_bases_match(tile, filter_params.regex)
+    return _keep_path_exclude_regex(tile.collection, filter_params)
 
 
 class WellFilter(FilterModel):
@@ -70,16 +85,20 @@ class WellFilter(FilterModel):
     wells_to_remove: list[str]
 
 
-def apply_well_filter(tile: Tile, filter_params: WellFilter) -> bool:
-    if not isinstance(tile.collection, ImageInPlate):
+def _keep_well(collection: CollectionInterface, filter_params: WellFilter) -> bool:
+    if not isinstance(collection, ImageInPlate):
         raise ValueError(
             "Well filter can only be applied to To tile with ImageInPlate collection."
         )
-    if tile.collection.well in filter_params.wells_to_remove:
+    if collection.well in filter_params.wells_to_remove:
         return False
     return True
 
 
+def apply_well_filter(tile: Tile, filter_params: WellFilter) -> bool:
+    return _keep_well(tile.collection, filter_params)
+
+
 P = ParamSpec("P")
 
 
@@ -129,6 +148,53 @@ def apply_filter_pipeline(
     return tiles
 
 
+# Built-in filters that only depend on the collection of the tile, with the
+# equivalent check on a collection. When building tiles from a tiles table,
+# they are evaluated once per distinct collection, before any Tile is built.
+_collection_filters: dict[str, tuple[FilterFunctionProtocol, Callable[..., bool]]] = {
+    "Path Regex Include Filter": (
+        apply_path_include_regex_filter,
+        _keep_path_include_regex,
+    ),
+    "Path Regex Exclude Filter": (
+        apply_path_exclude_regex_filter,
+        _keep_path_exclude_regex,
+    ),
+    "Well Filter": (apply_well_filter, _keep_well),
+}
+
+
+def split_collection_filters(
+    filters_config: Sequence[FilterModel],
+) -> tuple[Callable[[CollectionInterface], bool] | None, list[FilterModel]]:
+    """Split the filters between collection filters and per-tile filters.
+
+    Built-in filters only depend on the collection of the tile, unless their
+    name has been registered again with `add_filter(overwrite=True)`.
+
+    Returns:
+        A function combining the collection filters (None if there are none),
+        and the remaining filters, to apply with `apply_filter_pipeline`.
+    """
+    collection_steps = []
+    tile_steps = []
+    for step in filters_config:
+        builtin = _collection_filters.get(step.name)
+        if builtin is not None and _filter_registry.get(step.name) is builtin[0]:
+            collection_steps.append((builtin[1], step))
+        else:
+            tile_steps.append(step)
+    if not collection_steps:
+        return None, tile_steps
+
+    def collection_filter(collection: CollectionInterface) -> bool:
+        return all(
+            keep(collection, filter_params=step) for keep, step in collection_steps
+        )
+
+    return collection_filter, tile_steps
+
+
 ImplementedFilters = Annotated[
     RegexExcludeFilter | RegexIncludeFilter | WellFilter, Field(discriminator="name")
 ]
@@ -0,0 +1,482 @@
+"""Parallel tile writers.
+
+Thread writer
+-------------
+Tiles are loaded by a pool of workers and written by separate writer threads.
+Two constraints shape the scheduling:
+
+- **Bounded memory**: tiles that are loaded but not yet written are capped
+  by a byte budget (not an item count, since tiles can differ wildly in
+  size).  The budget is granted strictly in tile order, so the earliest
+  unwritten tile can always make progress and the pipeline cannot deadlock.
+- **Chunk-safe ordering**: two writes touching the same zarr chunk must not
+  run concurrently (partial chunk writes are read-modify-write), and must
+  happen in tile order to keep the last-writer-wins semantics of overlapping
+  tiles.  Each tile therefore waits for the previous writer of every chunk it
+  touches.
+
+Process writer
+--------------
+For loaders holding the GIL, tiles are shipped (as pickled ``TileSlice``
+models, together with the ngio ``Image``) to worker processes that load and
+write them directly.  Processes cannot coordinate writes cheaply, so tiles
+are partitioned up front: tiles sharing a zarr chunk (transitively) always
+end up in the same partition and are written in tile order by one process.
+
+Prefetching
+-----------
+The sequential writers can load the next tiles (or FOV groups) on a single
+background thread while the current one is written, so that reads overlap
+compression and writes.  The read-ahead is bounded both in number of items
+and in bytes, and items are still written one at a time, in order.
+"""
+
+import functools
+import heapq
+import itertools
+import math
+import multiprocessing
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from logging import getLogger
+from typing import Any
+
+import numpy as np
+from ngio import Image
+
+from ome_zarr_converters_tools.core._tile_cache import get_tile_cache
+from ome_zarr_converters_tools.core._tile_region import TiledImage, TileSlice
+from ome_zarr_converters_tools.models import WriterOptions
+from ome_zarr_converters_tools.models._acquisition import CANONICAL_AXES_TYPE
+
+logger = getLogger(__name__)
+
+
+class _Aborted(Exception):
+    """Raised in waiting workers once another worker has failed."""
+
+
+class _ByteBudget:
+    """A byte budget granted strictly in ticket order.
+
+    A request larger than the whole budget is granted once nothing else is
+    held, so oversized tiles are processed one at a time instead of blocking
+    forever.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self._max_bytes = max_bytes
+        self._in_use = 0
+        self._next_ticket = 0
+        self._aborted = False
+        self._cond = threading.Condition()
+
+    def acquire(self, ticket: int, nbytes: int) -> None:
+        with self._cond:
+            self._cond.wait_for(
+                lambda: (
+                    self._aborted
+                    or (
+                        self._next_ticket == ticket
+                        and (
+                            self._in_use == 0
+                            or self._in_use + nbytes <= self._max_bytes
+                        )
+                    )
+                )
+            )
+            if self._aborted:
+                raise _Aborted()
+            self._in_use += nbytes
+            self._next_ticket += 1
+            self._cond.notify_all()
+
+    def release(self, nbytes: int) -> None:
+        with self._cond:
+            self._in_use -= nbytes
+            self._cond.notify_all()
+
+    def abort(self) -> None:
+        with self._cond:
+            self._aborted = True
+            self._cond.notify_all()
+
+
+def prefetch_loads(
+    loads: Sequence[Callable[[], np.ndarray]],
+    nbytes: Sequence[int],
+    depth: int,
+    max_bytes: int,
+) -> Iterator[np.ndarray]:
+    """Yield the results of `loads` in order, loading ahead on a thread.
+
+    At most `depth` items are loaded ahead of the one being consumed, and the
+    items loaded but not yet consumed never hold more than `max_bytes`
+    (except for a single item larger than the budget). An item counts until
+    the consumer asks for the next one. With `depth` 0 the items are loaded
+    in the calling thread.
+
+    Args:
+        loads: Callables loading each item.
+        nbytes: Size in bytes of each item.
+        depth: Number of items to load ahead.
+        max_bytes: Byte budget of the items loaded ahead.
+    """
+    if depth == 0:
+        for load in loads:
+            yield load()
+        return
+
+    cond = threading.Condition()
+    ready: deque[tuple[np.ndarray | None, BaseException | None]] = deque()
+    in_flight = 0
+    in_use = 0
+    stop = False
+
+    def can_load(size: int) -> bool:
+        # The item being consumed does not count towards `depth`
+        return stop or (
+            in_flight <= depth and (in_use == 0 or in_use + size <= max_bytes)
+        )
+
+    def produce() -> None:
+        nonlocal in_flight, in_use
+        for load, size in zip(loads, nbytes, strict=True):
+            with cond:
+                cond.wait_for(functools.partial(can_load, size))
+                if stop:
+                    return
+                in_flight += 1
+                in_use += size
+            try:
+                item: tuple[np.ndarray | None, BaseException | None] = (load(), None)
+            except BaseException as e:
+                item = (None, e)
+            with cond:
+                ready.append(item)
+                cond.notify_all()
+            if item[1] is not None:
+                return
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        for size in nbytes:
+            with cond:
+                cond.wait_for(lambda: bool(ready))
+                data, error = ready.popleft()
+            if error is not None:
+                raise error
+            try:
+                yield data  # type: ignore[misc]
+            finally:
+                with cond:
+                    in_flight -= 1
+                    in_use -= size
+                    cond.notify_all()
+    finally:
+        with cond:
+            stop = True
+            cond.notify_all()
+        producer.join()
+
+
+def region_pixel_slices(
+    region: TileSlice, tiled_image: TiledImage
+) -> tuple[slice, ...]:
+    """Pixel slicing of a TileSlice in the image, one slice per axis."""
+    roi_slice = region.roi.to_slicing_dict(pixel_size=tiled_image.pixel_size)
+    return tuple(
+        slice(math.floor(roi_slice[axis].start), math.ceil(roi_slice[axis].stop))
+        for axis in tiled_image.axes
+    )
+
+
+def touched_chunks(
+    slicing: tuple[slice, ...], chunks: tuple[int, ...]
+) -> list[tuple[int, ...]]:
+    """Grid indices of the chunks intersecting a slicing."""
+    ranges = [
+        range(sl.start // chunk, -(-sl.stop // chunk))
+        for sl, chunk in zip(slicing, chunks, strict=True)
+    ]
+    return list(itertools.product(*ranges))
+
+
+def write_dependencies(
+    regions_slices: list[tuple[slice, ...]], chunks: tuple[int, ...]
+) -> list[list[int]]:
+    """For each region, the earlier regions that must be written before it.
+
+    A region depends on the last earlier region writing to each of the chunks
+    it touches; chained, this orders all writes to a chunk in region order.
+    """
+    last_writer: dict[tuple[int, ...], int] = {}
+    dependencies = []
+    for idx, slicing in enumerate(regions_slices):
+        chunk_ids = touched_chunks(slicing, chunks)
+        dependencies.append(
+            sorted({last_writer[c] for c in chunk_ids if c in last_writer})
+        )
+        for chunk_id in chunk_ids:
+            last_writer[chunk_id] = idx
+    return dependencies
+
+
+def partition_regions(
+    regions_slices: list[tuple[slice, ...]],
+    chunks: tuple[int, ...],
+    num_partitions: int,
+) -> list[list[int]]:
+    """Split regions into partitions that never share a zarr chunk.
+
+    Regions connected through shared chunks form a component (union-find);
+    components are packed into at most `num_partitions` partitions, largest
+    first onto the least loaded partition, by number of pixels.
+
+    Args:
+        regions_slices: Pixel slicing of every region.
+        chunks: Chunk size of the zarr array.
+        num_partitions: Maximum number of partitions.
+
+    Returns:
+        Non-empty partitions of region indices, each in ascending order.
+    """
+    parent = list(range(len(regions_slices)))
+
+    def find(idx: int) -> int:
+        while parent[idx] != idx:
+            parent[idx] = parent[parent[idx]]
+            idx = parent[idx]
+        return idx
+
+    chunk_owner: dict[tuple[int, ...], int] = {}
+    for idx, slicing in enumerate(regions_slices):
+        for chunk_id in touched_chunks(slicing, chunks):
+            owner = chunk_owner.setdefault(chunk_id, idx)
+            root_a, root_b = find(owner), find(idx)
+            if root_a != root_b:
+                parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    components: dict[int, list[int]] = {}
+    for idx in range(len(regions_slices)):
+        components.setdefault(find(idx), []).append(idx)
+
+    def size(component: list[int]) -> int:
+        return sum(
+            math.prod(sl.stop - sl.start for sl in regions_slices[idx])
+            for idx in component
+        )
+
+    partitions: list[list[int]] = [[] for _ in range(max(1, num_partitions))]
+    loads = [(0, p) for p in range(len(partitions))]
+    for component in sorted(components.values(), key=size, reverse=True):
+        load, p = heapq.heappop(loads)
+        partitions[p].extend(component)
+        heapq.heappush(loads, (load + size(component), p))
+    return [sorted(partition) for partition in partitions if partition]
+
+
+def _init_worker(max_tile_cache_bytes: int) -> None:
+    """Give a worker process the tile cache budget of the parent."""
+    get_tile_cache().configure(max_tile_cache_bytes)
+
+
+def _write_regions(
+    image: Image,
+    regions: list[TileSlice],
+    axes: list[CANONICAL_AXES_TYPE],
+    resource: Any,
+) -> int:
+    """Load and write a partition of regions (runs in a worker process)."""
+    for region in regions:
+        data = region.load_data(axes=axes, resource=resource)
+        image.set_roi(roi=region.roi, patch=data)
+    return len(regions)
+
+
+def process_tile_writing(
+    tiled_image: TiledImage,
+    image: Image,
+    resource: Any,
+    chunks: tuple[int, ...] | None = None,
+    writer_options: WriterOptions | None = None,
+) -> None:
+    """Write tiles to the OME-Zarr image from a pool of worker processes.
+
+    Tiles are partitioned so that no two processes write to the same zarr
+    chunk (see `partition_regions`); each process loads and writes its tiles
+    directly. Use this mode for image loaders that hold the GIL while
+    decoding. The image loaders and `resource` must be picklable, and the
+    loader classes importable by the worker processes.
+
+    Args:
+        tiled_image: The TiledImage to write.
+        image: The OME-Zarr image to write to.
+        resource: Optional resource to pass to the image loaders.
+        chunks: Chunk size of the OME-Zarr image. Defaults to `image.chunks`.
+        writer_options: Number of worker processes.
+    """
+    writer_options = writer_options or WriterOptions()
+    regions = list(tiled_image.regions)
+    num_workers = writer_options.num_workers
+    if chunks is None:
+        chunks = tuple(image.chunks)
+    regions_slices = [region_pixel_slices(region, tiled_image) for region in regions]
+    # More partitions than workers, so that the pool can balance the load.
+    partitions = partition_regions(regions_slices, chunks, 4 * num_workers)
+    logger.info(
+        f"Starting process tile writing - Number of tiles: {len(regions)}, "
+        f"partitions: {len(partitions)}, workers: {num_workers}."
+    )
+    if len(partitions) == 1 and num_workers > 1:
+        logger.warning(
+            "All tiles share zarr chunks with each other, "
+            "they will be written by a single process."
+        )
+    timer = time.time()
+    # Spawned (not forked) workers: zarr runs an event loop in a background
+    # thread, which does not survive a fork. They don't inherit the tile cache
+    # configuration either, so it is passed explicitly.
+    with ProcessPoolExecutor(
+        max_workers=num_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(get_tile_cache().stats().max_bytes,),
+    ) as pool:
+        futures = [
+            pool.submit(
+                _write_regions,
+                image,
+                [regions[idx] for idx in partition],
+                tiled_image.axes,
+                resource,
+            )
+            for partition in partitions
+        ]
+        for future in as_completed(futures):
+            future.result()
+    elapsed = time.time() - timer
+    logger.info(f"Elapsed time for process tile writing: {elapsed:.2f} seconds.")
+
+
+def threaded_tile_writing(
+    tiled_image: TiledImage,
+    image: Image,
+    resource: Any,
+    chunks: tuple[int, ...] | None = None,
+    writer_options: WriterOptions | None = None,
+) -> None:
+    """Write tiles to the OME-Zarr image with a thread-pool producer/consumer.
+
+    Tiles are loaded on `writer_options.num_workers` threads and written by
+    `writer_options.num_writers` threads. Loaded tiles waiting to be written
+    never exceed `writer_options.max_buffer_mb` (except for a single tile
+    larger than the budget). Image decoders that release the GIL (tifffile,
+    PIL) load in parallel.
+
+    Args:
+        tiled_image: The TiledImage to write.
+        image: The OME-Zarr image to write to.
+        resource: Optional resource to pass to the image loaders.
+        chunks: Chunk size of the OME-Zarr image. Defaults to `image.chunks`.
+        writer_options: Worker counts and memory budget.
+    """
+    writer_options = writer_options or WriterOptions()
+    regions = list(tiled_image.regions)
+    num_regions = len(regions)
+    logger.info(
+        f"Starting threaded tile writing - Number of tiles: {num_regions}, "
+        f"workers: {writer_options.num_workers}, "
+        f"writers: {writer_options.num_writers}."
+    )
+    if num_regions == 0:
+        return
+    timer = time.time()
+    if chunks is None:
+        chunks = tuple(image.chunks)
+    regions_slices = [region_pixel_slices(region, tiled_image) for region in regions]
+    dependencies = write_dependencies(regions_slices, chunks)
+    itemsize = np.dtype(tiled_image.data_type).itemsize
+    budget = _ByteBudget(writer_options.max_buffer_mb * 1024**2)
+
+    lock = threading.Lock()
+    finished = threading.Event()
+    errors: list[BaseException] = []
+    num_pending_deps = [len(deps) for deps in dependencies]
+    dependents: list[list[int]] = [[] for _ in regions]
+    for idx, deps in enumerate(dependencies):
+        for dep in deps:
+            dependents[dep].append(idx)
+    loaded: dict[int, tuple[np.ndarray, int]] = {}
+    num_written = 0
+
+    def fail(error: BaseException) -> None:
+        with lock:
+            errors.append(error)
+        budget.abort()
+        finished.set()
+
+    # The load pool is shut down first, so loads in flight can still hand
+    # their tile over to the write pool.
+    with (
+        ThreadPoolExecutor(writer_options.num_writers) as write_pool,
+        ThreadPoolExecutor(writer_options.num_workers) as load_pool,
+    ):
+
+        def write(idx: int, data: np.ndarray, nbytes: int) -> None:
+            nonlocal num_written
+            if errors:
+                budget.release(nbytes)
+                return
+            try:
+                image.set_roi(roi=regions[idx].roi, patch=data)
+            except BaseException as e:
+                fail(e)
+                return
+            finally:
+                budget.release(nbytes)
+            ready = []
+            with lock:
+                for dependent in dependents[idx]:
+                    num_pending_deps[dependent] -= 1
+                    if num_pending_deps[dependent] == 0 and dependent in loaded:
+                        ready.append((dependent, *loaded.pop(dependent)))
+                num_written += 1
+                if num_written == num_regions:
+                    finished.set()
+            for item in ready:
+                write_pool.submit(write, *item)
+
+        def load(idx: int) -> None:
+            nbytes = itemsize * math.prod(
+                sl.stop - sl.start for sl in regions_slices[idx]
+            )
+            try:
+                budget.acquire(idx, nbytes)
+            except _Aborted:
+                return
+            try:
+                data = regions[idx].load_data(axes=tiled_image.axes, resource=resource)
+            except BaseException as e:
+                budget.release(nbytes)
+                fail(e)
+                return
+            with lock:
+                if num_pending_deps[idx] > 0:
+                    loaded[idx] = (data, nbytes)
+                    return
+            write_pool.submit(write, idx, data, nbytes)
+
+        for idx in range(num_regions):
+            load_pool.submit(load, idx)
+        finished.wait()
+        load_pool.shutdown(cancel_futures=True)
+
+    if errors:
+        raise errors[0]
+    elapsed = time.time() - timer
+    logger.info(f"Elapsed time for threaded tile writing: {elapsed:.2f} seconds.")
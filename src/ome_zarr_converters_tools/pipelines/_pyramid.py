@@ -0,0 +1,302 @@
+"""Fused pyramid generation.
+
+Instead of writing level 0 and then re-reading it from disk to build the
+coarser levels (``Image.consolidate``), every block written by a writer is
+downsampled in memory and written to all the pyramid levels straight away.
+
+Along each axis, a level is downsampled from the previous one by the integer
+factor ``r = fine // coarse``.  With the linear zoom each coarse pixel maps
+onto exactly ``r`` fine pixels, so zooming a block alone gives the same
+pixels as zooming the whole level, provided the block is aligned to ``r``.
+When the fine size is not a multiple of ``r`` (e.g. 5941 -> 2970), the
+leftover fine pixels are folded into the last coarse pixel: that ragged
+border strip is zoomed on its own, from the previous level, once the write
+pass is over.  Blocks that are not aligned (or lazy dask blocks) are
+recorded too, and only those regions are rebuilt after the write pass.
+"""
+
+import itertools
+import math
+import threading
+from logging import getLogger
+from typing import Any
+
+import numpy as np
+from ngio import Image, OmeZarrContainer, Roi
+from ngio.common._zoom import numpy_zoom
+
+logger = getLogger(__name__)
+
+BoxType = tuple[tuple[int, int], ...]
+ShapeType = tuple[int, ...]
+
+
+def _level_ratios(shapes: list[ShapeType]) -> list[ShapeType]:
+    """Integer downsampling factor between consecutive levels, per axis."""
+    return [
+        tuple(
+            max(fine_size // max(coarse_size, 1), 1)
+            for fine_size, coarse_size in zip(fine, coarse, strict=True)
+        )
+        for fine, coarse in itertools.pairwise(shapes)
+    ]
+
+
+def _coarse_box(box: BoxType, ratio: ShapeType, coarse: ShapeType) -> BoxType:
+    """Coarse pixels depending on any fine pixel of `box`."""
+    return tuple(
+        (min(start // r, size - 1), min(-(-stop // r), size))
+        for (start, stop), r, size in zip(box, ratio, coarse, strict=True)
+    )
+
+
+def _source_box(
+    box: BoxType, ratio: ShapeType, fine: ShapeType, coarse: ShapeType
+) -> BoxType:
+    """Fine pixels the coarse pixels of `box` are computed from."""
+    return tuple(
+        (start * r, fine_size if stop == size else stop * r)
+        for (start, stop), r, fine_size, size in zip(
+            box, ratio, fine, coarse, strict=True
+        )
+    )
+
+
+def _aligned_part(
+    box: BoxType, ratio: ShapeType, fine: ShapeType, coarse: ShapeType
+) -> BoxType | None:
+    """Coarse pixels that can be computed from the fine block `box` alone.
+
+    Returns None if the block is not aligned to `ratio`.  The ragged border
+    strip is only included if the block reaches the end of the fine level.
+    """
+    aligned = []
+    for (start, stop), r, fine_size, size in zip(box, ratio, fine, coarse, strict=True):
+        if start % r != 0 or start // r >= size:
+            return None
+        if stop == fine_size:
+            aligned.append((start // r, size))
+        elif stop % r == 0:
+            aligned.append((start // r, min(stop // r, size - 1)))
+        else:
+            return None
+    return tuple(aligned)
+
+
+def _box_difference(outer: BoxType, inner: BoxType) -> list[BoxType]:
+    """Split the part of `outer` not covered by `inner` into boxes.
+
+    `inner` must share the start of `outer` along every axis.
+    """
+    boxes = []
+    for i, ((_, stop), (_, inner_stop)) in enumerate(zip(outer, inner, strict=True)):
+        if inner_stop < stop:
+            boxes.append((*inner[:i], (inner_stop, stop), *outer[i + 1 :]))
+    return boxes
+
+
+def _downsample(
+    patch: np.ndarray,
+    box: BoxType,
+    ratio: ShapeType,
+    fine: ShapeType,
+    coarse: ShapeType,
+) -> np.ndarray:
+    """Zoom the fine `patch` covering `_source_box(box)` onto the coarse `box`.
+
+    The ragged border strip is zoomed separately from the rest, so the result
+    does not depend on how the level is split into blocks.
+    """
+    segments = []
+    for (start, stop), r, fine_size, size in zip(box, ratio, fine, coarse, strict=True):
+        if stop == size and size * r != fine_size and start < size - 1:
+            split = size - 1 - start
+            segments.append(
+                [
+                    ((0, split), slice(0, split * r)),
+                    ((split, split + 1), slice(split * r, None)),
+                ]
+            )
+        else:
+            segments.append([((0, stop - start), slice(None))])
+    out = np.empty(tuple(stop - start for start, stop in box), dtype=patch.dtype)
+    for combination in itertools.product(*segments):
+        target = tuple(slice(start, stop) for (start, stop), _ in combination)
+        source = tuple(source for _, source in combination)
+        out[target] = numpy_zoom(
+            patch[source],
+            target_shape=tuple(stop - start for (start, stop), _ in combination),
+            order="linear",
+        )
+    return out
+
+
+def _split_box(box: BoxType, chunks: ShapeType) -> list[BoxType]:
+    """Split `box` along the chunk grid, to bound the memory of a rebuild."""
+    ranges = [
+        [
+            (max(start, edge), min(stop, edge + chunk))
+            for edge in range(start // chunk * chunk, stop, chunk)
+        ]
+        for (start, stop), chunk in zip(box, chunks, strict=True)
+    ]
+    return [tuple(part) for part in itertools.product(*ranges)]
+
+
+class FusedPyramidWriter:
+    """Write blocks to level 0 and, in the same pass, to every coarser level.
+
+    Exposes the subset of the ngio ``Image`` interface used by the writers
+    (``chunks``, ``set_roi`` and ``set_array``), so it can be handed to any of
+    them in place of the level 0 image.  Call `finalize` once all blocks are
+    written, to rebuild the regions that could not be downsampled in place.
+
+    Safe to use from several writer threads: level 0 writes are left to the
+    writer scheduling, coarser level writes are serialized, since blocks
+    disjoint at level 0 can share chunks at the coarser levels.
+    """
+
+    def __init__(self, ome_zarr: OmeZarrContainer) -> None:
+        self._levels: list[Image] = [
+            ome_zarr.get_image(path=path) for path in ome_zarr.level_paths
+        ]
+        self.base = self._levels[0]
+        self.axes = tuple(self.base.axes)
+        self._shapes: list[ShapeType] = [tuple(level.shape) for level in self._levels]
+        self._ratios = _level_ratios(self._shapes)
+        # Regions of level k to be rebuilt from level k - 1 (index k - 1).
+        self._pending: list[set[BoxType]] = [set() for _ in self._levels[1:]]
+        self._lock = threading.Lock()
+
+    @property
+    def chunks(self) -> tuple[int, ...]:
+        return tuple(self.base.chunks)
+
+    def set_roi(self, roi: Roi, patch: Any, **slicing_kwargs: Any) -> None:
+        """Write a block to the ROI of level 0 and propagate it."""
+        self.base.set_roi(roi=roi, patch=patch, **slicing_kwargs)
+        roi_slice = roi.to_slicing_dict(pixel_size=self.base.pixel_size)
+        box = []
+        for axis, size in zip(self.axes, self.base.shape, strict=True):
+            if axis in roi_slice:
+                box.append(
+                    (
+                        max(math.floor(roi_slice[axis].start), 0),
+                        min(math.ceil(roi_slice[axis].stop), size),
+                    )
+                )
+            else:
+                box.append((0, size))
+        self._propagate(tuple(box), patch, exact=not slicing_kwargs)
+
+    def set_array(
+        self,
+        patch: Any,
+        axes_order: Any = None,
+        **slicing_kwargs: Any,
+    ) -> None:
+        """Write a block to level 0 (indexed by slices) and propagate it."""
+        self.base.set_array(patch=patch, axes_order=axes_order, **slicing_kwargs)
+        box = []
+        for axis, size in zip(self.axes, self.base.shape, strict=True):
+            start, stop, _ = slicing_kwargs.get(axis, slice(None)).indices(size)
+            box.append((start, stop))
+        exact = axes_order is None or tuple(axes_order) == self.axes
+        self._propagate(tuple(box), patch, exact=exact)
+
+    def _propagate(self, box: BoxType, patch: Any, exact: bool) -> None:
+        """Downsample a level 0 block through the levels while it is aligned."""
+        if (
+            not exact
+            or not isinstance(patch, np.ndarray)
+            or patch.shape != tuple(stop - start for start, stop in box)
+        ):
+            self._mark_pending(0, box)
+            return
+        for level, ratio in enumerate(self._ratios, start=1):
+            fine, coarse = self._shapes[level - 1], self._shapes[level]
+            aligned = _aligned_part(box, ratio, fine, coarse)
+            if aligned is None or any(start >= stop for start, stop in aligned):
+                self._mark_pending(level - 1, box)
+                return
+            for rest in _box_difference(_coarse_box(box, ratio, coarse), aligned):
+                self._add_pending(level - 1, rest)
+            source = _source_box(aligned, ratio, fine, coarse)
+            patch = _downsample(
+                patch[
+                    tuple(
+                        slice(src_start - start, src_stop - start)
+                        for (src_start, src_stop), (start, _) in zip(
+                            source, box, strict=True
+                        )
+                    )
+                ],
+                aligned,
+                ratio,
+                fine,
+                coarse,
+            )
+            box = aligned
+            with self._lock:
+                self._write(level, box, patch)
+
+    def _mark_pending(self, level: int, box: BoxType) -> None:
+        """Record a region of `level` whose coarser levels are out of date."""
+        if level >= len(self._ratios):
+            return
+        self._add_pending(
+            level, _coarse_box(box, self._ratios[level], self._shapes[level + 1])
+        )
+
+    def _add_pending(self, level: int, box: BoxType) -> None:
+        """Record a region of level `level + 1` to be rebuilt."""
+        with self._lock:
+            self._pending[level].add(box)
+
+    def _write(self, level: int, box: BoxType, patch: np.ndarray) -> None:
+        self._levels[level].set_array(
+            patch=patch,
+            **{
+                axis: slice(start, stop)
+                for axis, (start, stop) in zip(self.axes, box, strict=True)
+            },
+        )
+
+    def finalize(self) -> None:
+        """Rebuild the coarser levels where blocks could not be propagated.
+
+        Each pending region is rebuilt from the previous level one chunk at a
+        time, so a deferred write of the whole of level 0 does not load it in
+        memory at once.
+        """
+        num_regions = len(self._pending[0]) if self._pending else 0
+        for level, ratio in enumerate(self._ratios, start=1):
+            fine, coarse = self._shapes[level - 1], self._shapes[level]
+            chunks = tuple(self._levels[level].chunks)
+            for pending_box in sorted(self._pending[level - 1]):
+                for box in _split_box(pending_box, chunks):
+                    source_box = _source_box(box, ratio, fine, coarse)
+                    source = self._levels[level - 1].get_array(
+                        **{
+                            axis: slice(start, stop)
+                            for axis, (start, stop) in zip(
+                                self.axes, source_box, strict=True
+                            )
+                        }
+                    )
+                    self._write(
+                        level,
+                        box,
+                        _downsample(np.asarray(source), box, ratio, fine, coarse),
+                    )
+                if level < len(self._ratios):
+                    self._pending[level].add(
+                        _coarse_box(
+                            pending_box, self._ratios[level], self._shapes[level + 1]
+                        )
+                    )
+        if num_regions:
+            logger.info(
+                f"Rebuilt {num_regions} deferred region(s) of the coarser "
+                "pyramid levels from disk."
+            )
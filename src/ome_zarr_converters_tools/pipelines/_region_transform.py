@@ -0,0 +1,125 @@
+"""Lazily composed translations of the region starts of a RegionTable.
+
+Most registration steps only move regions: `remove_offsets` and the tiling
+shift them, and the FOV alignment copies the start of the reference region of
+each FOV. A `RegionTransform` records these moves without touching the table:
+the start of row `r` along axis column `a` is
+
+    base[source[r, a], a] + offset[r, a]
+
+where `base` are the starts when the transform was (last) applied. Shifts add
+to `offset`, copies gather `source` and `offset` from other rows, and row
+reorders permute both, so a chain of steps costs a few small array operations
+and the starts of the table are written once by `RegionTransform.apply`.
+Steps that need the actual coordinates of a few rows (the tiling reference
+regions) read them through the transform.
+"""
+
+from collections.abc import Mapping
+
+import numpy as np
+
+from ome_zarr_converters_tools.core._region_table import (
+    RegionTable,
+    _regions_from_columns,
+)
+from ome_zarr_converters_tools.core._tile_region import TileSlice
+
+# Source row of starts that are set to a constant (the offset)
+_CONSTANT = -1
+
+
+class RegionTransform:
+    """Pending translation of the starts of a RegionTable.
+
+    The table must only be modified through the transform until `apply` is
+    called, other changes to its starts or row order would be overwritten.
+    """
+
+    def __init__(self, table: RegionTable) -> None:
+        self.table = table
+        self._base = table.columns.starts
+        self._source: np.ndarray | None = None
+        self._offset: np.ndarray | None = None
+
+    @property
+    def is_identity(self) -> bool:
+        """Whether no move is pending."""
+        return self._source is None and self._offset is None
+
+    def _ensure_source(self) -> np.ndarray:
+        if self._source is None:
+            num_rows, num_axes = self._base.shape
+            self._source = np.repeat(np.arange(num_rows)[:, None], num_axes, axis=1)
+        return self._source
+
+    def _ensure_offset(self) -> np.ndarray:
+        if self._offset is None:
+            self._offset = np.zeros(self._base.shape)
+        return self._offset
+
+    def starts(self, rows: np.ndarray | None = None) -> np.ndarray:
+        """Current starts of `rows` (all rows if None), NaN where None.
+
+        The returned array must not be modified.
+        """
+        index = slice(None) if rows is None else rows
+        if self._source is None:
+            values = self._base[index]
+        else:
+            source = self._source[index]
+            values = np.take_along_axis(self._base, np.maximum(source, 0), axis=0)
+            values = np.where(source == _CONSTANT, 0.0, values)
+        if self._offset is not None:
+            values = values + self._offset[index]
+        return values
+
+    def shift(self, vector: Mapping[str, float | np.ndarray]) -> None:
+        """Move the regions by a delta per axis (a scalar or one per region).
+
+        Same semantics as `RegionTable.shift`.
+        """
+        columns = self.table.columns
+        for axis, delta in vector.items():
+            column = columns.axis_index(axis)
+            if column is not None:
+                self._ensure_offset()[:, column] += delta
+
+    def copy_starts(self, column: int, rows: np.ndarray, from_rows: np.ndarray) -> None:
+        """Set the start of `rows` along an axis to the one of `from_rows`.
+
+        Starts copied from a None start are set to 0.
+        """
+        missing = np.isnan(self.starts(from_rows)[:, column])
+        source, offset = self._ensure_source(), self._ensure_offset()
+        source[rows, column] = np.where(missing, _CONSTANT, source[from_rows, column])
+        offset[rows, column] = np.where(missing, 0.0, offset[from_rows, column])
+
+    def take(self, indices: np.ndarray) -> None:
+        """Reorder (or select) the regions by an integer index array."""
+        self.table.take(indices)
+        if self.is_identity:
+            self._base = self.table.columns.starts
+            return
+        self._source = self._ensure_source()[indices]
+        self._offset = self._ensure_offset()[indices]
+
+    def select(self, rows: np.ndarray) -> list[TileSlice]:
+        """Materialize only some regions at their current position."""
+        columns = self.table.columns.take(rows)
+        return _regions_from_columns(columns._replace(starts=self.starts(rows)))
+
+    def apply(self) -> None:
+        """Write the pending moves to the table (a no-op if there are none)."""
+        if self.is_identity:
+            return
+        self.table.set_coordinates(starts=self.starts())
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop the pending moves, and read the starts of the table again.
+
+        Call after modifying the table directly (once the moves are applied).
+        """
+        self._base = self.table.columns.starts
+        self._source = self._offset = None
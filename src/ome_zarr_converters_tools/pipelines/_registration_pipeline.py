@@ -3,11 +3,18 @@ from typing import Any, ParamSpec, Protocol, TypedDict
 
 from ome_zarr_converters_tools.core import TiledImage
 from ome_zarr_converters_tools.pipelines._alignment import (
+    align_to_pixel_grid_transform,
     apply_align_to_pixel_grid,
     apply_fov_alignment_corrections,
     apply_remove_offsets,
+    fov_alignment_corrections_transform,
+    remove_offsets_transform,
+)
+from ome_zarr_converters_tools.pipelines._region_transform import RegionTransform
+from ome_zarr_converters_tools.pipelines._tiling import (
+    apply_mosaic_tiling,
+    mosaic_tiling_transform,
 )
-from ome_zarr_converters_tools.pipelines._tiling import apply_mosaic_tiling
 
 P = ParamSpec("P")
 
@@ -32,6 +39,21 @@ _registration_registry: dict[str, Callable[..., TiledImage]] = {
     "tile_regions": apply_mosaic_tiling,
 }
 
+# Lazy versions of the built-in steps, composing their moves into a
+# RegionTransform. They are used only while the step name is still
+# registered to the built-in function.
+_transform_registry: dict[
+    str, tuple[Callable[..., TiledImage], Callable[..., None]]
+] = {
+    "align_to_pixel_grid": (apply_align_to_pixel_grid, align_to_pixel_grid_transform),
+    "fov_alignment_corrections": (
+        apply_fov_alignment_corrections,
+        fov_alignment_corrections_transform,
+    ),
+    "remove_offsets": (apply_remove_offsets, remove_offsets_transform),
+    "tile_regions": (apply_mosaic_tiling, mosaic_tiling_transform),
+}
+
 
 def add_registration_func(
     function: Callable[..., TiledImage],
@@ -55,13 +77,40 @@ def add_registration_func(
 def apply_registration_pipeline(
     tiled_image: TiledImage, pipeline_config: list[RegistrationStep]
 ) -> TiledImage:
+    """Run the registration steps on a TiledImage.
+
+    Consecutive built-in steps are composed into a single `RegionTransform`,
+    and the region starts are written once, at the end of the pipeline or
+    before a custom step (which gets the TiledImage with all the previous
+    steps applied).
+
+    Raises:
+        ValueError: If a step is not registered (before running any step).
+    """
     for step in pipeline_config:
         step_name = step.get("name")
-        step_params = step.get("params", {})
         if step_name not in _registration_registry:
             raise ValueError(f"Registration step '{step_name}' is not registered.")
+
+    transform: RegionTransform | None = None
+    for step in pipeline_config:
+        step_name = step["name"]
+        step_params = step.get("params", {})
         step_function = _registration_registry[step_name]
+        builtin_function, transform_function = _transform_registry.get(
+            step_name, (None, None)
+        )
+        if transform_function is not None and step_function is builtin_function:
+            if transform is None:
+                transform = RegionTransform(tiled_image.region_table)
+            transform_function(tiled_image, transform, **step_params)
+            continue
+        if transform is not None:
+            transform.apply()
+            transform = None
         tiled_image = step_function(tiled_image, **step_params)
+    if transform is not None:
+        transform.apply()
     return tiled_image
 
 
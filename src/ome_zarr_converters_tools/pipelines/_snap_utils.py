@@ -1,11 +1,13 @@
 """Utilities to validate a regular grid of tiles."""
 
-from itertools import product
+import math
+from collections.abc import Iterable, Iterator
 from typing import NamedTuple
 
 import numpy as np
 
 from ome_zarr_converters_tools.core import TileSlice
+from ome_zarr_converters_tools.core._region_table import RegionColumns, RegionTable
 
 
 class NotAGridError(Exception):
@@ -39,164 +41,315 @@ class GridSetup(NamedTuple):
     offset_y: float
 
 
-def tiles_to_boxes(tiles: list[TileSlice]) -> list[BBox]:
-    """Convert a list of TileSlice to a list of Box."""
-    if len(tiles) == 0:
+class GridLayout(NamedTuple):
+    """Regular grid fitted to the start positions of the tiles.
+
+    Attributes:
+        setup: Tile lengths and grid pitch along x and y.
+        origin_x: Smallest x start, the origin of the snapped grid.
+        origin_y: Smallest y start, the origin of the snapped grid.
+        index_x: Grid column of each tile.
+        index_y: Grid row of each tile.
+    """
+
+    setup: GridSetup
+    origin_x: float
+    origin_y: float
+    index_x: np.ndarray
+    index_y: np.ndarray
+
+
+# Default clustering tolerance, as a fraction of the tile length
+DEFAULT_GRID_TOLERANCE = 0.05
+# Default largest overlap of neighbouring grid columns, as a fraction of the
+# tile length, for which missing columns are inferred
+DEFAULT_MAX_OVERLAP = 0.5
+
+# Tiles keyed by name, or a RegionTable (keyed by the FOV names of its rows)
+NamedTiles = dict[str, TileSlice] | RegionTable
+
+
+def tile_names(tiles: NamedTiles) -> list[str]:
+    """Names of the tiles, in order."""
+    if isinstance(tiles, RegionTable):
+        columns = tiles.columns
+        return [columns.fov_names[code] for code in columns.fov_codes.tolist()]
+    return list(tiles)
+
+
+def _columns_to_box_array(columns: RegionColumns) -> np.ndarray:
+    """Read an (N, 4) array of x, y, x_len, y_len from region columns."""
+    if len(columns.fov_codes) == 0:
         raise ValueError("Tile list is empty, something went wrong.")
+    if not columns.is_pixel.all():
+        raise ValueError("Tiling is only supported for tiles in pixel coordinates.")
+    index_x, index_y = columns.axis_index("x"), columns.axis_index("y")
+    if index_x is None or index_y is None:
+        raise ValueError("Tiling requires all the tiles to have x and y slices.")
+    axes = [index_x, index_y]
+    boxes = np.concatenate((columns.starts[:, axes], columns.lengths[:, axes]), axis=1)
+    if not columns.present[:, axes].all() or np.isnan(boxes).any():
+        raise ValueError("Tiling requires all the tiles to have x and y slices.")
 
-    boxes = []
-    for tile in tiles:
-        roi = tile.roi
-        if roi.space == "world":
-            raise ValueError("Tiling is only supported for tiles in pixel coordinates.")
-        slice_x = tile.roi.get("x")
-        assert slice_x is not None
-        start_x = slice_x.start
-        length_x = slice_x.length
-        assert start_x is not None and length_x is not None
-
-        slice_y = tile.roi.get("y")
-        assert slice_y is not None
-        start_y = slice_y.start
-        length_y = slice_y.length
-        assert start_y is not None and length_y is not None
-        box = BBox(x=start_x, y=start_y, x_len=length_x, y_len=length_y)
-        boxes.append(box)
-
-    if len(boxes) <= 1:
-        return boxes
     # Consistency check: all boxes should have the same size
-    first_box = boxes[0]
-    len_x = [box.x_len for box in boxes[1:]]
-    len_y = [box.y_len for box in boxes[1:]]
-    if not np.allclose(len_x, first_box.x_len):
+    if not np.allclose(boxes[1:, 2], boxes[0, 2]):
         raise NotTilableError(
             "Tiling is not possible when tiles have different x length."
         )
-    if not np.allclose(len_y, first_box.y_len):
+    if not np.allclose(boxes[1:, 3], boxes[0, 3]):
         raise NotTilableError(
             "Tiling is not possible when tiles have different y length."
         )
     return boxes
 
 
-def check_if_regular_grid(tiles: list[TileSlice], eps: float = 1e-6) -> GridSetup:
-    """Find the grid size of a list of tiles."""
-    bboxes = tiles_to_boxes(tiles)
-    if len(tiles) == 1:
-        # Trivial case of a single tile
-        return GridSetup(
-            length_x=bboxes[0].x_len,
-            length_y=bboxes[0].y_len,
-            offset_x=1.0,
-            offset_y=1.0,
-        )
-    # Test 1: Check if all offsets are the same
-    pos_top_l_x = [box.x for box in bboxes]
-    pos_top_l_x = np.sort(pos_top_l_x)
-    offsets_x = np.diff(pos_top_l_x)
-    offsets_x = offsets_x[offsets_x > eps].tolist()
-
-    if len(offsets_x) == 0:
-        offset_x = 1.0
-    elif np.allclose(offsets_x, offsets_x[0]):
-        offset_x = offsets_x[0]
-    else:
-        # Not all offsets are the same
-        unique_offsets = np.unique(offsets_x)
-        raise NotAGridError(
-            "Cannot tile to a regular grid: not all x offsets are "
-            f"the same: {unique_offsets}"
-        )
-    pos_top_l_y = [box.y for box in bboxes]
-    pos_top_l_y = np.sort(pos_top_l_y)
-    offsets_y = np.diff(pos_top_l_y)
-    offsets_y = offsets_y[offsets_y > eps].tolist()
-    if len(offsets_y) == 0:
-        offset_y = 1.0
-    elif np.allclose(offsets_y, offsets_y[0]):
-        offset_y = offsets_y[0]
+def tiles_to_box_array(tiles: Iterable[TileSlice] | RegionTable) -> np.ndarray:
+    """Convert TileSlices to an (N, 4) array of x, y, x_len, y_len.
+
+    A RegionTable is read from its columns, without materializing TileSlices.
+    """
+    return _columns_to_box_array(RegionTable.from_regions(tiles).columns)
+
+
+def _tile_values(tiles: NamedTiles) -> list[TileSlice] | RegionTable:
+    return tiles if isinstance(tiles, RegionTable) else list(tiles.values())
+
+
+def tiles_to_boxes(tiles: list[TileSlice]) -> list[BBox]:
+    """Convert a list of TileSlice to a list of Box."""
+    return [BBox(*box) for box in tiles_to_box_array(tiles).tolist()]
+
+
+def _cluster_starts(values: np.ndarray, tolerance: float) -> np.ndarray:
+    """Cluster 1D values, splitting the sorted values at gaps above `tolerance`.
+
+    Returns:
+        The center (midrange) of each cluster, in increasing order.
+    """
+    sorted_values = np.sort(values)
+    is_gap = np.diff(sorted_values) > tolerance
+    first = np.flatnonzero(np.concatenate(([True], is_gap)))
+    last = np.flatnonzero(np.concatenate((is_gap, [True])))
+    centers: np.ndarray = (sorted_values[first] + sorted_values[last]) / 2
+    return centers
+
+
+def _fit_grid_axis(
+    values: np.ndarray,
+    length: float,
+    tolerance: float,
+    max_overlap: float,
+    axis: str,
+) -> tuple[float, np.ndarray]:
+    """Fit a regular grid to the starts along one axis.
+
+    Returns:
+        The pitch (1.0 for a single column) and the grid index of each value.
+        Missing columns are allowed if neighbouring columns overlap by at most
+        `max_overlap` times the tile `length`.
+
+    Raises:
+        NotAGridError: If a start is further than `tolerance` from the grid, or
+            if a missing column is inferred on a grid with more overlap.
+    """
+    centers = _cluster_starts(values, tolerance)
+    gaps = np.diff(centers)
+    if len(gaps) == 0:
+        pitch, intercept = 1.0, float(centers[0])
+        indices = np.zeros(len(values), dtype=int)
     else:
-        # Not all offsets are the same
-        unique_offsets = np.unique(offsets_y)
+        # The smallest gap is a first estimate of the pitch (gaps are
+        # multiples of it, more than one for missing columns). Refine it on
+        # all the gaps before counting the pitches of each gap, so that the
+        # jitter of the closest columns does not add up over long gaps.
+        steps = np.rint(gaps / gaps.min())
+        steps = np.maximum(np.rint(gaps / (gaps.sum() / steps.sum())), 1)
+        # Least squares fit of the cluster centers on their grid index
+        grid = np.concatenate(([0.0], np.cumsum(steps)))
+        slope, offset = np.polyfit(grid, centers, 1)
+        pitch, intercept = float(slope), float(offset)
+        # With a small pitch, a few starts at arbitrary positions fit a grid
+        # with missing columns: only infer missing columns on sparse grids.
+        if steps.max() > 1 and pitch <= (1 - max_overlap) * length:
+            raise NotAGridError(
+                f"Cannot tile to a regular grid: the {axis} starts leave "
+                f"missing columns on a grid of pitch {pitch}, with an overlap "
+                f"larger than {max_overlap} times the tile length {length}."
+            )
+        indices = np.rint((values - intercept) / pitch).astype(int)
+    residuals = np.abs(values - (intercept + indices * pitch))
+    if np.any(residuals > tolerance):
         raise NotAGridError(
-            "Cannot tile to a regular grid: not all y offsets are "
-            f"the same: {unique_offsets}"
+            f"Cannot tile to a regular grid: the {axis} starts deviate from a "
+            f"grid of pitch {pitch} by up to {residuals.max()} "
+            f"(tolerance {tolerance})."
         )
-    # Test 2: Check the edge case where the grid is slanted
-    if len(bboxes) > 2:
-        for bbox in bboxes[1:]:
-            slant_x = bbox.x - bboxes[0].x
-            slant_y = bbox.y - bboxes[0].y
-            if slant_x < eps or slant_y < eps:
-                # All good the grid is not slanted
-                break
-        else:
-            raise NotAGridError("Cannot tile to a regular grid: the grid is slanted.")
-    return GridSetup(
-        length_x=bboxes[0].x_len,
-        length_y=bboxes[0].y_len,
-        offset_x=offset_x,
-        offset_y=offset_y,
+    return pitch, indices
+
+
+def _fit_regular_grid(
+    boxes: np.ndarray, tolerance: float | None, max_overlap: float
+) -> GridLayout:
+    """Fit a regular grid to an (N, 4) box array (see `find_regular_grid`)."""
+    length_x, length_y = float(boxes[0, 2]), float(boxes[0, 3])
+    tolerance_x = DEFAULT_GRID_TOLERANCE * length_x if tolerance is None else tolerance
+    tolerance_y = DEFAULT_GRID_TOLERANCE * length_y if tolerance is None else tolerance
+    pitch_x, index_x = _fit_grid_axis(
+        boxes[:, 0], length_x, tolerance_x, max_overlap, "x"
     )
+    pitch_y, index_y = _fit_grid_axis(
+        boxes[:, 1], length_y, tolerance_y, max_overlap, "y"
+    )
+    # Check the edge case where the grid is slanted: some tile must share the
+    # row or the column of the first tile, or lie before it.
+    if len(boxes) > 2 and not np.any(
+        (index_x[1:] <= index_x[0]) | (index_y[1:] <= index_y[0])
+    ):
+        raise NotAGridError("Cannot tile to a regular grid: the grid is slanted.")
+    return GridLayout(
+        setup=GridSetup(
+            length_x=length_x,
+            length_y=length_y,
+            offset_x=pitch_x,
+            offset_y=pitch_y,
+        ),
+        origin_x=float(boxes[:, 0].min()),
+        origin_y=float(boxes[:, 1].min()),
+        index_x=index_x,
+        index_y=index_y,
+    )
+
+
+def find_regular_grid(
+    tiles: list[TileSlice] | RegionTable,
+    tolerance: float | None = None,
+    max_overlap: float = DEFAULT_MAX_OVERLAP,
+) -> GridLayout:
+    """Fit a regular grid to the tiles and find the grid index of every tile.
+
+    The x and y starts are clustered into grid columns and rows, splitting at
+    gaps larger than `tolerance`. The smallest gap between clusters, refined on
+    all the gaps, gives the grid index of every cluster, the pitch is then
+    fitted to all the clusters, and every tile must lie within `tolerance` of
+    its grid position. Missing columns (gaps of several pitches) are only
+    inferred if neighbouring columns overlap by at most `max_overlap` times the
+    tile length: on denser grids, a few arbitrary starts would fit as well.
+
+    Args:
+        tiles: Tiles in pixel coordinates, all with the same size.
+        tolerance: Maximum stage jitter, in pixels. Defaults to
+            `DEFAULT_GRID_TOLERANCE` times the tile length.
+        max_overlap: Largest overlap of neighbouring columns, as a fraction of
+            the tile length, for which missing columns are inferred.
+
+    Raises:
+        NotAGridError: If the tiles are not arranged in a regular grid.
+    """
+    return _fit_regular_grid(tiles_to_box_array(tiles), tolerance, max_overlap)
+
+
+def check_if_regular_grid(
+    tiles: list[TileSlice] | RegionTable,
+    tolerance: float | None = None,
+    max_overlap: float = DEFAULT_MAX_OVERLAP,
+) -> GridSetup:
+    """Find the grid size of a list of tiles (see `find_regular_grid`)."""
+    return find_regular_grid(tiles, tolerance=tolerance, max_overlap=max_overlap).setup
 
 
 def calculate_snap_to_grid_offset(
-    tiles: dict[str, TileSlice],
+    tiles: NamedTiles,
+    tolerance: float | None = None,
+    max_overlap: float = DEFAULT_MAX_OVERLAP,
 ) -> dict[str, dict[str, float]]:
-    """Remove overlap from a list of tiles by snapping them to a regular grid."""
-    grid_setup = check_if_regular_grid(list(tiles.values()))
-    offsets = {}
-    for name, tile in tiles.items():
-        # Find the x grid position
-        slice_x = tile.roi.get("x")
-        assert slice_x is not None
-        x = slice_x.start
-        assert x is not None
-        x_grid = (x / grid_setup.offset_x) * grid_setup.length_x
-        # Find the y grid position
-        slice_y = tile.roi.get("y")
-        assert slice_y is not None
-        y = slice_y.start
-        assert y is not None
-        x_grid = (x / grid_setup.offset_x) * grid_setup.length_x
-        y_grid = (y / grid_setup.offset_y) * grid_setup.length_y
-        # Store the new start positions
-        offsets[name] = {"x": x_grid - x, "y": y_grid - y}
-    return offsets
+    """Remove overlap from a list of tiles by snapping them to a regular grid.
 
+    Each tile is moved to its grid position (see `find_regular_grid`), with
+    the grid pitch replaced by the tile length.
+    """
+    boxes = tiles_to_box_array(_tile_values(tiles))
+    layout = _fit_regular_grid(boxes, tolerance, max_overlap)
+    setup = layout.setup
+    x_grid = (layout.origin_x / setup.offset_x + layout.index_x) * setup.length_x
+    y_grid = (layout.origin_y / setup.offset_y + layout.index_y) * setup.length_y
+    offsets_x = (x_grid - boxes[:, 0]).tolist()
+    offsets_y = (y_grid - boxes[:, 1]).tolist()
+    return {
+        name: {"x": offset_x, "y": offset_y}
+        for name, offset_x, offset_y in zip(
+            tile_names(tiles), offsets_x, offsets_y, strict=True
+        )
+    }
 
-def _build_perfect_grid_points(
-    length_x: float, length_y: float, num_x: int, num_y: int
-) -> list[GripPoint]:
-    """Build a grid of points given the grid size and number of points."""
-    grid_points = []
-    for i, j in product(range(num_x), range(num_y)):
-        point = GripPoint(x=i * length_x, y=j * length_y)
-        grid_points.append(point)
-    return grid_points
+
+def _ring_cells(
+    center_i: int, center_j: int, radius: int, size: int
+) -> Iterator[tuple[int, int]]:
+    """Grid indices at Chebyshev distance `radius` from the center, in the grid.
+
+    Cells are yielded in the order of the perfect grid (i major).
+    """
+    if radius == 0:
+        yield center_i, center_j
+        return
+    i_low, i_high = center_i - radius, center_i + radius
+    j_low, j_high = center_j - radius, center_j + radius
+    for i in range(max(i_low, 0), min(i_high, size - 1) + 1):
+        if i == i_low or i == i_high:
+            yield from ((i, j) for j in range(max(j_low, 0), min(j_high, size - 1) + 1))
+        else:
+            yield from ((i, j) for j in (j_low, j_high) if 0 <= j < size)
 
 
 def calculate_snap_to_corner_offset(
-    tiles: dict[str, TileSlice],
+    tiles: NamedTiles,
 ) -> dict[str, dict[str, float]]:
-    """Remove overlap from a list of tiles by snapping them to a regular grid."""
-    boxes = tiles_to_boxes(list(tiles.values()))
-    len_x, len_y = boxes[0].x_len, boxes[0].y_len  # Length consistency already checked
-    num_x, num_y = len(tiles), len(tiles)  # Upper buound to the number of tiles
-    perfect_grid = _build_perfect_grid_points(len_x, len_y, num_x, num_y)
+    """Remove overlap from a list of tiles by snapping them to a regular grid.
+
+    The perfect grid has `len(tiles)` points per axis, spaced by the tile size.
+    In order, each tile is moved to the closest grid point not taken by a
+    previous tile (ties go to the lowest x, then y, index).
+
+    The closest free point is searched in rings of grid cells around the
+    tile, stopping as soon as no cell of the next ring can be closer than the
+    best point found.
+    """
+    boxes = tiles_to_box_array(_tile_values(tiles))
+    # Length consistency already checked
+    len_x, len_y = float(boxes[0, 2]), float(boxes[0, 3])
+    size = len(boxes)  # Upper bound to the number of grid points per axis
+    starts = boxes[:, :2]
+    grid_starts = starts / np.array([len_x, len_y])
+    centers = np.clip(np.rint(grid_starts), 0, size - 1).astype(int)
+    # Distance (in grid cells) from each tile to its center cell
+    center_distances = np.abs(grid_starts - centers)
+
+    taken: set[tuple[int, int]] = set()
     offsets = {}
-    for name, box in zip(tiles.keys(), boxes, strict=True):
-        min_distance = float("inf")
-        min_id = -1
-        for i, point in enumerate(perfect_grid):
-            distance = np.sqrt((box.x - point.x) ** 2 + (box.y - point.y) ** 2)
-            if distance < min_distance:
-                min_distance = distance
-                min_id = i
-                offsets[name] = {"x": point.x - box.x, "y": point.y - box.y}
-        # remove the used point from the perfect grid
-        if min_id == -1:
+    for name, (x, y), (center_i, center_j), (dist_i, dist_j) in zip(
+        tile_names(tiles),
+        starts.tolist(),
+        centers.tolist(),
+        center_distances.tolist(),
+        strict=True,
+    ):
+        best: tuple[float, int, int] | None = None
+        for radius in range(size):
+            # No cell of this ring is closer than this bound
+            bound = min(
+                len_x * max(radius - dist_i, 0), len_y * max(radius - dist_j, 0)
+            )
+            if best is not None and bound > best[0]:
+                break
+            for i, j in _ring_cells(center_i, center_j, radius, size):
+                if (i, j) in taken:
+                    continue
+                distance = math.sqrt((x - i * len_x) ** 2 + (y - j * len_y) ** 2)
+                if best is None or (distance, i, j) < best:
+                    best = (distance, i, j)
+        if best is None:
             raise ValueError("Could not find a matching point in the perfect grid.")
-        perfect_grid.pop(min_id)
+        _, i, j = best
+        taken.add((i, j))
+        offsets[name] = {"x": i * len_x - x, "y": j * len_y - y}
     return offsets
@@ -1,33 +1,40 @@
-from ome_zarr_converters_tools.core._roi_utils import move_roi_by
-from ome_zarr_converters_tools.core._tile_region import TiledImage, TileSlice
+from collections.abc import Sequence
+
+import numpy as np
+
+from ome_zarr_converters_tools.core._region_table import RegionColumns, RegionTable
+from ome_zarr_converters_tools.core._tile_region import TiledImage
 from ome_zarr_converters_tools.models import TilingMode
+from ome_zarr_converters_tools.pipelines._region_transform import RegionTransform
 from ome_zarr_converters_tools.pipelines._snap_utils import (
+    NamedTiles,
     NotAGridError,
     calculate_snap_to_corner_offset,
     calculate_snap_to_grid_offset,
+    tile_names,
 )
 
 
 def _no_tiling(
-    regions: dict[str, TileSlice],
+    regions: NamedTiles,
 ) -> dict[str, dict[str, float]]:
-    return {key: {"x": 0.0, "y": 0.0} for key in regions.keys()}
+    return {key: {"x": 0.0, "y": 0.0} for key in tile_names(regions)}
 
 
 def _snap_to_corners_tiling(
-    regions: dict[str, TileSlice],
+    regions: NamedTiles,
 ) -> dict[str, dict[str, float]]:
     return calculate_snap_to_corner_offset(regions)
 
 
 def _snap_to_grid_tiling(
-    regions: dict[str, TileSlice],
+    regions: NamedTiles,
 ) -> dict[str, dict[str, float]]:
     return calculate_snap_to_grid_offset(regions)
 
 
 def _auto_tiling(
-    regions: dict[str, TileSlice],
+    regions: NamedTiles,
 ) -> dict[str, dict[str, float]]:
     try:
         return _snap_to_grid_tiling(regions)
@@ -36,7 +43,7 @@ def _auto_tiling(
 
 
 def _find_tiling(
-    regions: dict[str, TileSlice],
+    regions: NamedTiles,
     tiling_mode: TilingMode,
 ) -> dict[str, dict[str, float]]:
     if tiling_mode == TilingMode.INPLACE or tiling_mode == TilingMode.NO_TILING:
@@ -52,12 +59,48 @@ def _find_tiling(
     raise ValueError(f"Tiling mode '{tiling_mode}' is not recognized.")
 
 
-def _tile_regions(
-    regions: list[TileSlice], vector: dict[str, float]
-) -> list[TileSlice]:
-    for region in regions:
-        region.roi = move_roi_by(region.roi, vector)
-    return regions
+def _reference_rows(
+    columns: RegionColumns, starts: np.ndarray, axes: Sequence[str]
+) -> np.ndarray:
+    """Per FOV code, the first region closest to the origin (`ref_slice`)."""
+    distance = np.zeros(len(columns.fov_codes))
+    for axis in axes:
+        column = columns.axis_index(axis)
+        if column is None:
+            raise ValueError(f"Regions have no slice along axis '{axis}'.")
+        distance += starts[:, column] ** 2
+    distance = np.sqrt(distance)
+    rows = np.lexsort((np.arange(len(distance)), distance, columns.fov_codes))
+    is_first = np.ones(len(rows), dtype=bool)
+    is_first[1:] = columns.fov_codes[rows[1:]] != columns.fov_codes[rows[:-1]]
+    return rows[is_first]
+
+
+def mosaic_tiling_transform(
+    tiled_image: TiledImage,
+    transform: RegionTransform,
+    tiling_mode: TilingMode,
+) -> None:
+    """Lazy `apply_mosaic_tiling`, composed into `transform`."""
+    table = transform.table
+    transform.take(table.fov_order())
+    if len(table) == 0 or tiling_mode in (TilingMode.INPLACE, TilingMode.NO_TILING):
+        # No offsets to apply, skip materializing the reference regions.
+        return
+    columns = table.columns
+    ref_rows = _reference_rows(columns, transform.starts(), tiled_image.axes)
+    reference_regions = RegionTable.from_columns(
+        columns.take(ref_rows)._replace(starts=transform.starts(ref_rows))
+    )
+
+    tiling_instructions = _find_tiling(reference_regions, tiling_mode)
+    vector = {}
+    for axis in {ax for offset in tiling_instructions.values() for ax in offset}:
+        offsets = np.array(
+            [tiling_instructions[name].get(axis, 0.0) for name in columns.fov_names]
+        )
+        vector[axis] = offsets[columns.fov_codes]
+    transform.shift(vector)
 
 
 def apply_mosaic_tiling(
@@ -66,24 +109,16 @@ def apply_mosaic_tiling(
 ) -> TiledImage:
     """Tile all the TiledImages to the reference region of the first TiledImage.
 
-    This function modifies the TiledImages in place.
+    This function modifies the TiledImages in place. The reference region
+    of each FOV is read from the columns of the region table, and the
+    offsets are applied to the columns, without materializing TileSlices.
 
     Args:
         tiled_image: TiledImage model to tile.
         tiling_mode: Tiling mode to use.
 
     """
-    fov_tiles = tiled_image.group_by_fov()
-
-    reference_regions = {}
-    for fov_tile in fov_tiles:
-        reference_regions[fov_tile.fov_name] = fov_tile.ref_slice()
-
-    tiling_instructions = _find_tiling(reference_regions, tiling_mode)
-    aligned_regions = []
-    for fov_tile in fov_tiles:
-        instruction = tiling_instructions[fov_tile.fov_name]
-        tiled = _tile_regions(fov_tile.regions, instruction)
-        aligned_regions.extend(tiled)
-    tiled_image.regions = aligned_regions
+    transform = RegionTransform(tiled_image.region_table)
+    mosaic_tiling_transform(tiled_image, transform, tiling_mode)
+    transform.apply()
     return tiled_image
@@ -1,29 +1,88 @@
+import math
 import time
+from functools import partial
 from logging import getLogger
-from typing import Any
+from typing import Any, NamedTuple
 
-from ngio import Image
+import numpy as np
+from ngio import Image, Roi
 
+from ome_zarr_converters_tools.core._dask_lazy_loader import (
+    RegionsCompositionPlan,
+    aligned_chunks,
+    composite_chunk,
+    intersect_bounds,
+    local_slices,
+    plan_regions_composition,
+)
 from ome_zarr_converters_tools.core._tile_region import TiledImage
-from ome_zarr_converters_tools.models import WriterMode
+from ome_zarr_converters_tools.models import WriterMode, WriterOptions
+from ome_zarr_converters_tools.pipelines._parallel_writing import (
+    prefetch_loads,
+    process_tile_writing,
+    region_pixel_slices,
+    threaded_tile_writing,
+)
 
 logger = getLogger(__name__)
 
 
+def _dask_chunks_for_roi(
+    roi: Roi,
+    shape: tuple[int, ...],
+    tiled_image: TiledImage,
+    chunks: tuple[int, ...] | None,
+) -> tuple[tuple[int, ...], ...] | None:
+    """Dask chunks mapping one-to-one onto the output zarr chunks of a ROI.
+
+    Args:
+        roi: ROI (in pixel coordinates) that the dask array will be written to.
+        shape: Shape of the dask array.
+        tiled_image: The TiledImage being written.
+        chunks: Chunk size of the output zarr array, or None to let the
+            loader choose.
+    """
+    if chunks is None:
+        return None
+    roi_slice = roi.to_slicing_dict(pixel_size=tiled_image.pixel_size)
+    origin = tuple(math.floor(roi_slice[axis].start) for axis in tiled_image.axes)
+    return aligned_chunks(origin, shape, chunks)
+
+
 def sequential_tile_writing(
-    tiled_image: TiledImage, image: Image, resource: Any
+    tiled_image: TiledImage,
+    image: Image,
+    resource: Any,
+    writer_options: WriterOptions | None = None,
 ) -> None:
     """Write tiles sequentially to the OME-Zarr image.
 
     For each region in the TiledImage, load the data and write it to the
-    corresponding ROI in the OME-Zarr image.
+    corresponding ROI in the OME-Zarr image. With `writer_options.prefetch`,
+    the next tiles are loaded on a background thread while one is written.
     """
-    regions = tiled_image.regions
+    writer_options = writer_options or WriterOptions()
+    regions = list(tiled_image.regions)
     num_regions = len(regions)
-    logger.info(f"Starting sequential tile writing - Number of tiles: {num_regions}.")
+    logger.info(
+        f"Starting sequential tile writing - Number of tiles: {num_regions}, "
+        f"prefetch: {writer_options.prefetch}."
+    )
+    loads = [
+        partial(region.load_data, axes=tiled_image.axes, resource=resource)
+        for region in regions
+    ]
+    nbytes = [0] * num_regions
+    if writer_options.prefetch:
+        itemsize = np.dtype(tiled_image.data_type).itemsize
+        for idx, region in enumerate(regions):
+            slicing = region_pixel_slices(region, tiled_image)
+            nbytes[idx] = itemsize * math.prod(sl.stop - sl.start for sl in slicing)
     timer = time.time()
-    for idx, region in enumerate(regions):
-        region_data = region.load_data(axes=tiled_image.axes, resource=resource)
+    data_iter = prefetch_loads(
+        loads, nbytes, writer_options.prefetch, writer_options.max_buffer_mb * 1024**2
+    )
+    for idx, (region, region_data) in enumerate(zip(regions, data_iter, strict=True)):
         image.set_roi(roi=region.roi, patch=region_data)
         if idx == 0:
             elapsed = time.time() - timer
@@ -34,38 +93,55 @@ def sequential_tile_writing(
 
 
 def dask_parallel_tile_writing(
-    tiled_image: TiledImage, image: Image, resource: Any
+    tiled_image: TiledImage,
+    image: Image,
+    resource: Any,
+    chunks: tuple[int, ...] | None = None,
 ) -> None:
     """Write tiles in memory to the OME-Zarr image using Dask.
 
     For each region in the TiledImage, load the data and write it to the
-    corresponding ROI in the OME-Zarr image.
+    corresponding ROI in the OME-Zarr image. If `chunks` (the output zarr
+    chunk size) is given, every dask task produces exactly one zarr chunk.
     """
     logger.info("Starting Dask in-memory writing.")
     timer = time.time()
-    full_image = tiled_image.load_data_dask(resource=resource)
     roi = tiled_image.roi()
+    dask_chunks = _dask_chunks_for_roi(roi, tiled_image.shape(), tiled_image, chunks)
+    full_image = tiled_image.load_data_dask(resource=resource, chunks=dask_chunks)
     image.set_roi(roi=roi, patch=full_image)
     elapsed = time.time() - timer
     logger.info(f"Elapsed time for Dask in-memory writing: {elapsed:.2f} seconds.")
 
 
 def sequential_fov_writing(
-    tiled_image: TiledImage, image: Image, resource: Any
+    tiled_image: TiledImage,
+    image: Image,
+    resource: Any,
+    writer_options: WriterOptions | None = None,
 ) -> None:
     """Write tiles sequentially to the OME-Zarr image.
 
-    For each region in the TiledImage, load the data and write it to the
-    corresponding ROI in the OME-Zarr image.
+    For each FOV group in the TiledImage, load the data and write it to the
+    corresponding ROI in the OME-Zarr image. With `writer_options.prefetch`,
+    the next FOVs are loaded on a background thread while one is written.
     """
+    writer_options = writer_options or WriterOptions()
     groups = tiled_image.group_by_fov()
     num_groups = len(groups)
-    logger.info(f"Starting sequential FOV writing - Number of FOVs: {num_groups}.")
+    logger.info(
+        f"Starting sequential FOV writing - Number of FOVs: {num_groups}, "
+        f"prefetch: {writer_options.prefetch}."
+    )
+    itemsize = np.dtype(tiled_image.data_type).itemsize
+    loads = [partial(group.load_data, resource=resource) for group in groups]
+    nbytes = [itemsize * math.prod(group.shape()) for group in groups]
     timer = time.time()
-    for idx, group in enumerate(groups):
-        roi = group.roi()
-        group_data = group.load_data(resource=resource)
-        image.set_roi(roi=roi, patch=group_data)
+    data_iter = prefetch_loads(
+        loads, nbytes, writer_options.prefetch, writer_options.max_buffer_mb * 1024**2
+    )
+    for idx, (group, group_data) in enumerate(zip(groups, data_iter, strict=True)):
+        image.set_roi(roi=group.roi(), patch=group_data)
         if idx == 0:
             elapsed = time.time() - timer
             estimated_total = elapsed * num_groups
@@ -75,12 +151,16 @@ def sequential_fov_writing(
 
 
 def dask_parallel_fov_writing(
-    tiled_image: TiledImage, image: Image, resource: Any
+    tiled_image: TiledImage,
+    image: Image,
+    resource: Any,
+    chunks: tuple[int, ...] | None = None,
 ) -> None:
     """Write tiles in parallel to the OME-Zarr image using Dask.
 
     For each region in the TiledImage, load the data and write it to the
-    corresponding ROI in the OME-Zarr image.
+    corresponding ROI in the OME-Zarr image. If `chunks` (the output zarr
+    chunk size) is given, the dask chunks of each FOV are aligned to it.
     """
     groups = tiled_image.group_by_fov()
     num_groups = len(groups)
@@ -88,7 +168,8 @@ def dask_parallel_fov_writing(
     timer = time.time()
     for idx, group in enumerate(groups):
         roi = group.roi()
-        group_data = group.load_data_dask(resource=resource)
+        dask_chunks = _dask_chunks_for_roi(roi, group.shape(), tiled_image, chunks)
+        group_data = group.load_data_dask(resource=resource, chunks=dask_chunks)
         image.set_roi(roi=roi, patch=group_data)
         if idx == 0:
             elapsed = time.time() - timer
@@ -99,6 +180,128 @@ def dask_parallel_fov_writing(
             )
 
 
+class ChunkWriteStats(NamedTuple):
+    """Write statistics of the chunk-partitioned writer.
+
+    Attributes:
+        num_chunks_written: Number of chunks written (each exactly once).
+        num_tile_chunk_writes: Number of chunk writes a tile-by-tile writer
+            would issue (one per tile and chunk it touches).
+    """
+
+    num_chunks_written: int
+    num_tile_chunk_writes: int
+
+    @property
+    def write_amplification_avoided(self) -> float:
+        """Chunk writes tile by tile per chunk write of the planner."""
+        if self.num_chunks_written == 0:
+            return 1.0
+        return self.num_tile_chunk_writes / self.num_chunks_written
+
+
+def plan_chunk_writes(
+    regions_slices: list[tuple[slice, ...]],
+    shape: tuple[int, ...],
+    chunks: tuple[int, ...],
+) -> tuple[RegionsCompositionPlan, ChunkWriteStats]:
+    """Invert the tile→chunk mapping into a chunk→tiles write plan.
+
+    Args:
+        regions_slices: Pixel slicing of every tile, in writing order.
+        shape: Shape of the image.
+        chunks: Chunk size of the image.
+
+    Returns:
+        The composition plan (tiles contributing to each chunk, with fully
+        occluded tiles culled) and the write statistics.
+    """
+    plan = plan_regions_composition(regions_slices, shape, chunks)
+    num_chunks_written = int(np.count_nonzero(np.diff(plan.overlap_index.indptr)))
+    stats = ChunkWriteStats(
+        num_chunks_written=num_chunks_written,
+        num_tile_chunk_writes=plan.stats.num_overlaps,
+    )
+    return plan, stats
+
+
+def chunk_writing(
+    tiled_image: TiledImage,
+    image: Image,
+    resource: Any,
+    chunks: tuple[int, ...] | None = None,
+) -> None:
+    """Write the OME-Zarr image one chunk at a time, each chunk exactly once.
+
+    Every output chunk is assembled in memory from the tiles touching it
+    (last tile wins) and written once, so chunks shared by several tiles are
+    never read back and rewritten. A tile is loaded once and kept until all
+    its chunks are written, unless its loader supports region loading, in
+    which case only the part inside each chunk is read. Chunks are written
+    XY-major: all the chunks of an XY chunk position (along z, c and t) are
+    written in a row, then the next position in row order. Every tile is then
+    dropped once its last XY chunk position is done, so up to about one row
+    of tiles (with all their planes) is kept in memory.
+    """
+    if chunks is None:
+        chunks = tuple(image.chunks)
+    regions = list(tiled_image.regions)
+    axes = tiled_image.axes
+    regions_slices = [region_pixel_slices(region, tiled_image) for region in regions]
+    plan, stats = plan_chunk_writes(regions_slices, tiled_image.shape(), chunks)
+    logger.info(
+        f"Starting chunk writing - Number of chunks: {stats.num_chunks_written}, "
+        f"instead of {stats.num_tile_chunk_writes} partial chunk writes tile by "
+        "tile (write amplification avoided: "
+        f"{stats.write_amplification_avoided:.2f}x)."
+    )
+    timer = time.time()
+    indptr, loader_ids, grid_shape = plan.overlap_index
+    dtype = np.dtype(tiled_image.data_type)
+    # Chunks still to be written per tile: a loaded tile is dropped at zero.
+    remaining = np.bincount(loader_ids, minlength=len(regions)).tolist()
+    loaded: dict[int, np.ndarray] = {}
+    chunks_linear = np.flatnonzero(np.diff(indptr))
+    grid_index = np.unravel_index(chunks_linear, grid_shape)
+    # Sort by y, then x, then the other axes (the last lexsort key is primary).
+    xy_axes = [axes.index(ax) for ax in ("y", "x") if ax in axes]
+    order_axes = xy_axes + [i for i in range(len(axes)) if i not in xy_axes]
+    order = np.lexsort([grid_index[i] for i in reversed(order_axes)])
+    for chunk_linear in chunks_linear[order].tolist():
+        chunk_idx = np.unravel_index(chunk_linear, grid_shape)
+        chunk_bounds = tuple(
+            plan.chunk_ranges[ax][int(idx)] for ax, idx in enumerate(chunk_idx)
+        )
+        loader_args: list = []
+        for li in loader_ids[indptr[chunk_linear] : indptr[chunk_linear + 1]].tolist():
+            region = regions[li]
+            bounds = tuple((sl.start, sl.stop) for sl in regions_slices[li])
+            if region.image_loader.supports_region_loading(resource):
+                inter = intersect_bounds(chunk_bounds, bounds)
+                data = region.load_region(
+                    local_slices(inter, bounds), axes=axes, resource=resource
+                )
+                loader_args.extend((data, inter))
+                continue
+            if li not in loaded:
+                loaded[li] = region.load_data(axes=axes, resource=resource)
+            loader_args.extend((loaded[li], bounds))
+            remaining[li] -= 1
+            if remaining[li] == 0:
+                del loaded[li]
+        chunk_data = composite_chunk(chunk_bounds, dtype, 0, *loader_args)
+        image.set_array(
+            patch=chunk_data,
+            axes_order=axes,
+            **{
+                axis: slice(start, stop)
+                for axis, (start, stop) in zip(axes, chunk_bounds, strict=True)
+            },
+        )
+    elapsed = time.time() - timer
+    logger.info(f"Elapsed time for chunk writing: {elapsed:.2f} seconds.")
+
+
 def in_memory_writing(tiled_image: TiledImage, image: Image, resource: Any) -> None:
     """Write tiles in memory to the OME-Zarr image.
 
@@ -120,18 +323,50 @@ def write_to_zarr(
     tiled_image: TiledImage,
     resource: Any | None,
     writer_mode: WriterMode,
+    chunks: tuple[int, ...] | None = None,
+    writer_options: WriterOptions | None = None,
 ) -> None:
     if writer_mode == WriterMode.BY_TILE:
-        sequential_tile_writing(tiled_image=tiled_image, image=image, resource=resource)
+        sequential_tile_writing(
+            tiled_image=tiled_image,
+            image=image,
+            resource=resource,
+            writer_options=writer_options,
+        )
     elif writer_mode == WriterMode.BY_TILE_DASK:
         dask_parallel_tile_writing(
-            tiled_image=tiled_image, image=image, resource=resource
+            tiled_image=tiled_image, image=image, resource=resource, chunks=chunks
         )
     elif writer_mode == WriterMode.BY_FOV:
-        sequential_fov_writing(tiled_image=tiled_image, image=image, resource=resource)
+        sequential_fov_writing(
+            tiled_image=tiled_image,
+            image=image,
+            resource=resource,
+            writer_options=writer_options,
+        )
     elif writer_mode == WriterMode.BY_FOV_DASK:
         dask_parallel_fov_writing(
-            tiled_image=tiled_image, image=image, resource=resource
+            tiled_image=tiled_image, image=image, resource=resource, chunks=chunks
+        )
+    elif writer_mode == WriterMode.BY_TILE_THREADS:
+        threaded_tile_writing(
+            tiled_image=tiled_image,
+            image=image,
+            resource=resource,
+            chunks=chunks,
+            writer_options=writer_options,
+        )
+    elif writer_mode == WriterMode.BY_TILE_PROCESSES:
+        process_tile_writing(
+            tiled_image=tiled_image,
+            image=image,
+            resource=resource,
+            chunks=chunks,
+            writer_options=writer_options,
+        )
+    elif writer_mode == WriterMode.BY_CHUNK:
+        chunk_writing(
+            tiled_image=tiled_image, image=image, resource=resource, chunks=chunks
         )
     elif writer_mode == WriterMode.IN_MEMORY:
         in_memory_writing(tiled_image=tiled_image, image=image, resource=resource)
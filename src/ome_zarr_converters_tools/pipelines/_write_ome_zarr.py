@@ -1,29 +1,43 @@
+from collections.abc import Sequence
 from logging import getLogger
-from typing import Any
+from typing import Any, cast
 
+import numcodecs
+import numpy as np
 import polars as pl
 import zarr
 from ngio import (
+    Image,
     OmeZarrContainer,
     PixelSize,
-    RoiSlice,
     create_empty_ome_zarr,
     open_ome_zarr_container,
 )
 from ngio.ome_zarr_meta import Channel, ChannelVisualisation
 from ngio.tables import ConditionTable, RoiTable
+from zarr.codecs import BloscCname, BloscCodec, BloscShuffle, ZstdCodec
 
+from ome_zarr_converters_tools.core._region_table import RegionTable
 from ome_zarr_converters_tools.core._tile_region import (
     AttributeType,
     TiledImage,
     TileSlice,
 )
 from ome_zarr_converters_tools.models import (
+    CompressionOptions,
+    CompressorType,
     ConverterOptions,
+    NoSharding,
     OmeZarrOptions,
     OverwriteMode,
+    ShuffleType,
     WriterMode,
 )
+from ome_zarr_converters_tools.pipelines._channel_histogram import (
+    ChannelHistogram,
+    HistogramWriter,
+)
+from ome_zarr_converters_tools.pipelines._pyramid import FusedPyramidWriter
 from ome_zarr_converters_tools.pipelines._to_zarr import write_to_zarr
 
 logger = getLogger(__name__)
@@ -33,53 +47,112 @@ def _compute_chunk_size(
     tiled_image: TiledImage, ome_zarr_options: OmeZarrOptions
 ) -> tuple[int, ...]:
     """Compute the chunk size for the tiled image."""
-    axes = tiled_image.axes
-    chunks_strategy = ome_zarr_options.chunks
     fov_regions = tiled_image.group_by_fov()[0]
-    fov_shape = fov_regions.shape()
-    chunks = []
-    for ax, fov_sh in zip(axes, fov_shape, strict=True):
+    return ome_zarr_options.chunks.get_chunks(
+        axes=list(tiled_image.axes),
+        fov_shape=tuple(fov_regions.shape()),
+        shape=tuple(tiled_image.shape()),
+        itemsize=np.dtype(tiled_image.data_type).itemsize,
+    )
+
+
+def _compute_shard_size(
+    tiled_image: TiledImage,
+    ome_zarr_options: OmeZarrOptions,
+    chunks: tuple[int, ...],
+) -> tuple[int, ...] | None:
+    """Compute the shard size for the tiled image, or None without sharding.
+
+    ngio clips the chunk and shard sizes to the shape of every pyramid level,
+    and a clipped shard must remain a whole number of chunks: the shard size
+    is reduced along an axis if some level would break this.
+    """
+    sharding_strategy = ome_zarr_options.sharding
+    if isinstance(sharding_strategy, NoSharding):
+        return None
+    axes = tiled_image.axes
+    fov_shape = tiled_image.group_by_fov()[0].shape()
+    shards = []
+    for ax, fov_sh, chunk in zip(axes, fov_shape, chunks, strict=True):
         if ax == "x" or ax == "y":
-            chunks.append(chunks_strategy.get_xy_chunk(fov_sh))
+            shards.append(sharding_strategy.get_xy_shard(fov_sh, chunk))
         elif ax == "z":
-            chunks.append(chunks_strategy.z_chunk)
+            shards.append(chunk * sharding_strategy.z_chunks)
         elif ax == "c":
-            chunks.append(chunks_strategy.c_chunk)
+            shards.append(chunk * sharding_strategy.c_chunks)
         elif ax == "t":
-            chunks.append(chunks_strategy.t_chunk)
+            shards.append(chunk * sharding_strategy.t_chunks)
         else:
-            logger.warning(f"Unknown axis '{ax}' encountered. Setting chunk size to 1.")
-            chunks.append(1)
-    return tuple(chunks)
+            shards.append(chunk)
+
+    shape = tiled_image.shape()
+    for i, ax in enumerate(axes):
+        num_levels = ome_zarr_options.num_levels if ax in ("x", "y") else 1
+        requested = shards[i]
+        for level in range(num_levels):
+            level_size = shape[i] // 2**level
+            if chunks[i] <= level_size < shards[i] and level_size % chunks[i]:
+                shards[i] = level_size // chunks[i] * chunks[i]
+        if shards[i] != requested:
+            logger.warning(
+                f"Reducing the shard size along '{ax}' from {requested} to "
+                f"{shards[i]} to fit the pyramid levels."
+            )
+    return tuple(shards)
+
+
+def _build_compressors(compression: CompressionOptions, zarr_format: int) -> Any:
+    """Build the zarr compressors for the given compression options."""
+    compressor = compression.compressor
+    if compressor == CompressorType.DEFAULT:
+        return "auto"
+    if compressor == CompressorType.NONE:
+        return None
+    if compressor == CompressorType.ZSTD:
+        if zarr_format == 2:
+            return numcodecs.Zstd(level=compression.level)
+        return ZstdCodec(level=compression.level)
+    if compressor == CompressorType.BLOSC_ZSTD:
+        cname = BloscCname.zstd
+    else:
+        cname = BloscCname.lz4
+    if zarr_format == 2:
+        blosc_shuffle = {
+            ShuffleType.NO_SHUFFLE: numcodecs.Blosc.NOSHUFFLE,
+            ShuffleType.SHUFFLE: numcodecs.Blosc.SHUFFLE,
+            ShuffleType.BIT_SHUFFLE: numcodecs.Blosc.BITSHUFFLE,
+        }[compression.shuffle]
+        return numcodecs.Blosc(
+            cname=cname.value, clevel=compression.level, shuffle=blosc_shuffle
+        )
+    shuffle = {
+        ShuffleType.NO_SHUFFLE: BloscShuffle.noshuffle,
+        ShuffleType.SHUFFLE: BloscShuffle.shuffle,
+        ShuffleType.BIT_SHUFFLE: BloscShuffle.bitshuffle,
+    }[compression.shuffle]
+    return BloscCodec(cname=cname, clevel=compression.level, shuffle=shuffle)
 
 
 def _region_to_pixel_coordinates(
-    regions: list[TileSlice],
+    regions: Sequence[TileSlice] | RegionTable,
     pixel_size: PixelSize,
-) -> list[TileSlice]:
-    """Convert TileRegion ROIs from pixel coordinates to world coordinates.
+) -> RegionTable:
+    """Convert TileRegion ROIs from world coordinates to rounded pixel coordinates.
 
-    This function modifies the TileRegions in place.
+    A RegionTable is modified in place, a list of TileSlices is converted to
+    a new RegionTable.
 
     Args:
-        regions: List of TileRegion models to convert.
+        regions: TileRegion models to convert.
         pixel_size: PixelSize model to use for conversion.
     """
-    for region in regions:
-        roi = region.roi.to_pixel(pixel_size=pixel_size)
-        rounded_slices = []
-        for ax_slice in roi.slices:
-            start = ax_slice.start
-            length = ax_slice.length
-            assert start is not None and length is not None
-            rounded_slice = RoiSlice(
-                axis_name=ax_slice.axis_name,
-                start=round(start),
-                length=round(length),
-            )
-            rounded_slices.append(rounded_slice)
-        region.roi = roi.model_copy(update={"slices": rounded_slices})
-    return regions
+    table = RegionTable.from_regions(regions)
+    table.to_pixel(pixel_size)
+    columns = table.columns
+    table.set_coordinates(
+        starts=np.round(columns.starts), lengths=np.round(columns.lengths)
+    )
+    return table
 
 
 def _attribute_to_condition_table(
@@ -168,6 +241,8 @@ def write_tiled_image_as_zarr(
     )
     base_group = zarr.open_group(store=zarr_url, mode=mode, zarr_format=zarr_format)
     omezarr_options = converter_options.omezarr_options
+    chunks = _compute_chunk_size(tiled_image, omezarr_options)
+    shards = _compute_shard_size(tiled_image, omezarr_options, chunks)
     try:
         # This can only succeed in "extend" mode if the group already exists
         ome_zarr = open_ome_zarr_container(base_group, cache=True)
@@ -179,7 +254,11 @@ def write_tiled_image_as_zarr(
             store=base_group,
             axes_names=tiled_image.axes,
             shape=tiled_image.shape(),
-            chunks=_compute_chunk_size(tiled_image, omezarr_options),
+            chunks=chunks,
+            shards=shards,
+            compressors=_build_compressors(
+                omezarr_options.compression, zarr_format=zarr_format
+            ),
             pixelsize=tiled_image.pixelsize,
             z_spacing=tiled_image.z_spacing,
             time_spacing=tiled_image.t_spacing,
@@ -189,14 +268,57 @@ def write_tiled_image_as_zarr(
             ngff_version=omezarr_options.ngff_version,
         )
     image = ome_zarr.get_image()
+    writer_options = converter_options.writer_options
+    pyramid_writer = None
+    if writer_options.fused_pyramid:
+        if writer_mode == WriterMode.BY_TILE_PROCESSES:
+            # Worker processes cannot serialize their writes to the shared
+            # chunks of the coarser levels.
+            logger.warning(
+                "Fused pyramid generation is not supported by the "
+                f"'{writer_mode.value}' writer mode, consolidating afterwards."
+            )
+        else:
+            pyramid_writer = FusedPyramidWriter(ome_zarr)
+    target = image if pyramid_writer is None else pyramid_writer
+    histogram_writer = None
+    # Lazy (dask) writers do not hold the data in memory, and worker
+    # processes write outside of this process.
+    if (
+        writer_options.histogram_windows
+        and ChannelHistogram.supports(tiled_image.data_type)
+        and writer_mode
+        not in (
+            WriterMode.BY_TILE_DASK,
+            WriterMode.BY_FOV_DASK,
+            WriterMode.BY_TILE_PROCESSES,
+        )
+    ):
+        axes = tuple(tiled_image.axes)
+        num_channels = tiled_image.shape()[axes.index("c")] if "c" in axes else 1
+        target = histogram_writer = HistogramWriter(
+            target, axes=axes, num_channels=num_channels, dtype=tiled_image.data_type
+        )
     write_to_zarr(
-        image=image,
+        # The wrappers expose the Image methods used by the writers.
+        image=cast("Image", target),
         tiled_image=tiled_image,
         resource=resource,
         writer_mode=writer_mode,
+        # A shard is the smallest unit that can be written independently.
+        chunks=chunks if shards is None else shards,
+        writer_options=writer_options,
     )
-    image.consolidate()
-    ome_zarr.set_channel_windows_with_percentiles()
+    if pyramid_writer is None:
+        image.consolidate()
+    else:
+        pyramid_writer.finalize()
+    if histogram_writer is not None and histogram_writer.complete:
+        ome_zarr.set_channel_windows(
+            starts_ends=histogram_writer.histogram.percentiles()
+        )
+    else:
+        ome_zarr.set_channel_windows_with_percentiles()
     logger.info("OME-Zarr image creation and data writing complete.")
 
     fov_tiles = tiled_image.group_by_fov()
@@ -4,13 +4,19 @@ from typing import Any
 
 import numpy as np
 import pytest
+from ngio import Roi, RoiSlice
+from pydantic import ValidationError
 
+from ome_zarr_converters_tools.core import _tile_cache
+from ome_zarr_converters_tools.core._coordinates import to_world
 from ome_zarr_converters_tools.core._dummy_tiles import (
     StartPosition,
     TileShape,
     build_dummy_tile,
 )
+from ome_zarr_converters_tools.core._region_table import RegionTable
 from ome_zarr_converters_tools.core._tile import Tile
+from ome_zarr_converters_tools.core._tile_cache import TileCache, tile_cache_key
 from ome_zarr_converters_tools.core._tile_region import (
     TiledImage,
     TileFOVGroup,
@@ -116,6 +122,24 @@ class TestTileSlice:
         assert data.shape == (1, 2, 1, 256, 256)
         assert data.dtype == np.uint8
 
+    def test_load_into(self, single_tile: Tile[Any, Any]) -> None:
+        tile_slice: TileSlice = TileSlice.from_tile(single_tile)
+        axes = single_tile.acquisition_details.axes
+        data = tile_slice.load_data(axes=axes)
+        out = np.zeros((1, 2, 1, 300, 300), dtype=np.uint8)
+        tile_slice.load_into(out[..., 10:266, 20:276], axes=axes)
+        np.testing.assert_array_equal(out[..., 10:266, 20:276], data)
+        with pytest.raises(ValueError, match="one output axis"):
+            tile_slice.load_into(out[0], axes=axes)
+
+    def test_probe_matches_load_data(self, single_tile: Tile[Any, Any]) -> None:
+        tile_slice: TileSlice = TileSlice.from_tile(single_tile)
+        axes = single_tile.acquisition_details.axes
+        data = tile_slice.load_data(axes=axes)
+        probe = tile_slice.probe(axes=axes)
+        assert probe.shape == data.shape
+        assert probe.dtype == str(data.dtype)
+
 
 class TestTiledImage:
     def test_add_tile(self, tiled_image_from_grid: TiledImage) -> None:
@@ -161,6 +185,218 @@ class TestTiledImage:
         # DummyLoader fills with non-zero data
         assert data.sum() > 0
 
+    def test_geometry_is_cached(self, tiled_image_from_grid: TiledImage) -> None:
+        groups = tiled_image_from_grid.group_by_fov()
+        assert tiled_image_from_grid.group_by_fov() == groups
+        assert groups[0].ref_slice() is groups[0].ref_slice()
+        # Groups are new on every call, modifying one affects no other
+        assert tiled_image_from_grid.group_by_fov()[0] is not groups[0]
+        groups[0].regions[0].roi.slices[-1].start = 1000.0
+        assert tiled_image_from_grid.group_by_fov()[0].roi() != groups[0].roi()
+        roi = tiled_image_from_grid.roi()
+        roi.name = "modified"
+        assert tiled_image_from_grid.roi().name != "modified"
+
+    def test_geometry_cache_invalidation(
+        self, tiled_image_from_grid: TiledImage
+    ) -> None:
+        groups = tiled_image_from_grid.group_by_fov()
+        assert tiled_image_from_grid.shape() == (1, 2, 1, 512, 512)
+        version = tiled_image_from_grid.region_table.version
+        tiled_image_from_grid.region_table.shift({"x": 256.0})
+        assert tiled_image_from_grid.region_table.version > version
+        assert tiled_image_from_grid.group_by_fov()[0].roi() != groups[0].roi()
+        x_slice = tiled_image_from_grid.roi().get("x")
+        assert x_slice is not None
+        assert x_slice.start == 256.0
+        tiled_image_from_grid.pixelsize = 0.5
+        assert tiled_image_from_grid.shape() == (1, 2, 1, 1024, 1024)
+
+    def test_fov_group_cache_sees_roi_edits(
+        self, tiled_image_from_grid: TiledImage
+    ) -> None:
+        group = tiled_image_from_grid.group_by_fov()[0]
+        x_slice = group.roi().get("x")
+        assert x_slice is not None
+        region_x = group.regions[0].roi.get("x")
+        assert region_x is not None and region_x.length is not None
+        region_x.length *= 2
+        new_x_slice = group.roi().get("x")
+        assert new_x_slice is not None
+        assert new_x_slice.length == region_x.length != x_slice.length
+
+
+class TestRegionTable:
+    def test_regions_are_stored_in_table(
+        self, tiled_image_from_grid: TiledImage
+    ) -> None:
+        assert isinstance(tiled_image_from_grid.regions, RegionTable)
+        assert tiled_image_from_grid.region_table is tiled_image_from_grid.regions
+
+    def test_columns_round_trip(self, tiled_image_from_grid: TiledImage) -> None:
+        table = tiled_image_from_grid.region_table
+        expected = [region.model_copy(deep=True) for region in table]
+        columns = table.columns
+        assert columns.starts.shape == (4, len(columns.axes))
+        assert columns.fov_names == ["FOV_0", "FOV_1", "FOV_2", "FOV_3"]
+        for region, expected_region in zip(table, expected, strict=True):
+            assert region.roi.name == expected_region.roi.name
+            assert region.roi.space == expected_region.roi.space
+            assert region.image_loader == expected_region.image_loader
+            for roi_slice in expected_region.roi.slices:
+                assert region.roi.get(roi_slice.axis_name) == roi_slice
+
+    def test_shift(self, tiled_image_from_grid: TiledImage) -> None:
+        table = tiled_image_from_grid.region_table
+
+        def x_starts() -> list[Any]:
+            return [region.roi.get("x").start for region in table]  # type: ignore
+
+        starts = x_starts()
+        # Axes without slices are ignored
+        table.shift({"x": 5.0, "w": 1.0})
+        assert x_starts() == [start + 5.0 for start in starts]
+
+    def test_shape_and_roi_from_bounding_rows(
+        self, tiled_image_from_grid: TiledImage
+    ) -> None:
+        table = tiled_image_from_grid.region_table
+        assert len(table.bounding_rows()) <= len(table)
+        _ = table.columns
+        assert tiled_image_from_grid.shape() == (1, 2, 1, 512, 512)
+        roi = tiled_image_from_grid.roi()
+        x_slice = roi.get("x")
+        assert x_slice is not None
+        assert x_slice.length == 512
+
+    def test_model_dump_to_list(self, tiled_image_from_grid: TiledImage) -> None:
+        _ = tiled_image_from_grid.region_table.columns
+        dumped = tiled_image_from_grid.model_dump()
+        assert isinstance(dumped["regions"], list)
+        assert len(dumped["regions"]) == 4
+
+    def test_regions_are_detached(self, tiled_image_from_grid: TiledImage) -> None:
+        table = tiled_image_from_grid.region_table
+        version = table.version
+        region = table[0]
+        region.roi.slices[0].start = 1000.0
+        assert table[0] != region
+        assert table.version == version
+        with pytest.raises(ValueError):
+            table.columns.starts[0, 0] = 1000.0
+
+    def test_set_coordinates(self, tiled_image_from_grid: TiledImage) -> None:
+        table = tiled_image_from_grid.region_table
+        version = table.version
+        starts = table.columns.starts + 1.0
+        table.set_coordinates(starts=starts)
+        assert table.version > version
+        np.testing.assert_array_equal(table.columns.starts, starts)
+        with pytest.raises(ValueError, match="Expected lengths of shape"):
+            table.set_coordinates(lengths=starts[1:])
+
+    def test_append_keeps_a_copy(self, tiled_image_from_grid: TiledImage) -> None:
+        table = tiled_image_from_grid.region_table
+        region = table[0]
+        version = table.version
+        table.append(region)
+        region.roi.name = "modified"
+        assert len(table) == 5
+        assert table.version > version
+        assert table.columns.fov_names == ["FOV_0", "FOV_1", "FOV_2", "FOV_3"]
+        assert table[-1] == table[0]
+
+    def test_append_concatenates_columns(
+        self, tiled_image_from_grid: TiledImage
+    ) -> None:
+        roi = Roi(
+            name="small",
+            slices=[
+                RoiSlice(axis_name="y", start=1, length=2),
+                RoiSlice(axis_name="x", start=1, length=2),
+            ],
+            label=3,
+        )
+        small = TileSlice(
+            roi=roi, image_loader=tiled_image_from_grid.regions[0].image_loader
+        )
+        regions = [small, *tiled_image_from_grid.regions]
+        table = RegionTable([small])
+        _ = table.columns
+        for region in regions[1:]:
+            table.append(region)
+            _ = table.columns
+        expected = RegionTable(regions)
+        assert table == expected
+        assert table.columns.axes == expected.columns.axes
+        assert table.columns.fov_names == expected.columns.fov_names
+        assert len(table.columns.loaders) == len(expected.columns.loaders)
+
+    def test_regions_are_frozen(self, tiled_image_from_grid: TiledImage) -> None:
+        region = tiled_image_from_grid.regions[0]
+        with pytest.raises(ValidationError):
+            region.roi = region.roi.model_copy()
+
+
+class TestTileCache:
+    def test_lru_eviction_and_stats(self) -> None:
+        cache = TileCache(max_bytes=200)
+        for key in "abc":
+            cache.get_or_load(key, lambda: np.zeros(100, dtype=np.uint8))
+        stats = cache.stats()
+        assert (stats.misses, stats.evictions, stats.num_tiles) == (3, 1, 2)
+        assert cache.get("a") is None
+        assert cache.get("c") is not None
+        cache.configure(max_bytes=100)
+        assert cache.stats().num_tiles == 1
+        assert cache.get("c") is not None
+        assert cache.stats().hits == 2
+
+    def test_disabled_by_default(self) -> None:
+        cache = TileCache()
+        calls = []
+        for _ in range(2):
+            cache.get_or_load("a", lambda: calls.append(1) or np.zeros(1))
+        assert len(calls) == 2
+        assert cache.stats().num_tiles == 0
+
+    def test_tile_slice_load_data_uses_cache(
+        self, single_tile: Tile[Any, Any], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        cache = TileCache(max_bytes=2**24)
+        monkeypatch.setattr(_tile_cache, "_TILE_CACHE", cache)
+        tile_slice: TileSlice = TileSlice.from_tile(single_tile)
+        axes = single_tile.acquisition_details.axes
+        first = tile_slice.load_data(axes=axes)
+        second = tile_slice.load_data(axes=axes)
+        np.testing.assert_array_equal(first, second)
+        assert second.flags.writeable
+        second += 1
+        np.testing.assert_array_equal(tile_slice.load_data(axes=axes), first)
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.num_tiles) == (2, 1, 1)
+        key = tile_cache_key(tile_slice.image_loader)
+        assert key != tile_cache_key(tile_slice.image_loader, resource="other")
+
+    def test_tile_slice_load_into_populates_cache(
+        self, single_tile: Tile[Any, Any], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        cache = TileCache(max_bytes=2**24)
+        monkeypatch.setattr(_tile_cache, "_TILE_CACHE", cache)
+        tile_slice: TileSlice = TileSlice.from_tile(single_tile)
+        axes = single_tile.acquisition_details.axes
+        probe = tile_slice.probe(axes=axes)
+        out = np.zeros(probe.shape, dtype=probe.dtype)
+        tile_slice.load_into(out, axes=axes)
+        assert cache.stats().num_tiles == 1
+        out += 1
+        np.testing.assert_array_equal(tile_slice.load_data(axes=axes), out - 1)
+        again = np.zeros_like(out)
+        tile_slice.load_into(again, axes=axes)
+        np.testing.assert_array_equal(again, out - 1)
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.num_tiles) == (2, 1, 1)
+
 
 class TestTiledImageFromTiles:
     def test_single_collection(
@@ -209,3 +445,60 @@ class TestTiledImageFromTiles:
                 tiles=[],
                 converter_options=ConverterOptions(),
             )
+
+
+class TestBatchCoordinates:
+    @staticmethod
+    def _tiles(
+        acquisition_details: AcquisitionDetails, starts: list[tuple[float, float]]
+    ) -> list[Tile[Any, Any]]:
+        return [
+            build_dummy_tile(
+                fov_name=f"FOV_{i}",
+                start=StartPosition(x=x, y=y, z=i % 3),
+                shape=TileShape(x=64, y=32, z=1, c=1, t=1),
+                collection=SingleImage(image_path="image"),
+                acquisition_details=acquisition_details,
+            )
+            for i, (x, y) in enumerate(starts)
+        ]
+
+    @pytest.mark.parametrize(
+        "stage_corrections",
+        [
+            StageCorrections(),
+            StageCorrections(flip_x=True, flip_y=True),
+            StageCorrections(swap_xy=True, flip_y=True),
+        ],
+    )
+    def test_batch_matches_to_roi(self, stage_corrections: StageCorrections) -> None:
+        acq = AcquisitionDetails(
+            channels=[ChannelInfo(channel_label="DAPI")],
+            pixelsize=0.65,
+            z_spacing=2.0,
+            stage_corrections=stage_corrections,
+        )
+        tiles = self._tiles(acq, [(0.0, 0.0), (41.6, 0.0), (0.0, 20.8), (10.0, 3.3)])
+        expected = [TileSlice.from_tile(tile) for tile in tiles]
+        (image,) = tiled_image_from_tiles(
+            tiles=tiles, converter_options=ConverterOptions()
+        )
+        assert list(image.regions) == expected
+
+    def test_to_world(self) -> None:
+        world = to_world(np.array([0.0, 2.0, 3.0]), spacing=0.5, coo_system="pixel")
+        np.testing.assert_array_equal(world, [0.0, 1.0, 1.5])
+        world = to_world(np.array([0.0, 1.3]), spacing=0.65, coo_system="world")
+        np.testing.assert_allclose(world, [0.0, 1.3])
+
+    def test_reports_all_offending_tiles(self) -> None:
+        acq = AcquisitionDetails(
+            channels=[ChannelInfo(channel_label="DAPI")], pixelsize=0.65
+        )
+        # 0.651 and 1.301 are 1e-3 away from the 1 and 2 pixel positions
+        tiles = self._tiles(acq, [(0.0, 0.0), (0.651, 0.0), (1.301, 0.0)])
+        with pytest.raises(ValueError, match="2 coordinates") as excinfo:
+            tiled_image_from_tiles(tiles=tiles, converter_options=ConverterOptions())
+        assert "FOV_1" in str(excinfo.value)
+        assert "FOV_2" in str(excinfo.value)
+        assert "FOV_0" not in str(excinfo.value)
@@ -17,12 +17,15 @@ from ome_zarr_converters_tools.models import (
     SingleImage,
 )
 from ome_zarr_converters_tools.pipelines._filters import (
+    FilterModel,
     RegexExcludeFilter,
     RegexIncludeFilter,
     WellFilter,
     _filter_registry,
     add_filter,
     apply_filter_pipeline,
+    apply_path_include_regex_filter,
+    split_collection_filters,
 )
 
 
@@ -175,3 +178,64 @@ class TestFilterPipeline:
         result = apply_filter_pipeline(tiles, filters_config=filters)
         assert len(result) == 1
         assert "alpha" in result[0].collection.path()
+
+
+class FovFilter(FilterModel):
+    name: str = "test_fov_filter"
+    fov_name: str
+
+
+def _keep_fov(tile: Tile[Any, Any], filter_params: FovFilter) -> bool:
+    return tile.fov_name == filter_params.fov_name
+
+
+class TestSplitCollectionFilters:
+    def test_no_filters(self) -> None:
+        collection_filter, tile_filters = split_collection_filters([])
+        assert collection_filter is None
+        assert tile_filters == []
+
+    def test_builtin_filters_become_collection_filter(self) -> None:
+        filters = [
+            RegexIncludeFilter(regex="plate"),
+            WellFilter(wells_to_remove=["A01"]),
+        ]
+        collection_filter, tile_filters = split_collection_filters(filters)
+        assert collection_filter is not None
+        assert tile_filters == []
+        a01 = ImageInPlate(plate_name="plate", row="A", column=1)
+        a02 = ImageInPlate(plate_name="plate", row="A", column=2)
+        other = ImageInPlate(plate_name="other", row="B", column=1)
+        assert not collection_filter(a01)
+        assert collection_filter(a02)
+        assert not collection_filter(other)
+
+    def test_custom_filters_stay_per_tile(self) -> None:
+        fov_filter = FovFilter(fov_name="FOV_1")
+        try:
+            add_filter(function=_keep_fov, name="test_fov_filter")
+            collection_filter, tile_filters = split_collection_filters(
+                [fov_filter, RegexExcludeFilter(regex="beta")]
+            )
+        finally:
+            _filter_registry.pop("test_fov_filter", None)
+        assert collection_filter is not None
+        assert collection_filter(SingleImage(image_path="alpha"))
+        assert not collection_filter(SingleImage(image_path="beta"))
+        assert tile_filters == [fov_filter]
+
+    def test_overwritten_builtin_stays_per_tile(self) -> None:
+        def keep_all(tile: Tile[Any, Any], **kwargs: Any) -> bool:
+            return True
+
+        name = "Path Regex Include Filter"
+        include = RegexIncludeFilter(regex="alpha")
+        try:
+            add_filter(function=keep_all, name=name, overwrite=True)
+            collection_filter, tile_filters = split_collection_filters([include])
+        finally:
+            add_filter(
+                function=apply_path_include_regex_filter, name=name, overwrite=True
+            )
+        assert collection_filter is None
+        assert tile_filters == [include]
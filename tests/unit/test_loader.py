@@ -8,6 +8,7 @@ import pytest
 from ome_zarr_converters_tools.models._loader import (
     DefaultImageLoader,
     ImageLoaderInterface,
+    ImageProbe,
 )
 
 
@@ -32,8 +33,76 @@ class TestImageLoaderInterface:
         loader = StubLoader()
         assert loader.find_data_type() == "float32"
 
+    def test_probe_defaults_to_load_data(self) -> None:
+        class StubLoader(ImageLoaderInterface):
+            def load_data(self, resource=None):
+                return np.zeros((3, 2), dtype=np.int16)
+
+        assert StubLoader().probe() == ImageProbe(shape=(3, 2), dtype="int16")
+
+    def test_load_into_defaults_to_copy(self) -> None:
+        class StubLoader(ImageLoaderInterface):
+            def load_data(self, resource=None):
+                return np.arange(6, dtype=np.uint16).reshape(2, 3)
+
+        out = np.zeros((1, 4, 5), dtype=np.uint16)
+        StubLoader().load_into(out[:, 1:3, 2:5])
+        np.testing.assert_array_equal(out[0, 1:3, 2:5], [[0, 1, 2], [3, 4, 5]])
+        assert out.sum() == 15
+
+    def test_load_region_defaults_to_slicing_full_data(self) -> None:
+        class StubLoader(ImageLoaderInterface):
+            def load_data(self, resource=None):
+                return np.arange(12, dtype=np.uint16).reshape(3, 4)
+
+        loader = StubLoader()
+        assert not loader.supports_region_loading()
+        region = loader.load_region((slice(0, 1), slice(1, 3), slice(2, 4)))
+        np.testing.assert_array_equal(region, [[[6, 7], [10, 11]]])
+
 
 class TestDefaultImageLoader:
+    def test_load_region_tiled_tiff(self, tmp_path: Path) -> None:
+        tifffile = pytest.importorskip("tifffile")
+        data = np.random.randint(0, 255, (96, 80), dtype=np.uint8)
+        tiff_path = tmp_path / "tiled.tif"
+        tifffile.imwrite(str(tiff_path), data, tile=(32, 32))
+
+        loader = DefaultImageLoader(file_path="tiled.tif")
+        assert loader.supports_region_loading(resource=str(tmp_path))
+        region = loader.load_region(
+            (slice(0, 1), slice(10, 70), slice(33, 80)), resource=str(tmp_path)
+        )
+        np.testing.assert_array_equal(region, data[None, 10:70, 33:80])
+
+    @pytest.mark.parametrize(
+        ("rows_per_strip", "by_region"), [(None, False), (16, True)]
+    )
+    def test_region_loading_needs_several_strips(
+        self, tmp_path: Path, rows_per_strip: int | None, by_region: bool
+    ) -> None:
+        tifffile = pytest.importorskip("tifffile")
+        data = np.random.randint(0, 255, (96, 80), dtype=np.uint8)
+        tifffile.imwrite(str(tmp_path / "img.tif"), data, rowsperstrip=rows_per_strip)
+
+        loader = DefaultImageLoader(file_path="img.tif")
+        assert loader.supports_region_loading(resource=str(tmp_path)) == by_region
+        region = loader.load_region(
+            (slice(10, 70), slice(33, 80)), resource=str(tmp_path)
+        )
+        np.testing.assert_array_equal(region, data[10:70, 33:80])
+
+    def test_load_region_npy_falls_back_to_full_read(self, tmp_path: Path) -> None:
+        data = np.random.randint(0, 255, (10, 10), dtype=np.uint8)
+        npy_path = tmp_path / "test.npy"
+        np.save(npy_path, data)
+
+        loader = DefaultImageLoader(file_path=str(npy_path))
+        assert not loader.supports_region_loading()
+        np.testing.assert_array_equal(
+            loader.load_region((slice(2, 5), slice(0, 3))), data[2:5, 0:3]
+        )
+
     def test_load_npy(self, tmp_path: Path) -> None:
         data = np.random.randint(0, 255, (10, 10), dtype=np.uint8)
         npy_path = tmp_path / "test.npy"
@@ -117,6 +186,99 @@ class TestDefaultImageLoader:
         loader = DefaultImageLoader(file_path=str(tmp_path / "data.npy"))
         assert loader.find_data_type() == "float64"
 
+    @pytest.mark.parametrize(
+        ("file_name", "data"),
+        [
+            ("stack.tif", np.zeros((3, 12, 10), dtype=np.uint16)),
+            ("image.png", np.zeros((12, 10), dtype=np.uint8)),
+            ("rgb.png", np.zeros((12, 10, 3), dtype=np.uint8)),
+            ("image.npy", np.zeros((2, 12, 10), dtype=np.float32)),
+        ],
+    )
+    def test_probe_reads_headers_only(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        file_name: str,
+        data: np.ndarray,
+    ) -> None:
+        path = tmp_path / file_name
+        if file_name.endswith(".tif"):
+            import tifffile
+
+            tifffile.imwrite(str(path), data)
+        elif file_name.endswith(".png"):
+            from PIL import Image
+
+            Image.fromarray(data).save(path)
+        else:
+            np.save(path, data)
+        loader = DefaultImageLoader(file_path=file_name)
+        expected = loader.load_data(resource=str(tmp_path))
+
+        def fail(*args, **kwargs):
+            raise AssertionError("probe must not load the image data")
+
+        monkeypatch.setattr(DefaultImageLoader, "load_data", fail)
+        probe = loader.probe(resource=str(tmp_path))
+        assert probe == ImageProbe(shape=expected.shape, dtype=str(expected.dtype))
+        assert loader.find_data_type(resource=str(tmp_path)) == str(expected.dtype)
+
+    @pytest.mark.parametrize("file_name", ["stack.tif", "stack.npy"])
+    @pytest.mark.parametrize("strided", [False, True])
+    def test_load_into(self, tmp_path: Path, file_name: str, strided: bool) -> None:
+        tifffile = pytest.importorskip("tifffile")
+        data = np.random.randint(0, 255, (2, 12, 10), dtype=np.uint16)
+        if file_name.endswith(".tif"):
+            tifffile.imwrite(str(tmp_path / file_name), data)
+        else:
+            np.save(tmp_path / file_name, data)
+        loader = DefaultImageLoader(file_path=file_name)
+        if strided:
+            full = np.zeros((1, 2, 12, 20), dtype=np.uint16)
+            out = full[:, :, :, 5:15]
+        else:
+            full = np.zeros((1, 4, 12, 10), dtype=np.uint16)
+            out = full[:, 1:3]
+        shape = out.shape
+        loader.load_into(out, resource=str(tmp_path))
+        assert out.shape == shape
+        np.testing.assert_array_equal(out[0], data)
+        assert full.sum() == data.sum()
+
+    @pytest.mark.parametrize(
+        ("file_name", "compression", "mapped"),
+        [
+            ("raw.tif", None, True),
+            ("zlib.tif", "zlib", False),
+            ("raw.npy", None, True),
+        ],
+    )
+    def test_memory_map(
+        self, tmp_path: Path, file_name: str, compression: str | None, mapped: bool
+    ) -> None:
+        tifffile = pytest.importorskip("tifffile")
+        data = np.random.randint(0, 255, (3, 12, 10), dtype=np.uint16)
+        if file_name.endswith(".tif"):
+            tifffile.imwrite(str(tmp_path / file_name), data, compression=compression)
+        else:
+            np.save(tmp_path / file_name, data)
+        loader = DefaultImageLoader(file_path=file_name, memory_map=True)
+        loaded = loader.load_data(resource=str(tmp_path))
+        assert isinstance(loaded, np.memmap) == mapped
+        np.testing.assert_array_equal(loaded, data)
+        assert loader.supports_region_loading(resource=str(tmp_path))
+        region = loader.load_region(
+            (slice(0, 1), slice(1, 3), slice(2, 8), slice(0, 10)),
+            resource=str(tmp_path),
+        )
+        np.testing.assert_array_equal(region, data[None, 1:3, 2:8])
+
+    def test_memory_map_is_opt_in(self, tmp_path: Path) -> None:
+        np.save(tmp_path / "img.npy", np.zeros((4, 4), dtype=np.uint8))
+        loader = DefaultImageLoader(file_path="img.npy")
+        assert not isinstance(loader.load_data(resource=str(tmp_path)), np.memmap)
+
     def test_extra_fields_ignored(self) -> None:
         # ImageLoaderInterface has extra="ignore"
         loader = DefaultImageLoader(file_path="test.npy", unknown_field="value")  # type: ignore
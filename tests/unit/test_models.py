@@ -5,8 +5,13 @@ import pytest
 from ome_zarr_converters_tools import AcquisitionDetails, ChannelInfo
 from ome_zarr_converters_tools.models import (
     AlignmentCorrections,
+    ChunkBasedSharding,
+    CompressionOptions,
+    CompressorType,
     ConverterOptions,
     ImageInPlate,
+    NoSharding,
+    OmeZarrOptions,
     SingleImage,
     StageCorrections,
 )
@@ -120,9 +125,39 @@ class TestConverterOptions:
         assert opts.alignment_correction.align_t is False
         assert opts.omezarr_options.num_levels == 5
         assert isinstance(opts.omezarr_options.chunks, FovBasedChunking)
+        assert isinstance(opts.omezarr_options.sharding, NoSharding)
+        assert opts.omezarr_options.compression.compressor == CompressorType.DEFAULT
         assert opts.temp_json_options.temp_url == "{zarr_dir}/_tmp_json"
 
 
+class TestOmeZarrOptions:
+    """Tests for the sharding and compression options."""
+
+    def test_sharding_requires_ngff_05(self) -> None:
+        with pytest.raises(ValueError, match=r"Sharding requires OME-NGFF 0\.5"):
+            OmeZarrOptions(sharding=ChunkBasedSharding(), ngff_version="0.4")
+        options = OmeZarrOptions(sharding=ChunkBasedSharding(), ngff_version="0.5")
+        assert options.sharding.mode == "Chunks"
+
+    def test_sharding_from_dict(self) -> None:
+        options = OmeZarrOptions.model_validate(
+            {"sharding": {"mode": "Same as FOVs", "xy_fovs": 2}, "ngff_version": "0.5"}
+        )
+        assert options.sharding.mode == "Same as FOVs"
+        assert options.sharding.get_xy_shard(1000, 256) == 2048
+
+    def test_sharding_rejects_unknown_fields(self) -> None:
+        with pytest.raises(ValueError, match="xy_chunk"):
+            OmeZarrOptions.model_validate(
+                {"sharding": {"mode": "Chunks", "xy_chunk": 2}, "ngff_version": "0.5"}
+            )
+
+    def test_blosc_level_range(self) -> None:
+        with pytest.raises(ValueError, match="Blosc compression level"):
+            CompressionOptions(compressor=CompressorType.BLOSC_LZ4, level=12)
+        assert CompressionOptions(compressor=CompressorType.ZSTD, level=12).level == 12
+
+
 class TestStageCorrections:
     """Tests for the StageCorrections model."""
 
@@ -12,6 +12,7 @@ from ome_zarr_converters_tools.core._dummy_tiles import (
     TileShape,
     build_dummy_tile,
 )
+from ome_zarr_converters_tools.core._region_table import RegionTable
 from ome_zarr_converters_tools.core._tile_region import TiledImage, TileSlice
 from ome_zarr_converters_tools.core._tile_to_tiled_images import tiled_image_from_tiles
 from ome_zarr_converters_tools.models import (
@@ -30,10 +31,14 @@ from ome_zarr_converters_tools.pipelines._alignment import (
     apply_fov_alignment_corrections,
     apply_remove_offsets,
 )
+from ome_zarr_converters_tools.pipelines._region_transform import RegionTransform
 from ome_zarr_converters_tools.pipelines._snap_utils import (
     BBox,
     NotAGridError,
+    calculate_snap_to_corner_offset,
+    calculate_snap_to_grid_offset,
     check_if_regular_grid,
+    find_regular_grid,
     tiles_to_boxes,
 )
 from ome_zarr_converters_tools.pipelines._tiling import (
@@ -253,6 +258,144 @@ class TestSnapUtils:
         with pytest.raises(NotAGridError):
             check_if_regular_grid(tiles)
 
+    def test_find_regular_grid_with_jitter(self) -> None:
+        rng = np.random.default_rng(0)
+        index_x, index_y = np.meshgrid(np.arange(30), np.arange(20))
+        index_x, index_y = index_x.ravel(), index_y.ravel()
+        jitter = rng.uniform(-2.0, 2.0, size=(len(index_x), 2))
+        tiles = [
+            _make_pixel_tile_slice(
+                10.0 + i * 90.0 + dx, 5.0 + j * 92.0 + dy, 100.0, 100.0, f"FOV_{n}"
+            )
+            for n, (i, j, (dx, dy)) in enumerate(
+                zip(index_x.tolist(), index_y.tolist(), jitter.tolist(), strict=True)
+            )
+        ]
+        layout = find_regular_grid(tiles)
+        assert np.isclose(layout.setup.offset_x, 90.0, atol=1.0)
+        assert np.isclose(layout.setup.offset_y, 92.0, atol=1.0)
+        np.testing.assert_array_equal(layout.index_x, index_x)
+        np.testing.assert_array_equal(layout.index_y, index_y)
+        with pytest.raises(NotAGridError):
+            find_regular_grid(tiles, tolerance=0.5)
+
+    def test_find_regular_grid_missing_column(self) -> None:
+        tiles = [
+            _make_pixel_tile_slice(x, y, 100.0, 100.0, f"FOV_{x}_{y}")
+            for x in (0.0, 90.0, 270.0)
+            for y in (0.0, 90.0)
+        ]
+        layout = find_regular_grid(tiles)
+        assert np.isclose(layout.setup.offset_x, 90.0)
+        assert layout.index_x.tolist() == [0, 0, 1, 1, 3, 3]
+        assert layout.index_y.tolist() == [0, 1, 0, 1, 0, 1]
+
+    def test_find_regular_grid_dense_missing_column(self) -> None:
+        # (0, 100, 150) would fit a pitch of 50 with a missing column
+        tiles = [
+            _make_pixel_tile_slice(x, 0.0, 100.0, 100.0, f"FOV_{x}")
+            for x in (0.0, 100.0, 150.0)
+        ]
+        with pytest.raises(NotAGridError):
+            find_regular_grid(tiles)
+        layout = find_regular_grid(tiles, max_overlap=0.6)
+        assert np.isclose(layout.setup.offset_x, 50.0)
+        assert layout.index_x.tolist() == [0, 2, 3]
+
+    def test_snap_to_grid_dense_grid(self) -> None:
+        # Pitch under half the tile length, no missing column
+        tiles = {
+            f"FOV_{x}": _make_pixel_tile_slice(x, 0.0, 100.0, 100.0, f"FOV_{x}")
+            for x in (0.0, 40.0, 80.0)
+        }
+        offsets = calculate_snap_to_grid_offset(tiles)
+        assert [offset["x"] for offset in offsets.values()] == pytest.approx(
+            [0.0, 60.0, 120.0]
+        )
+
+    def test_snap_to_grid_from_region_table(self) -> None:
+        tiles = {
+            name: _make_pixel_tile_slice(x, y, 100.0, 100.0, name)
+            for name, x, y in [("A", 0.0, 1.0), ("B", 91.0, 0.0), ("C", 1.0, 90.0)]
+        }
+        offsets = calculate_snap_to_grid_offset(RegionTable(tiles.values()))
+        assert offsets == calculate_snap_to_grid_offset(tiles)
+
+    def test_find_regular_grid_single_row_spread(self) -> None:
+        # A single cluster of chained starts is not a grid column
+        tiles = [
+            _make_pixel_tile_slice(x, 0.0, 100.0, 100.0, f"FOV_{x}")
+            for x in (0.0, 4.0, 8.0, 12.0)
+        ]
+        with pytest.raises(NotAGridError):
+            find_regular_grid(tiles)
+
+    def test_snap_to_grid_with_jitter(self) -> None:
+        tiles = {
+            "A": _make_pixel_tile_slice(0.0, 1.0, 100.0, 100.0, "A"),
+            "B": _make_pixel_tile_slice(91.0, 0.0, 100.0, 100.0, "B"),
+            "C": _make_pixel_tile_slice(0.5, 90.0, 100.0, 100.0, "C"),
+            "D": _make_pixel_tile_slice(90.0, 91.0, 100.0, 100.0, "D"),
+        }
+        offsets = calculate_snap_to_grid_offset(tiles)
+        snapped = {
+            name: (box.x + offsets[name]["x"], box.y + offsets[name]["y"])
+            for name, box in zip(
+                tiles, tiles_to_boxes(list(tiles.values())), strict=True
+            )
+        }
+        for name, (x, y) in {
+            "A": (0.0, 0.0),
+            "B": (100.0, 0.0),
+            "C": (0.0, 100.0),
+            "D": (100.0, 100.0),
+        }.items():
+            assert np.allclose(snapped[name], (x, y))
+
+    @staticmethod
+    def _grid_scan_offsets(
+        tiles: dict[str, TileSlice], length: float
+    ) -> dict[str, dict[str, float]]:
+        """Reference snap to corners: scan all the free grid points per tile."""
+        grid = [
+            (i * length, j * length)
+            for i in range(len(tiles))
+            for j in range(len(tiles))
+        ]
+        offsets = {}
+        for name, box in zip(tiles, tiles_to_boxes(list(tiles.values())), strict=True):
+            distances = [
+                np.sqrt((box.x - px) ** 2 + (box.y - py) ** 2) for px, py in grid
+            ]
+            px, py = grid.pop(int(np.argmin(distances)))
+            offsets[name] = {"x": px - box.x, "y": py - box.y}
+        return offsets
+
+    def test_snap_to_corner_matches_grid_scan(self) -> None:
+        rng = np.random.default_rng(0)
+        for num_tiles in (1, 5, 30):
+            starts = rng.uniform(-150.0, 60.0 * num_tiles, size=(num_tiles, 2))
+            tiles = {
+                f"FOV_{i}": _make_pixel_tile_slice(x, y, 100.0, 100.0, f"FOV_{i}")
+                for i, (x, y) in enumerate(starts.tolist())
+            }
+            offsets = calculate_snap_to_corner_offset(tiles)
+            assert offsets == self._grid_scan_offsets(tiles, 100.0)
+
+    def test_snap_to_corner_collisions(self) -> None:
+        tiles = {
+            name: _make_pixel_tile_slice(x, 0.0, 100.0, 100.0, name)
+            for name, x in [("A", 0.0), ("B", 10.0), ("C", 50.0), ("D", 0.0)]
+        }
+        offsets = calculate_snap_to_corner_offset(tiles)
+        assert offsets == self._grid_scan_offsets(tiles, 100.0)
+        boxes = tiles_to_boxes(list(tiles.values()))
+        corners = {
+            (box.x + offsets[name]["x"], box.y + offsets[name]["y"])
+            for name, box in zip(tiles, boxes, strict=True)
+        }
+        assert corners == {(0.0, 0.0), (100.0, 0.0), (0.0, 100.0), (100.0, 100.0)}
+
 
 # --- Tiling tests ---
 
@@ -321,3 +464,57 @@ class TestTiling:
         )
         result = apply_mosaic_tiling(images[0], TilingMode.INPLACE)
         assert len(result.regions) == 4
+
+
+# --- Region transform tests ---
+
+
+class TestRegionTransform:
+    @staticmethod
+    def _table() -> RegionTable:
+        return RegionTable(
+            [
+                _make_pixel_tile_slice(30.0, 5.0, 10.0, 10.0, "B"),
+                _make_pixel_tile_slice(10.0, 20.0, 10.0, 10.0, "A"),
+                _make_pixel_tile_slice(32.0, 7.0, 10.0, 10.0, "B"),
+            ]
+        )
+
+    def test_identity_does_not_touch_the_table(self) -> None:
+        table = self._table()
+        transform = RegionTransform(table)
+        version = table.version
+        assert transform.is_identity
+        transform.apply()
+        assert table.version == version
+
+    def test_composed_moves_match_eager_moves(self) -> None:
+        table = self._table()
+        transform = RegionTransform(table)
+        transform.shift({"x": -10.0, "y": np.array([1.0, 2.0, 3.0])})
+        transform.take(np.array([1, 0, 2]))
+        # Copy the x start of the first "B" region to the second one
+        transform.copy_starts(0, np.array([2]), np.array([1]))
+        transform.shift({"x": 100.0})
+        np.testing.assert_array_equal(
+            transform.starts(),
+            [[100.0, 22.0], [120.0, 6.0], [120.0, 10.0]],
+        )
+        # Only the rows are reordered until the transform is applied
+        np.testing.assert_array_equal(
+            table.columns.starts, [[10.0, 20.0], [30.0, 5.0], [32.0, 7.0]]
+        )
+
+        selected = transform.select(np.array([2]))
+        assert selected[0].roi.name == "B"
+        assert selected[0].roi.get("x").start == 120.0
+
+        transform.apply()
+        assert transform.is_identity
+        assert [region.roi.name for region in table] == ["A", "B", "B"]
+        assert [region.roi.get("x").start for region in table] == [
+            100.0,
+            120.0,
+            120.0,
+        ]
+        assert [region.roi.get("y").start for region in table] == [22.0, 6.0, 10.0]
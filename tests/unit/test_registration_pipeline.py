@@ -1,5 +1,7 @@
 """Unit tests for registration pipeline orchestration."""
 
+import copy
+
 import pytest
 
 from ome_zarr_converters_tools.core._tile_region import TiledImage
@@ -71,6 +73,80 @@ class TestRegistrationPipeline:
         with pytest.raises(ValueError, match="not registered"):
             apply_registration_pipeline(tiled_image_from_grid, config)
 
+    def test_unknown_step_error_before_running(
+        self, tiled_image_from_grid: TiledImage
+    ) -> None:
+        tiled_image_from_grid.region_table.shift({"x": 10.0})
+        expected = copy.deepcopy(tiled_image_from_grid)
+        config = [
+            RegistrationStep(name="remove_offsets", params={}),
+            RegistrationStep(name="nonexistent_step", params={}),
+        ]
+        with pytest.raises(ValueError, match="not registered"):
+            apply_registration_pipeline(tiled_image_from_grid, config)
+        assert list(tiled_image_from_grid.regions) == list(expected.regions)
+
+    @pytest.mark.parametrize(
+        "tiling_mode", [TilingMode.SNAP_TO_CORNERS, TilingMode.NO_TILING]
+    )
+    def test_fused_pipeline_matches_step_by_step(
+        self, tiled_image_from_grid: TiledImage, tiling_mode: TilingMode
+    ) -> None:
+        tiled_image_from_grid.region_table.shift({"x": 10.5, "y": 3.25})
+        pipeline = build_default_registration_pipeline(
+            AlignmentCorrections(align_xy=True), tiling_mode
+        )
+        expected = copy.deepcopy(tiled_image_from_grid)
+        for step in pipeline:
+            expected = _registration_registry[step["name"]](expected, **step["params"])
+        result = apply_registration_pipeline(tiled_image_from_grid, pipeline)
+        assert list(result.regions) == list(expected.regions)
+
+    def test_custom_step_sees_previous_steps(
+        self, tiled_image_from_grid: TiledImage
+    ) -> None:
+        tiled_image_from_grid.region_table.shift({"x": 10.0})
+        starts: list[float] = []
+
+        def record_x(tiled_image: TiledImage) -> TiledImage:
+            for region in tiled_image.regions:
+                x_slice = region.roi.get("x")
+                assert x_slice is not None
+                starts.append(x_slice.start)
+            return tiled_image
+
+        try:
+            add_registration_func(record_x, name="test_record_x")
+            config = [
+                RegistrationStep(name="remove_offsets", params={}),
+                RegistrationStep(name="test_record_x", params={}),
+                RegistrationStep(name="align_to_pixel_grid", params={}),
+            ]
+            apply_registration_pipeline(tiled_image_from_grid, config)
+        finally:
+            _registration_registry.pop("test_record_x", None)
+        assert min(starts) == 0.0
+
+    def test_overridden_builtin_step_is_called(
+        self, tiled_image_from_grid: TiledImage
+    ) -> None:
+        builtin = _registration_registry["remove_offsets"]
+        calls: list[str] = []
+
+        def my_remove_offsets(tiled_image: TiledImage) -> TiledImage:
+            calls.append("remove_offsets")
+            return tiled_image
+
+        try:
+            add_registration_func(
+                my_remove_offsets, name="remove_offsets", overwrite=True
+            )
+            config = [RegistrationStep(name="remove_offsets", params={})]
+            apply_registration_pipeline(tiled_image_from_grid, config)
+        finally:
+            _registration_registry["remove_offsets"] = builtin
+        assert calls == ["remove_offsets"]
+
     def test_build_default_registration_pipeline(self) -> None:
         corrections = AlignmentCorrections()
         pipeline = build_default_registration_pipeline(corrections, TilingMode.AUTO)
@@ -3,12 +3,19 @@
 from pathlib import Path
 
 import pandas as pd
+import polars as pl
 import pytest
 
 from ome_zarr_converters_tools.core._table import (
     hcs_images_from_dataframe,
     single_images_from_dataframe,
 )
+from ome_zarr_converters_tools.core._table_scan import (
+    iter_hcs_images_from_table,
+    iter_single_images_from_table,
+    scan_tiles_table,
+)
+from ome_zarr_converters_tools.core._tile import Tile
 from ome_zarr_converters_tools.models import (
     AcquisitionDetails,
     ChannelInfo,
@@ -16,6 +23,14 @@ from ome_zarr_converters_tools.models import (
     ImageInPlate,
     SingleImage,
 )
+from ome_zarr_converters_tools.pipelines._filters import (
+    FilterModel,
+    RegexExcludeFilter,
+    RegexIncludeFilter,
+    WellFilter,
+    _filter_registry,
+    add_filter,
+)
 
 EXAMPLES_DIR = Path(__file__).resolve().parents[2] / "examples"
 HCS_EXAMPLE_DIR = EXAMPLES_DIR / "hcs_plate"
@@ -337,3 +352,272 @@ class TestSingleImagesFromDataframe:
         )
         assert tiles[0].attributes["tissue_type"] == ["brain"]
         assert tiles[0].attributes["sample_id"] == [42]
+
+
+class TestColumnarIngestion:
+    def _table(self, **overrides) -> pd.DataFrame:
+        data = {
+            "file_path": ["a.tif", "b.tif", "c.tif"],
+            "row": ["A", "A", "B"],
+            "column": [1, 1, 2],
+            "fov_name": ["FOV_1", "FOV_2", "FOV_1"],
+            "start_x": [0.0, 100.0, 0.0],
+            "start_y": [0.0, 0.0, 0.0],
+            "length_x": [100, 100, 100],
+            "length_y": [100, 100, 100],
+        }
+        data.update(overrides)
+        return pd.DataFrame(data)
+
+    def test_missing_required_column(
+        self, hcs_acquisition_details: AcquisitionDetails
+    ) -> None:
+        df = self._table().drop(columns=["length_x"])
+        with pytest.raises(ValueError, match="length_x"):
+            hcs_images_from_dataframe(
+                tiles_table=df, acquisition_details=hcs_acquisition_details
+            )
+
+    def test_invalid_column_values(
+        self, hcs_acquisition_details: AcquisitionDetails
+    ) -> None:
+        df = self._table(length_y=[100, 0, 100])
+        with pytest.raises(ValueError, match="length_y"):
+            hcs_images_from_dataframe(
+                tiles_table=df, acquisition_details=hcs_acquisition_details
+            )
+
+    def test_columns_are_coerced(
+        self, hcs_acquisition_details: AcquisitionDetails
+    ) -> None:
+        df = self._table(start_c=[0.0, 1.0, 2.0], start_z=[0, 1, 2])
+        tiles = hcs_images_from_dataframe(
+            tiles_table=df, acquisition_details=hcs_acquisition_details
+        )
+        assert [tile.start_c for tile in tiles] == [0, 1, 2]
+        assert all(isinstance(tile.start_c, int) for tile in tiles)
+        assert all(isinstance(tile.start_z, float) for tile in tiles)
+        assert tiles[0].length_z == 1.0
+
+    def test_reserved_column(self, hcs_acquisition_details: AcquisitionDetails) -> None:
+        df = self._table(plate_name=["P", "P", "P"])
+        with pytest.raises(ValueError, match="plate_name"):
+            hcs_images_from_dataframe(
+                tiles_table=df, acquisition_details=hcs_acquisition_details
+            )
+
+    def test_collections_are_not_shared(
+        self, hcs_acquisition_details: AcquisitionDetails
+    ) -> None:
+        tiles = hcs_images_from_dataframe(
+            tiles_table=self._table(), acquisition_details=hcs_acquisition_details
+        )
+        assert tiles[0].collection == tiles[1].collection
+        assert tiles[0].collection is not tiles[1].collection
+        assert tiles[2].collection.well == "B02"
+
+    def test_matches_validated_tiles(
+        self, hcs_acquisition_details: AcquisitionDetails
+    ) -> None:
+        df = self._table(drug=["DMSO", None, "Taxol"], dose=[1.0, 2.5, 0.0])
+        tiles = hcs_images_from_dataframe(
+            tiles_table=df,
+            acquisition_details=hcs_acquisition_details,
+            plate_name="MyPlate",
+        )
+        for tile in tiles:
+            assert type(tile)(**dict(tile)) == tile
+        assert tiles[1].attributes == {"drug": [None], "dose": [2.5]}
+
+
+def _plate_table(num_wells: int, fovs_per_well: int) -> pl.DataFrame:
+    wells = [(well // 12 + 1, well % 12 + 1) for well in range(num_wells)]
+    rows = [
+        {
+            "file_path": f"{row}_{column}_{fov}.tif",
+            "row": row,
+            "column": column,
+            "fov_name": f"FOV_{fov}",
+            "start_x": fov * 100.0,
+            "start_y": 0.0,
+            "length_x": 100,
+            "length_y": 100,
+        }
+        for row, column in wells
+        for fov in range(fovs_per_well)
+    ]
+    return pl.DataFrame(rows)
+
+
+class TestIterImagesFromTable:
+    def test_csv_matches_dataframe(
+        self, hcs_acquisition_details: AcquisitionDetails
+    ) -> None:
+        batches = list(
+            iter_hcs_images_from_table(
+                HCS_EXAMPLE_DIR / "tiles.csv",
+                acquisition_details=hcs_acquisition_details,
+                plate_name="MyPlate",
+            )
+        )
+        expected = hcs_images_from_dataframe(
+            tiles_table=pd.read_csv(HCS_EXAMPLE_DIR / "tiles.csv"),
+            acquisition_details=hcs_acquisition_details,
+            plate_name="MyPlate",
+        )
+        assert len(batches) == 1
+        assert [dict(tile) for tile in batches[0]] == [dict(tile) for tile in expected]
+
+    def test_batches_hold_whole_wells(
+        self, tmp_path: Path, hcs_acquisition_details: AcquisitionDetails
+    ) -> None:
+        path = tmp_path / "tiles.parquet"
+        _plate_table(num_wells=6, fovs_per_well=4).write_parquet(path)
+        batches = list(
+            iter_hcs_images_from_table(
+                path, acquisition_details=hcs_acquisition_details, batch_size=5
+            )
+        )
+        assert [len(batch) for batch in batches] == [8, 8, 8]
+        seen = set()
+        for batch in batches:
+            wells = {tile.collection.well for tile in batch}
+            assert not wells & seen
+            seen |= wells
+        assert len(seen) == 6
+
+    def test_predicate(self, hcs_acquisition_details: AcquisitionDetails) -> None:
+        table = _plate_table(num_wells=6, fovs_per_well=2).lazy()
+        batches = list(
+            iter_hcs_images_from_table(
+                table,
+                acquisition_details=hcs_acquisition_details,
+                predicate=pl.col("column") <= 2,
+            )
+        )
+        tiles = [tile for batch in batches for tile in batch]
+        assert {tile.collection.well for tile in tiles} == {"A01", "A02"}
+
+    def test_predicate_selects_nothing(
+        self, hcs_acquisition_details: AcquisitionDetails
+    ) -> None:
+        table = _plate_table(num_wells=2, fovs_per_well=2).lazy()
+        batches = iter_hcs_images_from_table(
+            table,
+            acquisition_details=hcs_acquisition_details,
+            predicate=pl.col("column") > 12,
+        )
+        assert list(batches) == []
+
+    def test_single_images(
+        self, single_acquisition_details: AcquisitionDetails
+    ) -> None:
+        batches = list(
+            iter_single_images_from_table(
+                scan_tiles_table(SINGLE_EXAMPLE_DIR / "tiles.csv"),
+                acquisition_details=single_acquisition_details,
+            )
+        )
+        assert len(batches) == 1
+        assert {tile.collection.image_path for tile in batches[0]} == {
+            "cardiomyocyte_scan"
+        }
+
+    def test_null_keys_are_not_dropped(
+        self, single_acquisition_details: AcquisitionDetails
+    ) -> None:
+        table = pl.DataFrame(
+            {
+                "image_path": ["image", None],
+                "file_path": ["a.png", "b.png"],
+                "fov_name": ["FOV_0", "FOV_1"],
+                "start_x": [0.0, 100.0],
+                "start_y": [0.0, 0.0],
+                "length_x": [100, 100],
+                "length_y": [100, 100],
+            }
+        )
+        with pytest.raises(ValueError, match="image_path"):
+            list(
+                iter_single_images_from_table(
+                    table.lazy(), acquisition_details=single_acquisition_details
+                )
+            )
+
+    def test_invalid_batch_size(
+        self, hcs_acquisition_details: AcquisitionDetails
+    ) -> None:
+        with pytest.raises(ValueError, match="batch_size"):
+            next(
+                iter_hcs_images_from_table(
+                    HCS_EXAMPLE_DIR / "tiles.csv",
+                    acquisition_details=hcs_acquisition_details,
+                    batch_size=0,
+                )
+            )
+
+
+class TestFiltersPushdown:
+    def test_dataframe_well_filter(
+        self, hcs_acquisition_details: AcquisitionDetails
+    ) -> None:
+        table = _plate_table(num_wells=4, fovs_per_well=3)
+        df = pd.DataFrame(table.to_dict(as_series=False))
+        tiles = hcs_images_from_dataframe(
+            tiles_table=df,
+            acquisition_details=hcs_acquisition_details,
+            filters=[WellFilter(wells_to_remove=["A01", "A03"])],
+        )
+        assert len(tiles) == 6
+        assert {tile.collection.well for tile in tiles} == {"A02", "A04"}
+
+    def test_rejected_rows_are_not_validated(
+        self, single_acquisition_details: AcquisitionDetails
+    ) -> None:
+        df = pd.DataFrame(
+            {
+                "file_path": ["a.tif", "b.tif"],
+                "image_path": ["keep", "drop"],
+                "fov_name": ["FOV_1", "FOV_1"],
+                "start_x": [0.0, 0.0],
+                "start_y": [0.0, 0.0],
+                "length_x": [100, -1],
+                "length_y": [100, 100],
+            }
+        )
+        tiles = single_images_from_dataframe(
+            tiles_table=df,
+            acquisition_details=single_acquisition_details,
+            filters=[RegexExcludeFilter(regex="drop")],
+        )
+        assert [tile.collection.image_path for tile in tiles] == ["keep"]
+
+    def test_scan_filters(self, hcs_acquisition_details: AcquisitionDetails) -> None:
+        class FirstFovFilter(FilterModel):
+            name: str = "test_first_fov"
+
+        def keep_first_fov(tile: Tile, filter_params: FirstFovFilter) -> bool:
+            return tile.fov_name == "FOV_0"
+
+        table = _plate_table(num_wells=4, fovs_per_well=3).lazy()
+        try:
+            add_filter(function=keep_first_fov, name="test_first_fov")
+            batches = list(
+                iter_hcs_images_from_table(
+                    table,
+                    acquisition_details=hcs_acquisition_details,
+                    filters=[
+                        RegexIncludeFilter(regex="/A/0[123]/"),
+                        FirstFovFilter(),
+                    ],
+                    batch_size=1,
+                )
+            )
+        finally:
+            _filter_registry.pop("test_first_fov", None)
+        assert [len(batch) for batch in batches] == [1, 1, 1]
+        assert [batch[0].collection.well for batch in batches] == [
+            "A01",
+            "A02",
+            "A03",
+        ]
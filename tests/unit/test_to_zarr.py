@@ -1,17 +1,28 @@
 """Unit tests for pipelines._to_zarr writing functions."""
 
+import threading
 from unittest.mock import MagicMock
 
 import numpy as np
 import pytest
-from ngio import Roi
+from ngio import Image, Roi, create_empty_ome_zarr
 
 from ome_zarr_converters_tools.core._tile_region import TiledImage
-from ome_zarr_converters_tools.models import WriterMode
+from ome_zarr_converters_tools.models import WriterMode, WriterOptions
+from ome_zarr_converters_tools.pipelines._parallel_writing import (
+    partition_regions,
+    prefetch_loads,
+    process_tile_writing,
+    region_pixel_slices,
+    threaded_tile_writing,
+    write_dependencies,
+)
 from ome_zarr_converters_tools.pipelines._to_zarr import (
+    chunk_writing,
     dask_parallel_fov_writing,
     dask_parallel_tile_writing,
     in_memory_writing,
+    plan_chunk_writes,
     sequential_fov_writing,
     sequential_tile_writing,
     write_to_zarr,
@@ -55,6 +66,70 @@ class TestSequentialTileWriting:
         sequential_tile_writing(tiled_image_from_grid, mock_image, resource="/data")
         assert mock_image.set_roi.call_count == len(tiled_image_from_grid.regions)
 
+    def test_prefetch_writes_in_order(
+        self,
+        tiled_image_from_grid: TiledImage,
+        mock_image: MagicMock,
+    ) -> None:
+        regions = tiled_image_from_grid.regions
+        # Regions are handed out as copies, the grid has one region per FOV.
+        roi_ids = {region.roi.name: idx for idx, region in enumerate(regions)}
+        order: list[int] = []
+        mock_image.set_roi.side_effect = lambda roi, patch: order.append(
+            roi_ids[roi.name]
+        )
+        sequential_tile_writing(
+            tiled_image_from_grid,
+            mock_image,
+            resource=None,
+            writer_options=WriterOptions(prefetch=2),
+        )
+        assert order == list(range(len(regions)))
+
+
+class TestPrefetchLoads:
+    def test_bounded_read_ahead(self) -> None:
+        lock = threading.Lock()
+        loaded: list[int] = []
+
+        def make_load(idx: int):
+            def load() -> np.ndarray:
+                with lock:
+                    loaded.append(idx)
+                return np.full(4, idx)
+
+            return load
+
+        loads = [make_load(idx) for idx in range(10)]
+        consumed = []
+        for idx, data in enumerate(prefetch_loads(loads, [4] * 10, 2, 1024)):
+            with lock:
+                # The item being consumed plus at most 2 loaded ahead
+                assert len(loaded) <= idx + 3
+            consumed.append(int(data[0]))
+        assert consumed == list(range(10))
+
+    def test_byte_budget(self) -> None:
+        loaded: list[int] = []
+        loads = [lambda idx=idx: loaded.append(idx) or np.zeros(1) for idx in range(5)]
+        for idx, _ in enumerate(prefetch_loads(loads, [100] * 5, 4, 150)):
+            # A single item fits in the budget: nothing is loaded ahead
+            assert len(loaded) == idx + 1
+
+    def test_load_error_is_raised(self) -> None:
+        def fail() -> np.ndarray:
+            raise OSError("unreadable")
+
+        loads = [lambda: np.zeros(1), fail, lambda: np.zeros(1)]
+        with pytest.raises(OSError, match="unreadable"):
+            list(prefetch_loads(loads, [8] * 3, 2, 1024))
+
+    def test_early_exit_stops_producer(self) -> None:
+        loads = [lambda: np.zeros(1)] * 100
+        data_iter = prefetch_loads(loads, [8] * 100, 2, 1024)
+        next(data_iter)
+        data_iter.close()
+
 
 class TestDaskParallelTileWriting:
     def test_writes_single_call(
@@ -75,6 +150,20 @@ class TestDaskParallelTileWriting:
         call_args = mock_image.set_roi.call_args
         assert isinstance(call_args.kwargs["roi"], Roi)
 
+    def test_dask_chunks_follow_zarr_chunks(
+        self,
+        tiled_image_from_grid: TiledImage,
+        mock_image: MagicMock,
+    ) -> None:
+        chunks = (1,) * (len(tiled_image_from_grid.axes) - 2) + (200, 200)
+        dask_parallel_tile_writing(
+            tiled_image_from_grid, mock_image, resource=None, chunks=chunks
+        )
+        patch = mock_image.set_roi.call_args.kwargs["patch"]
+        assert patch.chunks[-2:] == ((200, 200, 112), (200, 200, 112))
+        expected = tiled_image_from_grid.load_data()
+        np.testing.assert_array_equal(patch.compute(), expected)
+
 
 class TestSequentialFovWriting:
     def test_writes_per_fov(
@@ -96,6 +185,23 @@ class TestSequentialFovWriting:
             assert isinstance(call_args.kwargs["roi"], Roi)
             assert isinstance(call_args.kwargs["patch"], np.ndarray)
 
+    def test_prefetch(
+        self,
+        tiled_image_from_grid: TiledImage,
+        mock_image: MagicMock,
+    ) -> None:
+        sequential_fov_writing(
+            tiled_image_from_grid,
+            mock_image,
+            resource=None,
+            writer_options=WriterOptions(prefetch=3, max_buffer_mb=1),
+        )
+        groups = tiled_image_from_grid.group_by_fov()
+        calls = mock_image.set_roi.call_args_list
+        assert [call.kwargs["roi"].name for call in calls] == [
+            group.fov_name for group in groups
+        ]
+
 
 class TestDaskParallelFovWriting:
     def test_writes_per_fov(
@@ -107,6 +213,215 @@ class TestDaskParallelFovWriting:
         num_fovs = len(tiled_image_from_grid.group_by_fov())
         assert mock_image.set_roi.call_count == num_fovs
 
+    def test_dask_chunks_aligned_to_zarr_chunks(
+        self,
+        tiled_image_from_grid: TiledImage,
+        mock_image: MagicMock,
+    ) -> None:
+        chunks = (1,) * (len(tiled_image_from_grid.axes) - 2) + (200, 200)
+        dask_parallel_fov_writing(
+            tiled_image_from_grid, mock_image, resource=None, chunks=chunks
+        )
+        xy_chunks = {
+            call.kwargs["patch"].chunks[-2:]
+            for call in mock_image.set_roi.call_args_list
+        }
+        # FOVs start at 0 or 256: the first dask chunk ends on the zarr
+        # chunk boundary at 200 or 400.
+        assert xy_chunks == {
+            ((200, 56), (200, 56)),
+            ((200, 56), (144, 112)),
+            ((144, 112), (200, 56)),
+            ((144, 112), (144, 112)),
+        }
+
+
+def _xy_chunks(tiled_image: TiledImage, size: int) -> tuple[int, ...]:
+    return (1,) * (len(tiled_image.axes) - 2) + (size, size)
+
+
+class TestThreadedTileWriting:
+    def test_writes_each_region(
+        self,
+        tiled_image_from_grid: TiledImage,
+        mock_image: MagicMock,
+    ) -> None:
+        threaded_tile_writing(
+            tiled_image_from_grid,
+            mock_image,
+            resource=None,
+            chunks=_xy_chunks(tiled_image_from_grid, 256),
+        )
+        assert mock_image.set_roi.call_count == len(tiled_image_from_grid.regions)
+        for call_args in mock_image.set_roi.call_args_list:
+            assert isinstance(call_args.kwargs["patch"], np.ndarray)
+
+    def test_shared_chunks_written_in_order(
+        self,
+        tiled_image_from_grid: TiledImage,
+        mock_image: MagicMock,
+    ) -> None:
+        regions = tiled_image_from_grid.regions
+        chunks = _xy_chunks(tiled_image_from_grid, 300)
+        order: list[int] = []
+        roi_ids = {region.roi.name: idx for idx, region in enumerate(regions)}
+        mock_image.set_roi.side_effect = lambda roi, patch: order.append(
+            roi_ids[roi.name]
+        )
+        threaded_tile_writing(
+            tiled_image_from_grid,
+            mock_image,
+            resource=None,
+            chunks=chunks,
+            writer_options=WriterOptions(num_workers=4, num_writers=4),
+        )
+        slices = [region_pixel_slices(r, tiled_image_from_grid) for r in regions]
+        dependencies = write_dependencies(slices, chunks)
+        assert sorted(order) == list(range(len(regions)))
+        for idx, deps in enumerate(dependencies):
+            assert all(order.index(dep) < order.index(idx) for dep in deps)
+
+    def test_small_buffer_completes(
+        self,
+        tiled_image_from_grid: TiledImage,
+        mock_image: MagicMock,
+    ) -> None:
+        # Each tile is larger than the budget: tiles go through one at a time.
+        threaded_tile_writing(
+            tiled_image_from_grid,
+            mock_image,
+            resource=None,
+            chunks=_xy_chunks(tiled_image_from_grid, 256),
+            writer_options=WriterOptions(max_buffer_mb=1),
+        )
+        assert mock_image.set_roi.call_count == len(tiled_image_from_grid.regions)
+
+    def test_write_error_is_raised(
+        self,
+        tiled_image_from_grid: TiledImage,
+        mock_image: MagicMock,
+    ) -> None:
+        mock_image.set_roi.side_effect = OSError("disk full")
+        with pytest.raises(OSError, match="disk full"):
+            threaded_tile_writing(
+                tiled_image_from_grid,
+                mock_image,
+                resource=None,
+                chunks=_xy_chunks(tiled_image_from_grid, 256),
+            )
+
+    def test_write_dependencies(self) -> None:
+        slices = [
+            (slice(0, 10), slice(0, 10)),
+            (slice(0, 10), slice(10, 20)),
+            (slice(5, 15), slice(5, 15)),
+            (slice(20, 30), slice(20, 30)),
+        ]
+        assert write_dependencies(slices, (10, 10)) == [[], [], [0, 1], []]
+
+
+def _empty_image(tiled_image: TiledImage, path: str, chunk: int) -> Image:
+    ome_zarr = create_empty_ome_zarr(
+        store=path,
+        shape=tiled_image.shape(),
+        axes_names=tiled_image.axes,
+        chunks=_xy_chunks(tiled_image, chunk),
+        pixelsize=tiled_image.pixelsize,
+        dtype=tiled_image.data_type,
+        levels=1,
+        overwrite=True,
+    )
+    return ome_zarr.get_image()
+
+
+class TestProcessTileWriting:
+    def test_matches_sequential_writing(
+        self, tiled_image_from_grid: TiledImage, tmp_path
+    ) -> None:
+        expected = _empty_image(tiled_image_from_grid, str(tmp_path / "a.zarr"), 300)
+        sequential_tile_writing(tiled_image_from_grid, expected, resource=None)
+        image = _empty_image(tiled_image_from_grid, str(tmp_path / "b.zarr"), 300)
+        process_tile_writing(
+            tiled_image_from_grid,
+            image,
+            resource=None,
+            writer_options=WriterOptions(num_workers=2),
+        )
+        np.testing.assert_array_equal(image.get_as_numpy(), expected.get_as_numpy())
+
+    def test_partitions_do_not_share_chunks(self) -> None:
+        slices = [
+            (slice(0, 10), slice(0, 10)),
+            (slice(0, 10), slice(10, 20)),
+            (slice(5, 15), slice(5, 15)),
+            (slice(20, 30), slice(20, 30)),
+            (slice(40, 50), slice(0, 10)),
+        ]
+        partitions = partition_regions(slices, (10, 10), num_partitions=4)
+        assert sorted(map(sorted, partitions)) == [[0, 1, 2], [3], [4]]
+        assert partition_regions(slices, (10, 10), num_partitions=1) == [
+            [0, 1, 2, 3, 4]
+        ]
+
+
+class TestChunkWriting:
+    def test_plan_counts_avoided_writes(self) -> None:
+        # Four 10x10 tiles on a 2x2 grid, with chunks of 15: the middle
+        # chunks are shared by several tiles.
+        slices = [
+            (slice(y, y + 10), slice(x, x + 10)) for y in (0, 10) for x in (0, 10)
+        ]
+        _, stats = plan_chunk_writes(slices, shape=(20, 20), chunks=(15, 15))
+        assert stats.num_chunks_written == 4
+        assert stats.num_tile_chunk_writes == 9
+        assert stats.write_amplification_avoided == pytest.approx(9 / 4)
+
+    def test_writes_each_chunk_once(
+        self,
+        tiled_image_from_grid: TiledImage,
+        mock_image: MagicMock,
+    ) -> None:
+        chunk_writing(
+            tiled_image_from_grid,
+            mock_image,
+            resource=None,
+            chunks=_xy_chunks(tiled_image_from_grid, 300),
+        )
+        # 512x512 image, 300x300 chunks, one chunk per channel.
+        num_channels = tiled_image_from_grid.shape()[
+            tiled_image_from_grid.axes.index("c")
+        ]
+        assert mock_image.set_array.call_count == 4 * num_channels
+        mock_image.set_roi.assert_not_called()
+
+    def test_writes_xy_major(
+        self,
+        tiled_image_from_grid: TiledImage,
+        mock_image: MagicMock,
+    ) -> None:
+        chunk_writing(
+            tiled_image_from_grid,
+            mock_image,
+            resource=None,
+            chunks=_xy_chunks(tiled_image_from_grid, 300),
+        )
+        # The channel chunks of every XY chunk are written in a row, so a tile
+        # is not kept in memory until the last channel.
+        written = [
+            (call.kwargs["y"].start, call.kwargs["x"].start, call.kwargs["c"].start)
+            for call in mock_image.set_array.call_args_list
+        ]
+        assert written == sorted(written)
+
+    def test_matches_sequential_writing(
+        self, tiled_image_from_grid: TiledImage, tmp_path
+    ) -> None:
+        expected = _empty_image(tiled_image_from_grid, str(tmp_path / "a.zarr"), 300)
+        sequential_tile_writing(tiled_image_from_grid, expected, resource=None)
+        image = _empty_image(tiled_image_from_grid, str(tmp_path / "b.zarr"), 300)
+        chunk_writing(tiled_image_from_grid, image, resource=None)
+        np.testing.assert_array_equal(image.get_as_numpy(), expected.get_as_numpy())
+
 
 class TestInMemoryWriting:
     def test_writes_single_call(
@@ -193,6 +508,34 @@ class TestWriteToZarr:
         num_fovs = len(tiled_image_from_grid.group_by_fov())
         assert mock_image.set_roi.call_count == num_fovs
 
+    def test_by_tile_threads_mode(
+        self,
+        tiled_image_from_grid: TiledImage,
+        mock_image: MagicMock,
+    ) -> None:
+        write_to_zarr(
+            image=mock_image,
+            tiled_image=tiled_image_from_grid,
+            resource=None,
+            writer_mode=WriterMode.BY_TILE_THREADS,
+            chunks=_xy_chunks(tiled_image_from_grid, 256),
+        )
+        assert mock_image.set_roi.call_count == len(tiled_image_from_grid.regions)
+
+    def test_by_chunk_mode(
+        self,
+        tiled_image_from_grid: TiledImage,
+        mock_image: MagicMock,
+    ) -> None:
+        write_to_zarr(
+            image=mock_image,
+            tiled_image=tiled_image_from_grid,
+            resource=None,
+            writer_mode=WriterMode.BY_CHUNK,
+            chunks=_xy_chunks(tiled_image_from_grid, 256),
+        )
+        assert mock_image.set_array.call_count > 0
+
     def test_in_memory_mode(
         self,
         tiled_image_from_grid: TiledImage,
@@ -1,8 +1,17 @@
 """Unit tests for utility functions."""
 
+import itertools
+
 import numpy as np
 
-from ome_zarr_converters_tools.core._dask_lazy_loader import lazy_array_from_regions
+from ome_zarr_converters_tools.core._dask_lazy_loader import (
+    _build_chunk_ranges,
+    _build_chunk_to_loaders,
+    aligned_chunks,
+    lazy_array_from_regions,
+    plan_regions_composition,
+    visible_regions_mask,
+)
 from ome_zarr_converters_tools.models._url_utils import (
     UrlType,
     find_url_type,
@@ -84,3 +93,162 @@ class TestDaskLazyLoader:
         np.testing.assert_array_equal(result[:5, :5], 99)
         np.testing.assert_array_equal(result[5:, :], -1.0)
         np.testing.assert_array_equal(result[:5, 5:], -1.0)
+
+    def test_overlap_index_matches_brute_force(self) -> None:
+        rng = np.random.default_rng(0)
+        shape, chunks = (7, 23, 31), (2, 5, 8)
+        chunk_ranges = _build_chunk_ranges(shape, chunks)
+        bounds = np.zeros((40, 3, 2), dtype=np.int64)
+        for ax, dim in enumerate(shape):
+            edges = rng.integers(0, dim + 1, size=(40, 2))
+            edges.sort(axis=1)
+            bounds[:, ax] = edges
+        index = _build_chunk_to_loaders(chunk_ranges, bounds)
+        assert index.grid_shape == (4, 5, 4)
+        grid = itertools.product(*(range(len(r)) for r in chunk_ranges))
+        for linear, chunk_idx in enumerate(grid):
+            expected = [
+                li
+                for li in range(len(bounds))
+                if all(
+                    bounds[li, ax, 0] < bounds[li, ax, 1]
+                    and bounds[li, ax, 0] < chunk_ranges[ax][c][1]
+                    and chunk_ranges[ax][c][0] < bounds[li, ax, 1]
+                    for ax, c in enumerate(chunk_idx)
+                )
+            ]
+            assert index.loaders_for(linear).tolist() == expected
+
+    def test_lazy_array_overlapping_last_writer_wins(self) -> None:
+        data_a = np.full((6, 6), 1, dtype="uint8")
+        data_b = np.full((4, 4), 2, dtype="uint8")
+        regions = [
+            ((slice(0, 6), slice(0, 6)), lambda: data_a),
+            ((slice(2, 6), slice(2, 6)), lambda: data_b),
+        ]
+        arr = lazy_array_from_regions(
+            regions,
+            shape=(8, 8),
+            chunks=(3, 3),
+            dtype="uint8",  # type: ignore[arg-type]
+        )
+        result = arr.compute()  # type: ignore[no-untyped-call]
+        np.testing.assert_array_equal(result[:2, :6], 1)
+        np.testing.assert_array_equal(result[2:6, 2:6], 2)
+        np.testing.assert_array_equal(result[6:, :], 0)
+
+    def test_occluded_loaders_are_culled(self) -> None:
+        calls: list[str] = []
+
+        def loader(name: str, value: int, shape: tuple[int, int]):
+            def _load() -> np.ndarray:
+                calls.append(name)
+                return np.full(shape, value, dtype="uint8")
+
+            return _load
+
+        regions = [
+            ((slice(0, 4), slice(0, 4)), loader("hidden", 1, (4, 4))),
+            ((slice(0, 2), slice(0, 4)), loader("top", 2, (2, 4))),
+            ((slice(2, 4), slice(0, 4)), loader("bottom", 3, (2, 4))),
+            ((slice(0, 6), slice(0, 6)), loader("partial", 4, (6, 6))),
+            ((slice(0, 6), slice(0, 6)), loader("last", 5, (6, 6))),
+        ]
+        plan = plan_regions_composition(
+            [slicing for slicing, _ in regions], shape=(8, 8), chunks=(4, 4)
+        )
+        assert plan.stats.num_overlaps == 11
+        assert plan.stats.num_culled_overlaps == 7
+        assert plan.stats.num_culled_loaders == 4
+        arr = lazy_array_from_regions(
+            regions,
+            shape=(8, 8),
+            chunks=(4, 4),
+            dtype="uint8",  # type: ignore[arg-type]
+        )
+        result = arr.compute()  # type: ignore[no-untyped-call]
+        assert calls == ["last"]
+        np.testing.assert_array_equal(result[:6, :6], 5)
+        np.testing.assert_array_equal(result[6:, :], 0)
+
+    def test_culling_matches_unculled_composite(self) -> None:
+        rng = np.random.default_rng(1)
+        shape, chunks = (17, 29), (6, 7)
+        regions = []
+        for value in range(1, 30):
+            start = rng.integers(0, (12, 24))
+            size = rng.integers(1, 8, size=2)
+            slicing = tuple(
+                slice(int(s), int(min(s + n, d)))
+                for s, n, d in zip(start, size, shape, strict=True)
+            )
+            data = np.full([sl.stop - sl.start for sl in slicing], value, "uint8")
+            regions.append((slicing, lambda data=data: data))
+        culled = lazy_array_from_regions(regions, shape, chunks, dtype="uint8")
+        full = lazy_array_from_regions(
+            regions, shape, chunks, dtype="uint8", cull_occluded=False
+        )
+        np.testing.assert_array_equal(
+            culled.compute(),  # type: ignore[no-untyped-call]
+            full.compute(),  # type: ignore[no-untyped-call]
+        )
+
+    def test_visible_regions_mask(self) -> None:
+        regions_slices = [
+            (slice(0, 4), slice(0, 4)),
+            (slice(0, 4), slice(2, 6)),
+            (slice(0, 4), slice(0, 2)),
+            (slice(10, 12), slice(0, 2)),
+        ]
+        mask = visible_regions_mask(regions_slices, shape=(8, 8))
+        assert mask.tolist() == [False, True, True, False]
+
+    def test_region_loaders_read_per_chunk(self) -> None:
+        data = np.arange(10 * 12, dtype="uint16").reshape(10, 12)
+        windows: list[tuple[slice, ...]] = []
+
+        def full_loader() -> np.ndarray:
+            raise AssertionError("full loader must not be called")
+
+        def region_loader(slices: tuple[slice, ...]) -> np.ndarray:
+            windows.append(slices)
+            return data[slices]
+
+        other = np.full((4, 4), 7, dtype="uint16")
+        regions = [
+            ((slice(1, 11), slice(2, 14)), full_loader),
+            ((slice(0, 4), slice(0, 4)), lambda: other),
+        ]
+        arr = lazy_array_from_regions(
+            regions,
+            shape=(12, 16),
+            chunks=(5, 5),
+            dtype="uint16",
+            region_loaders=[region_loader, None],
+        )
+        result = arr.compute()  # type: ignore[no-untyped-call]
+        expected = np.zeros((12, 16), dtype="uint16")
+        expected[1:11, 2:14] = data
+        expected[0:4, 0:4] = 7
+        np.testing.assert_array_equal(result, expected)
+        # One window per overlapped chunk, each no larger than a chunk.
+        assert len(windows) == 9
+        assert all((sl.stop - sl.start) <= 5 for window in windows for sl in window)
+
+    def test_aligned_chunks(self) -> None:
+        assert aligned_chunks((0, 256), (512, 256), (200, 200)) == (
+            (200, 200, 112),
+            (144, 112),
+        )
+        assert aligned_chunks((3,), (2,), (10,)) == ((2,),)
+
+    def test_lazy_array_explicit_chunks(self) -> None:
+        data = np.arange(30, dtype="uint16").reshape(5, 6)
+        arr = lazy_array_from_regions(
+            [((slice(0, 5), slice(0, 6)), lambda: data)],
+            shape=(5, 6),
+            chunks=((2, 3), (1, 5)),
+            dtype="uint16",
+        )
+        assert arr.chunks == ((2, 3), (1, 5))
+        np.testing.assert_array_equal(arr.compute(), data)  # type: ignore[no-untyped-call]
@@ -1,8 +1,16 @@
 """Unit tests for pipelines._write_ome_zarr helper functions."""
 
+import itertools
+import math
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import dask.array as da
+import numpy as np
 import polars as pl
 import pytest
-from ngio import PixelSize, Roi, RoiSlice
+from ngio import Image, PixelSize, Roi, RoiSlice, create_empty_ome_zarr
+from ngio.common._zoom import numpy_zoom
 
 from ome_zarr_converters_tools.core._dummy_tiles import (
     DummyLoader,
@@ -14,18 +22,35 @@ from ome_zarr_converters_tools.core._tile_region import TiledImage, TileSlice
 from ome_zarr_converters_tools.core._tile_to_tiled_images import tiled_image_from_tiles
 from ome_zarr_converters_tools.models import (
     AcquisitionDetails,
+    ByteTargetChunking,
     ChannelInfo,
+    ChunkBasedSharding,
+    CompressionOptions,
+    CompressorType,
     ConverterOptions,
     FixedSizeChunking,
     FovBasedChunking,
+    FovBasedSharding,
     OmeZarrOptions,
+    OverwriteMode,
+    ShuffleType,
     SingleImage,
+    WriterMode,
+    WriterOptions,
+)
+from ome_zarr_converters_tools.pipelines._channel_histogram import (
+    ChannelHistogram,
+    HistogramWriter,
 )
+from ome_zarr_converters_tools.pipelines._pyramid import FusedPyramidWriter
 from ome_zarr_converters_tools.pipelines._write_ome_zarr import (
     _attribute_to_condition_table,
+    _build_compressors,
     _compute_chunk_size,
+    _compute_shard_size,
     _region_to_pixel_coordinates,
     build_channels_meta,
+    write_tiled_image_as_zarr,
 )
 
 
@@ -119,6 +144,77 @@ class TestComputeChunkSize:
         assert chunks[t_idx] == 3
 
 
+class TestByteTargetChunking:
+    def test_splits_large_fov_planes(self) -> None:
+        chunks = ByteTargetChunking(target_mb=16).get_chunks(
+            axes=["c", "z", "y", "x"],
+            fov_shape=(1, 50, 4096, 4096),
+            shape=(3, 50, 8192, 8192),
+            itemsize=2,
+        )
+        assert chunks == (1, 1, 2048, 2048)
+
+    def test_splits_odd_fov_sizes_evenly(self) -> None:
+        # sqrt(0.01e6 / 2) -> about 71 pixels, 2160 is split in 36 parts
+        chunks = ByteTargetChunking(target_mb=0.01).get_chunks(
+            axes=["y", "x"],
+            fov_shape=(2160, 2160),
+            shape=(4320, 4320),
+            itemsize=2,
+        )
+        assert chunks == (60, 60)
+        assert all(2160 % chunk == 0 for chunk in chunks)
+
+    def test_splits_prime_fov_sizes_in_near_equal_parts(self) -> None:
+        chunks = ByteTargetChunking(target_mb=16).get_chunks(
+            axes=["c", "z", "y", "x"],
+            fov_shape=(1, 1, 4099, 4099),
+            shape=(3, 1, 40990, 40990),
+            itemsize=2,
+        )
+        assert chunks == (1, 1, 2050, 2050)
+
+    def test_splits_large_prime_factor_fov_sizes_in_near_equal_parts(
+        self,
+    ) -> None:
+        # 12297 = 3 * 4099: the 5 parts needed don't divide it.
+        chunks = ByteTargetChunking(target_mb=16).get_chunks(
+            axes=["c", "z", "y", "x"],
+            fov_shape=(1, 1, 12297, 12297),
+            shape=(3, 1, 40990, 40990),
+            itemsize=2,
+        )
+        assert chunks == (1, 1, 2460, 2460)
+
+    def test_grows_along_z_first(self) -> None:
+        chunks = ByteTargetChunking(target_mb=16).get_chunks(
+            axes=["c", "z", "y", "x"],
+            fov_shape=(1, 100, 512, 512),
+            shape=(2, 100, 2048, 2048),
+            itemsize=2,
+        )
+        assert chunks == (1, 30, 512, 512)
+
+    def test_groups_whole_fovs(self) -> None:
+        chunks = ByteTargetChunking(target_mb=16).get_chunks(
+            axes=["c", "z", "y", "x"],
+            fov_shape=(1, 1, 512, 512),
+            shape=(2, 1, 4096, 2048),
+            itemsize=2,
+        )
+        # sqrt(16e6 / 2 / 512**2) -> 5 FOVs per side, at most 4 along x.
+        assert chunks == (1, 1, 2560, 2048)
+
+    def test_compute_chunk_size(self) -> None:
+        img = _make_tiled_image_with_channels(
+            channels=[ChannelInfo(channel_label="DAPI")]
+        )
+        options = OmeZarrOptions(chunks=ByteTargetChunking(target_mb=1))
+        chunks = _compute_chunk_size(img, options)
+        assert math.prod(chunks) * np.dtype(img.data_type).itemsize <= 1e6
+        assert chunks[img.axes.index("x")] == 256
+
+
 class TestRegionToPixelCoordinates:
     def test_world_to_pixel_conversion(self) -> None:
         roi = Roi(
@@ -251,3 +347,385 @@ class TestBuildChannelsMeta:
         assert result is not None
         # Default color is blue -> 0000FF (with or without # prefix)
         assert "0000FF" in result[0].channel_visualisation.color  # type: ignore
+
+
+def _make_tiled_image_at(starts: list[tuple[int, int]]) -> TiledImage:
+    """TiledImage of 256x256 tiles at the given (x, y) positions."""
+    acq = AcquisitionDetails(
+        channels=[ChannelInfo(channel_label="DAPI")],
+        pixelsize=1.0,
+        z_spacing=1.0,
+        t_spacing=1.0,
+    )
+    coll = SingleImage(image_path="test")
+    tiles = [
+        build_dummy_tile(
+            fov_name=f"FOV_{i}",
+            start=StartPosition(x=x, y=y),
+            shape=TileShape(x=256, y=256, z=1, c=1, t=1),
+            collection=coll,
+            acquisition_details=acq,
+        )
+        for i, (x, y) in enumerate(starts)
+    ]
+    images = tiled_image_from_tiles(tiles=tiles, converter_options=ConverterOptions())
+    return images[0]
+
+
+def _write_levels(
+    path: Path,
+    starts: list[tuple[int, int]],
+    writer_mode: WriterMode,
+    fused_pyramid: bool,
+) -> list[np.ndarray]:
+    options = ConverterOptions(
+        writer_options=WriterOptions(fused_pyramid=fused_pyramid, num_workers=2)
+    )
+    ome_zarr = write_tiled_image_as_zarr(
+        zarr_url=str(path),
+        tiled_image=_make_tiled_image_at(starts),
+        converter_options=options,
+        writer_mode=writer_mode,
+        overwrite_mode=OverwriteMode.OVERWRITE,
+    )
+    return [
+        ome_zarr.get_image(path=level).get_as_numpy() for level in ome_zarr.level_paths
+    ]
+
+
+class TestFusedPyramid:
+    @pytest.mark.parametrize(
+        "writer_mode",
+        [
+            WriterMode.BY_TILE,
+            WriterMode.BY_FOV,
+            WriterMode.BY_FOV_DASK,
+            WriterMode.BY_TILE_THREADS,
+            WriterMode.BY_CHUNK,
+            WriterMode.IN_MEMORY,
+        ],
+    )
+    @pytest.mark.parametrize(
+        "starts",
+        [
+            # Aligned grid: every block is downsampled in memory.
+            [(0, 0), (256, 0), (0, 256), (256, 256)],
+            # Overlapping tile not aligned to the downsampling factor.
+            [(0, 0), (256, 0), (0, 256), (256, 256), (101, 37)],
+        ],
+    )
+    def test_matches_consolidate(
+        self,
+        tmp_path: Path,
+        writer_mode: WriterMode,
+        starts: list[tuple[int, int]],
+    ) -> None:
+        expected = _write_levels(
+            tmp_path / "consolidated.zarr", starts, writer_mode, fused_pyramid=False
+        )
+        result = _write_levels(
+            tmp_path / "fused.zarr", starts, writer_mode, fused_pyramid=True
+        )
+        assert len(result) == len(expected) == 5
+        for level_result, level_expected in zip(result, expected, strict=True):
+            np.testing.assert_array_equal(level_result, level_expected)
+
+    def test_odd_size_levels(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        def fail(*args, **kwargs):
+            raise AssertionError("consolidate should not be called")
+
+        monkeypatch.setattr(Image, "consolidate", fail)
+        # 506 x 509 at level 0: some levels are not an exact halving.
+        starts = [(0, 0), (253, 0), (0, 250), (253, 250)]
+        results = [
+            _write_levels(
+                tmp_path / f"{writer_mode.value}.zarr",
+                starts,
+                writer_mode,
+                fused_pyramid=True,
+            )
+            for writer_mode in [
+                WriterMode.IN_MEMORY,
+                WriterMode.BY_TILE,
+                WriterMode.BY_FOV_DASK,
+                WriterMode.BY_CHUNK,
+            ]
+        ]
+        levels = results[0]
+        assert levels[0].shape[-2:] == (506, 509)
+        for other in results[1:]:
+            for level_result, level_expected in zip(other, levels, strict=True):
+                np.testing.assert_array_equal(level_result, level_expected)
+        for fine, coarse in itertools.pairwise(levels):
+            # Away from the ragged border, each coarse pixel is zoomed from
+            # exactly `fine // coarse` fine pixels.
+            (size_y, size_x), (fine_y, fine_x) = coarse.shape[-2:], fine.shape[-2:]
+            ratio_y, ratio_x = fine_y // size_y, fine_x // size_x
+            interior = fine[..., : (size_y - 1) * ratio_y, : (size_x - 1) * ratio_x]
+            np.testing.assert_array_equal(
+                coarse[..., : size_y - 1, : size_x - 1],
+                numpy_zoom(
+                    interior,
+                    target_shape=(*interior.shape[:-2], size_y - 1, size_x - 1),
+                ),
+            )
+            # The leftover fine pixels are folded into the last coarse pixel.
+            corner = fine[..., (size_y - 1) * ratio_y :, (size_x - 1) * ratio_x :]
+            np.testing.assert_array_equal(
+                coarse[..., -1:, -1:],
+                numpy_zoom(corner, target_shape=(*corner.shape[:-2], 1, 1)),
+            )
+
+    def test_aligned_write_skips_consolidate(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        def fail(*args, **kwargs):
+            raise AssertionError("consolidate should not be called")
+
+        monkeypatch.setattr(Image, "consolidate", fail)
+        _write_levels(
+            tmp_path / "fused.zarr",
+            [(0, 0), (256, 0), (0, 256), (256, 256)],
+            WriterMode.BY_CHUNK,
+            fused_pyramid=True,
+        )
+
+    def test_aligned_blocks_need_no_rebuild(self, tmp_path: Path) -> None:
+        ome_zarr = create_empty_ome_zarr(
+            store=str(tmp_path / "image.zarr"),
+            shape=(1, 64, 64),
+            axes_names=["c", "y", "x"],
+            pixelsize=1.0,
+            levels=3,
+            chunks=(1, 16, 16),
+            overwrite=True,
+        )
+        writer = FusedPyramidWriter(ome_zarr)
+        rng = np.random.default_rng(0)
+        writer.set_array(
+            patch=rng.integers(0, 255, (1, 32, 32), dtype="uint8"),
+            y=slice(0, 32),
+            x=slice(32, 64),
+        )
+        assert not any(writer._pending)
+        writer.set_array(
+            patch=rng.integers(0, 255, (1, 30, 32), dtype="uint8"),
+            y=slice(34, 64),
+            x=slice(0, 32),
+        )
+        # Aligned to the factor 2 of level 1, but not to the factor 4 of level 2.
+        assert writer._pending[0] == set()
+        assert writer._pending[1] == {((0, 1), (8, 16), (0, 8))}
+        writer.finalize()
+
+        fused = [
+            ome_zarr.get_image(path=level).get_as_numpy()
+            for level in ome_zarr.level_paths
+        ]
+        ome_zarr.get_image().consolidate()
+        for level, data in zip(ome_zarr.level_paths, fused, strict=True):
+            np.testing.assert_array_equal(
+                ome_zarr.get_image(path=level).get_as_numpy(), data
+            )
+
+
+class TestChannelHistogram:
+    @pytest.mark.parametrize("dtype", ["uint8", "uint16"])
+    def test_percentiles_match_numpy(self, dtype: str) -> None:
+        rng = np.random.default_rng(0)
+        data = rng.integers(0, np.iinfo(dtype).max, (2, 37, 41), dtype=dtype)
+        data[0, :10] = 0
+        histogram = ChannelHistogram(num_channels=2, dtype=dtype)
+        histogram.counts += histogram.channel_counts(data, channel_axis=0)
+        for channel, (start, end) in zip(data, histogram.percentiles(), strict=True):
+            values = channel[channel > 0]
+            expected = np.percentile(values, [0.1, 99.9], method="nearest")
+            assert (start, end) == tuple(float(v) for v in expected)
+
+    def test_empty_channel(self) -> None:
+        histogram = ChannelHistogram(num_channels=1, dtype="uint8")
+        histogram.counts += histogram.channel_counts(
+            np.zeros((4, 4), dtype="uint8"), channel_axis=None
+        )
+        assert histogram.percentiles() == [(0.0, 0.0)]
+
+    def test_unsupported_dtype(self) -> None:
+        assert not ChannelHistogram.supports("float32")
+        with pytest.raises(ValueError, match="only support"):
+            ChannelHistogram(num_channels=1, dtype="float32")
+
+    def test_writer_accumulates_and_forwards(self) -> None:
+        image = MagicMock()
+        writer = HistogramWriter(
+            image, axes=("c", "y", "x"), num_channels=2, dtype="uint8"
+        )
+        writer.set_array(
+            patch=np.full((4, 2, 3), 7, dtype="uint8"),
+            axes_order=("y", "c", "x"),
+            y=slice(0, 4),
+        )
+        assert image.set_array.call_count == 1
+        assert writer.histogram.counts[:, 7].tolist() == [12, 12]
+        assert writer.complete
+        writer.set_roi(roi=MagicMock(), patch=da.zeros((2, 4, 4), dtype="uint8"))
+        assert image.set_roi.call_count == 1
+        assert not writer.complete
+
+    @pytest.mark.parametrize(
+        "writer_mode", [WriterMode.BY_CHUNK, WriterMode.BY_FOV_DASK]
+    )
+    def test_windows_from_written_data(
+        self, tmp_path: Path, writer_mode: WriterMode
+    ) -> None:
+        ome_zarr = write_tiled_image_as_zarr(
+            zarr_url=str(tmp_path / "image.zarr"),
+            tiled_image=_make_tiled_image_at([(0, 0), (256, 0)]),
+            converter_options=ConverterOptions(
+                writer_options=WriterOptions(histogram_windows=True)
+            ),
+            writer_mode=writer_mode,
+            overwrite_mode=OverwriteMode.OVERWRITE,
+        )
+        data = ome_zarr.get_image().get_as_numpy()
+        (channel,) = ome_zarr.meta.channels_meta.channels
+        window = channel.channel_visualisation
+        if writer_mode == WriterMode.BY_CHUNK:
+            # Full resolution statistics, no read back.
+            values = data[data > 0]
+            expected = np.percentile(values, [0.1, 99.9], method="nearest")
+            assert (window.start, window.end) == tuple(float(v) for v in expected)
+        else:
+            # Lazy writers fall back to ngio's percentiles.
+            assert window.end > 0
+
+    @pytest.mark.parametrize("writer_mode", [WriterMode.BY_TILE, WriterMode.BY_CHUNK])
+    def test_default_windows_match_ngio(
+        self, tmp_path: Path, writer_mode: WriterMode
+    ) -> None:
+        ome_zarr = write_tiled_image_as_zarr(
+            zarr_url=str(tmp_path / "image.zarr"),
+            # Overlapping tiles
+            tiled_image=_make_tiled_image_at([(0, 0), (128, 0), (64, 128)]),
+            converter_options=ConverterOptions(),
+            writer_mode=writer_mode,
+            overwrite_mode=OverwriteMode.OVERWRITE,
+        )
+        (channel,) = ome_zarr.meta.channels_meta.channels
+        written = channel.channel_visualisation
+        ome_zarr.set_channel_windows_with_percentiles()
+        (channel,) = ome_zarr.meta.channels_meta.channels
+        expected = channel.channel_visualisation
+        assert (written.start, written.end) == (expected.start, expected.end)
+
+
+class TestComputeShardSize:
+    def test_no_sharding(self) -> None:
+        img = _make_tiled_image_at([(0, 0)])
+        chunks = _compute_chunk_size(img, OmeZarrOptions())
+        assert _compute_shard_size(img, OmeZarrOptions(), chunks) is None
+
+    def test_chunk_based_sharding(self) -> None:
+        img = _make_tiled_image_at([(x, 0) for x in range(0, 2048, 256)])
+        options = OmeZarrOptions(
+            chunks=FixedSizeChunking(xy_chunk=128, z_chunk=1),
+            sharding=ChunkBasedSharding(xy_chunks=4, z_chunks=2),
+            ngff_version="0.5",
+            num_levels=1,
+        )
+        chunks = _compute_chunk_size(img, options)
+        shards = _compute_shard_size(img, options, chunks)
+        assert shards is not None
+        # axes: t, c, z, y, x
+        assert shards[-3:] == (2, 512, 512)
+
+    def test_fov_based_sharding_rounds_to_chunks(self) -> None:
+        img = _make_tiled_image_at([(0, 0), (256, 0), (0, 256), (256, 256)])
+        options = OmeZarrOptions(
+            chunks=FixedSizeChunking(xy_chunk=100),
+            sharding=FovBasedSharding(xy_fovs=1),
+            ngff_version="0.5",
+            num_levels=1,
+        )
+        chunks = _compute_chunk_size(img, options)
+        shards = _compute_shard_size(img, options, chunks)
+        assert shards is not None
+        assert shards[-2:] == (300, 300)
+
+    def test_reduced_to_fit_pyramid_levels(self) -> None:
+        # 2560 px wide: level 1 is 1280 px, not a whole number of 512 chunks.
+        img = _make_tiled_image_at([(x, 0) for x in range(0, 2560, 256)])
+        options = OmeZarrOptions(
+            chunks=FixedSizeChunking(xy_chunk=512),
+            sharding=ChunkBasedSharding(xy_chunks=4),
+            ngff_version="0.5",
+            num_levels=2,
+        )
+        chunks = _compute_chunk_size(img, options)
+        shards = _compute_shard_size(img, options, chunks)
+        assert shards is not None
+        assert shards[-1] == 1024
+
+
+class TestBuildCompressors:
+    def test_default_and_none(self) -> None:
+        assert _build_compressors(CompressionOptions(), zarr_format=3) == "auto"
+        none = CompressionOptions(compressor=CompressorType.NONE)
+        assert _build_compressors(none, zarr_format=2) is None
+
+    @pytest.mark.parametrize("zarr_format", [2, 3])
+    @pytest.mark.parametrize(
+        "compressor",
+        [CompressorType.BLOSC_ZSTD, CompressorType.BLOSC_LZ4, CompressorType.ZSTD],
+    )
+    def test_written_arrays_use_compressor(
+        self, tmp_path: Path, zarr_format: int, compressor: CompressorType
+    ) -> None:
+        compression = CompressionOptions(
+            compressor=compressor, level=3, shuffle=ShuffleType.BIT_SHUFFLE
+        )
+        ome_zarr = create_empty_ome_zarr(
+            store=str(tmp_path / "image.zarr"),
+            shape=(1, 64, 64),
+            axes_names=["c", "y", "x"],
+            pixelsize=1.0,
+            levels=1,
+            ngff_version="0.4" if zarr_format == 2 else "0.5",
+            compressors=_build_compressors(compression, zarr_format=zarr_format),
+            overwrite=True,
+        )
+        (codec,) = ome_zarr.get_image().zarr_array.compressors
+        config = codec.get_config() if zarr_format == 2 else codec.to_dict()
+        assert "zstd" in str(config).lower() or "lz4" in str(config).lower()
+
+
+class TestShardedWrite:
+    @pytest.mark.parametrize(
+        "writer_mode", [WriterMode.BY_FOV, WriterMode.BY_TILE_THREADS]
+    )
+    def test_same_data_fewer_files(
+        self, tmp_path: Path, writer_mode: WriterMode
+    ) -> None:
+        starts = [(x, y) for x in range(0, 1024, 256) for y in range(0, 512, 256)]
+        results = {}
+        for name, sharding in [
+            ("plain", None),
+            ("sharded", FovBasedSharding(xy_fovs=2)),
+        ]:
+            omezarr_options = OmeZarrOptions(
+                ngff_version="0.5",
+                compression=CompressionOptions(compressor=CompressorType.BLOSC_ZSTD),
+                **({} if sharding is None else {"sharding": sharding}),
+            )
+            ome_zarr = write_tiled_image_as_zarr(
+                zarr_url=str(tmp_path / f"{name}.zarr"),
+                tiled_image=_make_tiled_image_at(starts),
+                converter_options=ConverterOptions(omezarr_options=omezarr_options),
+                writer_mode=writer_mode,
+                overwrite_mode=OverwriteMode.OVERWRITE,
+            )
+            num_files = sum(1 for f in (tmp_path / f"{name}.zarr").rglob("*/c/**/*"))
+            results[name] = (ome_zarr.get_image().get_as_numpy(), num_files)
+        np.testing.assert_array_equal(results["plain"][0], results["sharded"][0])
+        assert results["sharded"][1] < results["plain"][1]